@@ -1,28 +1,336 @@
 #!/usr/bin/env node
 
 import { WebScraper } from "./web-scraper.js";
-import { ReportGenerator } from "./report-generator.js";
-import OpenAI from "openai";
+import { ReportGenerator, REPORT_FORMATS } from "./report-generator.js";
+import { RateLimiter } from "./rate-limiter.js";
+import { LLMResponseCache } from "./llm-cache.js";
+import { TaskPool, mapSettled } from "./task-pool.js";
+import { LanguageDiscovery } from "./language-discovery.js";
+import { SiteCrawler } from "./site-crawler.js";
+import { CheckpointStore } from "./checkpoint-store.js";
+import { alignContent, batchPairs } from "./segment-aligner.js";
+import { SegmentStore, hashPairs } from "./segment-store.js";
+import { classifyClusters, clusterTerms } from "./terminology-merge.js";
+import { Glossary } from "./glossary.js";
+import { RetryPolicy } from "./retry.js";
+import { BatchCollector } from "./batch-client.js";
+import { Pipeline } from "./pipeline.js";
+import { BoundedQueue } from "./async-queue.js";
+import {
+  COMPARISON_OUTPUT,
+  LANGUAGE_URLS_OUTPUT,
+  StructuredOutputError,
+  TERMINOLOGY_REVIEW_OUTPUT,
+  TERM_EXTRACTION_OUTPUT,
+  parseStructured,
+  responseFormat,
+} from "./structured-output.js";
+import {
+  countTokens,
+  loadTokenizer,
+  modelLimits,
+  truncateToTokens,
+} from "./tokenizer.js";
+import { createProvider } from "./llm-provider.js";
 import chalk from "chalk";
+import path from "path";
+import { pathToFileURL } from "url";
 import dotenv from "dotenv";
 
 // Load environment variables
 dotenv.config();
 
+// Terms extracted per page in the terminology map step
+const MAX_TERMS_PER_PAGE = 40;
+
+// Whether a scraped page can serve as the English comparison baseline
+const isEnglishBaseline = (content) =>
+  content.detectedLanguage === "en" ||
+  content.htmlLang === "en" ||
+  content.url.includes("/en/") ||
+  content.url.includes("/english/");
+
 /**
  * AI-powered translation quality analyzer
  */
 class TranslationAnalyzer {
-  constructor() {
-    this.openai = new OpenAI({
-      apiKey: process.env.OPENAI_API_KEY,
-    });
+  /**
+   * @param {Object} options - Analyzer options
+   * @param {number} options.comparisonConcurrency - Parallel comparisons, and parallel comparison
+   *   requests across them (1 = sequential)
+   * @param {number} options.requestsPerMinute - OpenAI requests-per-minute budget
+   * @param {number} options.tokensPerMinute - OpenAI tokens-per-minute budget
+   * @param {RateLimiter} options.rateLimiter - Shared limiter (overrides the budgets)
+   * @param {string|Object} options.provider - LLM backend: "openai", "openai-compatible", "mock", { type, ...options } or a provider object
+   * @param {string} options.comparisonModel - Model for page comparisons
+   * @param {string} options.terminologyModel - Model for terminology extraction and review
+   * @param {string} options.discoveryModel - Model for AI language URL discovery
+   * @param {LLMResponseCache|Object|false} options.cache - Shared LLMResponseCache, or its options, or false to disable caching (off by default with the mock provider)
+   * @param {number} options.maxPromptTokens - Cap on prompt tokens per request (defaults to what the model's context allows)
+   * @param {SegmentStore|Object|false} options.incremental - Shared SegmentStore, or its options, or false to re-analyze every segment
+   * @param {string|Glossary} options.glossary - Brand/terminology glossary (.csv or .tbx path) checked locally
+   * @param {RetryPolicy|Object} options.retry - Shared retry policy, or RetryPolicy options
+   * @param {BatchCollector|Object|false} options.batch - Shared BatchCollector, or its options, to send requests through the Batch API, or false
+   */
+  constructor({
+    comparisonConcurrency = Number(process.env.COMPARISON_CONCURRENCY) || 4,
+    requestsPerMinute = Number(process.env.OPENAI_RPM) || 500,
+    tokensPerMinute = Number(process.env.OPENAI_TPM) || 30000,
+    rateLimiter,
+    provider = process.env.LLM_PROVIDER || "openai",
+    comparisonModel = process.env.COMPARISON_MODEL || "gpt-4o",
+    terminologyModel = process.env.TERMINOLOGY_MODEL || "gpt-4o",
+    discoveryModel = process.env.DISCOVERY_MODEL || "gpt-5",
+    cache = (provider?.type ?? provider) === "mock" ? false : {},
+    maxPromptTokens = Number(process.env.MAX_PROMPT_TOKENS) || Infinity,
+    incremental = {},
+    glossary = process.env.GLOSSARY_FILE,
+    retry = {},
+    batch = false,
+  } = {}) {
+    this.provider = createProvider(provider);
+    this.retry = retry instanceof RetryPolicy ? retry : new RetryPolicy(retry);
+    // Batch mode: latency traded for batch pricing and no per-minute limits
+    if (batch !== false && !this.provider.batchClient) {
+      throw new Error(`Batch mode is not supported by ${this.provider.name}`);
+    }
+    if (batch === false) {
+      this.batch = null;
+    } else if (batch instanceof BatchCollector) {
+      this.batch = batch;
+    } else {
+      this.batch = new BatchCollector({
+        openai: this.provider.batchClient,
+        retry: this.retry,
+        ...batch,
+      });
+    }
+    this.comparisonConcurrency = comparisonConcurrency;
+    // Comparisons, term extractions and their requests in flight. Batch
+    // mode submits everything straight away so it lands in the same
+    // batches instead of one multi-hour batch round per few locales.
+    this.requestConcurrency = this.batch ? Infinity : comparisonConcurrency;
+    // Prompts of all running comparisons share these slots, so one long page
+    // cannot put all its requests in flight at once
+    this.requestPool = new TaskPool({ concurrency: this.requestConcurrency });
+    this.rateLimiter =
+      rateLimiter || new RateLimiter({ requestsPerMinute, tokensPerMinute });
+    this.cache =
+      cache === false
+        ? null
+        : cache instanceof LLMResponseCache
+          ? cache
+          : new LLMResponseCache(cache);
+    this.maxPromptTokens = maxPromptTokens;
+    // Structured outputs (json_schema) need gpt-4o or newer
+    this.comparisonModel = comparisonModel;
+    this.terminologyModel = terminologyModel;
+    this.discoveryModel = discoveryModel;
+    this.completionTokens = 2000;
+    // Truncated replies are retried with twice the room, up to this
+    this.maxCompletionTokens = 8000;
+    this.segmentStore =
+      incremental === false
+        ? null
+        : incremental instanceof SegmentStore
+          ? incremental
+          : new SegmentStore(incremental);
+    this.glossary = glossary || null;
+  }
+
+  /**
+   * Load the configured glossary once
+   * @returns {Glossary|null}
+   */
+  async loadGlossary() {
+    if (typeof this.glossary === "string") {
+      const file = this.glossary;
+      this.glossary = Glossary.load(file).then((glossary) => {
+        console.log(
+          `📖 Glossary loaded: ${glossary.entries.length} entries, ${glossary.variants.length} term variants (${file})`,
+        );
+        return glossary;
+      });
+    }
+    return this.glossary;
+  }
+
+  /**
+   * Send a chat completion request within the rate limits
+   * @param {Object} params - chat.completions.create parameters
+   * @returns {Object} - OpenAI chat completion response
+   */
+  async createChatCompletion(params) {
+    const cacheKey = this.cache && LLMResponseCache.keyFor(params);
+    if (this.cache) {
+      const cached = await this.cache.get(cacheKey);
+      if (cached) {
+        console.log(`   💾 Using cached ${this.provider.name} response`);
+        return cached;
+      }
+    }
+
+    let response;
+    if (this.batch) {
+      // Failed lines are requeued by the collector itself; retrying here
+      // would send each one through yet another batch round
+      response = await this.batch.submit(params);
+    } else {
+      const estimatedTokens = this.estimateRequestTokens(params);
+      // Every attempt, retries included, spends request and token budget
+      response = await this.retry.run(
+        async () => {
+          await this.rateLimiter.acquire(estimatedTokens);
+          return this.provider.createChatCompletion(params);
+        },
+        {
+          key: this.provider.name,
+          label: `${this.provider.name} ${params.model}`,
+        },
+      );
+
+      const usedTokens = response.usage?.total_tokens;
+      if (usedTokens !== undefined) {
+        this.rateLimiter.refund(estimatedTokens - usedTokens);
+      }
+    }
+
+    if (this.cache) {
+      await this.cache.set(cacheKey, response);
+    }
+    return response;
+  }
+
+  /**
+   * Chat completion constrained to a JSON schema, validated locally. A reply
+   * cut off at max_tokens is requested again with more room; a reply that
+   * does not match the schema gets one repair request. Failures throw.
+   * @param {Object} params - chat.completions.create parameters
+   * @param {Object} output - { name, schema } from structured-output.js
+   * @returns {Object} - { data, response }
+   */
+  async createStructuredCompletion(params, output) {
+    let request = { ...params, response_format: responseFormat(output) };
+    let response = await this.createChatCompletion(request);
+    let result = parseStructured(response, output);
+
+    // An incomplete reply is not a malformed one: repairing it cannot help
+    while (result.truncated) {
+      await this.cache?.invalidate(LLMResponseCache.keyFor(request));
+      const maxTokens = this.truncationRetryTokens(request);
+      if (maxTokens === null) {
+        throw new StructuredOutputError(output.name, result.errors, {
+          truncated: true,
+        });
+      }
+      console.log(
+        `   ✂️ ${output.name} reply cut off at ${request.max_tokens} tokens, retrying with ${maxTokens}...`,
+      );
+      request = { ...request, max_tokens: maxTokens };
+      response = await this.createChatCompletion(request);
+      result = parseStructured(response, output);
+    }
+    if (result.errors.length === 0) return { data: result.data, response };
+
+    // Never replay an invalid reply from the cache
+    await this.cache?.invalidate(LLMResponseCache.keyFor(request));
+    if (result.refusal) {
+      throw new StructuredOutputError(output.name, result.errors);
+    }
+
+    console.log(
+      `   🔧 Invalid ${output.name} reply (${result.errors.slice(0, 3).join("; ")}), requesting a repair...`,
+    );
+    const repair = {
+      ...request,
+      messages: [
+        ...request.messages,
+        {
+          role: "assistant",
+          content: response.choices?.[0]?.message?.content ?? "",
+        },
+        {
+          role: "user",
+          content: `That reply does not match the required JSON schema: ${result.errors.slice(0, 10).join("; ")}. Reply again with only the corrected JSON.`,
+        },
+      ],
+    };
+    response = await this.createChatCompletion(repair);
+    result = parseStructured(response, output);
+    if (result.errors.length > 0) {
+      await this.cache?.invalidate(LLMResponseCache.keyFor(repair));
+      throw new StructuredOutputError(output.name, result.errors);
+    }
+    return { data: result.data, response };
+  }
+
+  /**
+   * Larger max_tokens for a request whose reply was truncated, within
+   * maxCompletionTokens and the model's context window
+   * @returns {number|null} - null when the request cannot get more room
+   */
+  truncationRetryTokens(request) {
+    if (!request.max_tokens) return null;
+
+    const { contextTokens } = modelLimits(request.model);
+    const promptTokens =
+      this.estimateRequestTokens(request) - request.max_tokens;
+    const maxTokens = Math.min(
+      request.max_tokens * 2,
+      this.maxCompletionTokens,
+      contextTokens - promptTokens - 200,
+    );
+    return maxTokens > request.max_tokens ? maxTokens : null;
+  }
+
+  /**
+   * Local token estimate of a request (prompt plus completion allowance)
+   */
+  estimateRequestTokens(params) {
+    const promptTokens = params.messages.reduce(
+      (sum, message) => sum + countTokens(message.content, params.model),
+      0,
+    );
+    return promptTokens + (params.max_tokens || 0);
+  }
+
+  /**
+   * Prompt tokens available per request for a model: its context window
+   * minus the completion allowance, capped by maxPromptTokens. Outside batch
+   * mode a request must also fit the tokens-per-minute budget, or the rate
+   * limiter could never admit it whole.
+   */
+  promptTokenBudget(model) {
+    const { contextTokens } = modelLimits(model);
+    const perMinute = this.batch
+      ? Infinity
+      : this.rateLimiter.tokensPerMinute - this.completionTokens;
+    return Math.max(
+      0,
+      Math.min(
+        this.maxPromptTokens,
+        contextTokens - this.completionTokens - 200,
+        perMinute,
+      ),
+    );
+  }
+
+  /**
+   * Baseline of a set of language versions: the first English page, else
+   * the first page. Quality and glossary checks must agree on it.
+   * @param {Array} scrapedContent - Scraped language versions in report order
+   */
+  selectBaseline(scrapedContent) {
+    return scrapedContent.find(isEnglishBaseline) || scrapedContent[0];
   }
 
   /**
    * Analyze translation quality between different language versions
+   * @param {Array} scrapedContent - Scraped language versions
+   * @param {Object} options - Analysis options
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
    */
-  async analyzeTranslationQuality(scrapedContent) {
+  async analyzeTranslationQuality(scrapedContent, { checkpoint = null } = {}) {
     try {
       console.log("🔍 Analyzing translation quality...");
       console.log(
@@ -31,39 +339,147 @@ class TranslationAnalyzer {
 
       // Find English baseline
       console.log("🔍 Looking for English baseline...");
-      const englishContent = scrapedContent.find(
-        (content) =>
-          content.detectedLanguage === "en" ||
-          content.htmlLang === "en" ||
-          content.url.includes("/en/") ||
-          content.url.includes("/english/"),
-      );
+      const baseline = this.selectBaseline(scrapedContent);
 
-      if (!englishContent) {
+      if (isEnglishBaseline(baseline)) {
+        console.log(
+          `✅ Found English baseline: ${baseline.url} (${baseline.detectedLanguage})`,
+        );
+      } else {
         console.warn(
           "⚠️ No English baseline found, using first content as baseline",
         );
-        const baseline = scrapedContent[0];
         console.log(
           `📌 Using baseline: ${baseline.detectedLanguage} - ${baseline.url}`,
         );
-        return await this.analyzeAgainstBaseline(baseline, scrapedContent);
       }
+      return await this.analyzeAgainstBaseline(baseline, scrapedContent, {
+        checkpoint,
+      });
+    } catch (error) {
+      console.error("❌ Error in translation analysis:", error.message);
+      throw error;
+    }
+  }
 
-      console.log(
-        `✅ Found English baseline: ${englishContent.url} (${englishContent.detectedLanguage})`,
-      );
-      return await this.analyzeAgainstBaseline(englishContent, scrapedContent);
+  /**
+   * Analyze translation quality while pages are still being scraped. The
+   * baseline is the same one analyzeTranslationQuality would pick: the
+   * English page ranked first in urlOrder. Pages are held back until no
+   * better-ranked page can still turn out to be English, i.e. until every
+   * page ranked above the best English candidate has arrived or failed;
+   * every later page is compared as soon as it arrives.
+   * @param {AsyncIterable} pages - Scraped content in arrival order (e.g. a
+   *   BoundedQueue); a { url, error } entry marks a page that failed to scrape
+   * @param {Object} options - Stream options
+   * @param {Array} options.urlOrder - URLs in report order; the first one is
+   *   the baseline when no English page arrives
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
+   * @returns {Object|null} - Analysis results, or null when fewer than two pages arrived
+   */
+  async analyzeTranslationQualityStream(
+    pages,
+    { urlOrder = [], checkpoint = null } = {},
+  ) {
+    const iterator = pages[Symbol.asyncIterator]();
+    const rank = (content) => {
+      const index = urlOrder.indexOf(content.url);
+      return index === -1 ? urlOrder.length : index;
+    };
+    // Next scraped page, skipping the markers of failed scrapes
+    const settled = new Set();
+    const nextPage = async () => {
+      for (;;) {
+        const { value, done } = await iterator.next();
+        if (done) return null;
+        settled.add(value.url);
+        if (!value.error) return value;
+      }
+    };
+
+    try {
+      console.log("🔍 Analyzing translation quality as pages arrive...");
+      const held = [];
+      let baseline = null;
+      let candidate = null;
+      while (!baseline) {
+        const page = await nextPage();
+        if (!page) break;
+        held.push(page);
+        if (
+          isEnglishBaseline(page) &&
+          (!candidate || rank(page) < rank(candidate))
+        ) {
+          candidate = page;
+        }
+        const decided =
+          candidate &&
+          urlOrder
+            .slice(0, rank(candidate))
+            .every((url) => settled.has(url));
+        if (decided) baseline = candidate;
+      }
+      // Every page has arrived by now unless a baseline was decided
+      baseline ||= candidate;
+      held.sort((a, b) => rank(a) - rank(b));
+
+      if (baseline) {
+        held.splice(held.indexOf(baseline), 1);
+        console.log(
+          `✅ Found English baseline: ${baseline.url} (${baseline.detectedLanguage})`,
+        );
+      } else {
+        baseline = held.shift();
+        if (!baseline) return null;
+        console.warn(
+          "⚠️ No English baseline found, using first content as baseline",
+        );
+        console.log(
+          `📌 Using baseline: ${baseline.detectedLanguage} - ${baseline.url}`,
+        );
+      }
+
+      // Single-language pages are reported without a comparison
+      if (held.length === 0) {
+        const page = await nextPage();
+        if (!page) return null;
+        held.push(page);
+      }
+
+      async function* targets() {
+        yield* held;
+        for (let page = await nextPage(); page; page = await nextPage()) {
+          yield page;
+        }
+      }
+      return await this.analyzeAgainstBaseline(baseline, targets(), {
+        rank,
+        checkpoint,
+      });
     } catch (error) {
       console.error("❌ Error in translation analysis:", error.message);
       throw error;
+    } finally {
+      // Release a producer still waiting to hand over pages
+      await iterator.return?.();
     }
   }
 
   /**
-   * Analyze all content against a baseline
+   * Analyze all content against a baseline. Comparisons start while
+   * allContent is still being iterated, at most requestConcurrency at a
+   * time; the next item is only pulled once a slot is free.
+   * @param {Object} baseline - Baseline content
+   * @param {Iterable|AsyncIterable} allContent - Content to compare (the baseline is skipped)
+   * @param {Object} options - Analysis options
+   * @param {Function} options.rank - (content) => number ordering the comparisons; arrival order by default
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
    */
-  async analyzeAgainstBaseline(baseline, allContent) {
+  async analyzeAgainstBaseline(
+    baseline,
+    allContent,
+    { rank = null, checkpoint = null } = {},
+  ) {
     console.log(
       `📋 Starting analysis against baseline: ${baseline.detectedLanguage} (${baseline.wordCount} words)`,
     );
@@ -79,38 +495,78 @@ class TranslationAnalyzer {
       overallScore: 0,
       totalIssues: 0,
       criticalIssues: 0,
+      failedComparisons: 0,
     };
 
-    const contentToAnalyze = allContent.filter(
-      (content) => content.url !== baseline.url,
-    );
-    console.log(
-      `🔄 Analyzing ${contentToAnalyze.length} content pieces against baseline...`,
-    );
+    const settled = [];
+    const running = new Set();
+    for await (const content of allContent) {
+      if (content.url === baseline.url) continue;
 
-    for (let i = 0; i < contentToAnalyze.length; i++) {
-      const content = contentToAnalyze[i];
+      const position = settled.length + 1;
+      const entry = { order: rank ? rank(content) : position, position };
+      settled.push(entry);
       console.log(
-        `\n📝 Analyzing ${i + 1}/${contentToAnalyze.length}: ${content.detectedLanguage} - ${content.url}`,
+        `\n📝 Analyzing #${position}: ${content.detectedLanguage} - ${content.url}`,
       );
       console.log(`   Content length: ${content.wordCount} words`);
 
-      const comparison = await this.compareContent(baseline, content);
+      const task = this.compareContent(baseline, content, {
+        checkpoint,
+      }).then(
+        (comparison) => {
+          if (comparison.failed) {
+            console.log(
+              `   ⚠️ Analysis failed (${content.detectedLanguage}), excluded from the overall score`,
+            );
+          } else {
+            console.log(
+              `   ✅ Analysis complete (${content.detectedLanguage}) - Score: ${comparison.qualityScore}/100, Issues: ${comparison.issues.length}`,
+            );
+          }
+          entry.outcome = { status: "fulfilled", value: comparison };
+        },
+        (reason) => {
+          entry.outcome = { status: "rejected", reason };
+        },
+      );
+      running.add(task);
+      task.then(() => running.delete(task));
+
+      // Backpressure: stop pulling content while every slot is busy
+      while (running.size >= this.requestConcurrency) {
+        await Promise.race(running);
+      }
+    }
+    await Promise.all(running);
+    console.log(
+      `🔄 Analyzed ${settled.length} content pieces against baseline`,
+    );
+
+    // Aggregate in a fixed order so results do not depend on completion order
+    settled.sort((a, b) => a.order - b.order || a.position - b.position);
+    settled.forEach(({ outcome }) => {
+      if (outcome.status === "rejected") throw outcome.reason;
+
+      const comparison = outcome.value;
       analysisResults.comparisons.push(comparison);
+      if (comparison.failed) analysisResults.failedComparisons++;
       analysisResults.totalIssues += comparison.issues.length;
       analysisResults.criticalIssues += comparison.issues.filter(
         (issue) => issue.severity === "critical",
       ).length;
+    });
 
-      console.log(
-        `   ✅ Analysis complete - Score: ${comparison.qualityScore}/100, Issues: ${comparison.issues.length}`,
+    // Calculate overall score over the comparisons that succeeded
+    const scored = analysisResults.comparisons.filter((comp) => !comp.failed);
+    const totalComparisons = scored.length;
+    if (analysisResults.failedComparisons > 0) {
+      console.warn(
+        `⚠️ ${analysisResults.failedComparisons} comparison(s) failed and are excluded from the overall score`,
       );
     }
-
-    // Calculate overall score
-    const totalComparisons = analysisResults.comparisons.length;
     if (totalComparisons > 0) {
-      const totalScore = analysisResults.comparisons.reduce(
+      const totalScore = scored.reduce(
         (sum, comp) => sum + comp.qualityScore,
         0,
       );
@@ -128,41 +584,108 @@ class TranslationAnalyzer {
 
   /**
    * Compare two content pieces
+   * @param {Object} options - Comparison options
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
    */
-  async compareContent(baseline, target) {
+  async compareContent(baseline, target, { checkpoint = null } = {}) {
+    const checkpointKey = `${baseline.url}\n${target.url}`;
+    const restored = checkpoint?.get("comparison", checkpointKey);
+    if (restored) {
+      console.log(`   ♻️ Comparison restored from checkpoint`);
+      return restored;
+    }
+
     try {
-      console.log(`   🤖 Sending request to OpenAI GPT-4...`);
-      const prompt = this.buildComparisonPrompt(baseline, target);
+      await loadTokenizer();
+      const pairs = hashPairs(alignContent(baseline, target));
+
+      // Incremental re-audit: segments unchanged since the last run keep their results
+      const previous =
+        pairs.length > 0 && this.segmentStore
+          ? await this.segmentStore.load(baseline.url, target.url)
+          : null;
+      const changedPairs = previous
+        ? pairs.filter((pair) => !previous[pair.hash])
+        : pairs;
+      if (previous) {
+        console.log(
+          `   ♻️ ${pairs.length - changedPairs.length}/${pairs.length} segments unchanged since last audit, re-analyzing ${changedPairs.length}`,
+        );
+      }
+
+      const prompts =
+        pairs.length === 0
+          ? this.buildWholePagePrompts(baseline, target)
+          : this.buildComparisonPrompts(baseline, target, changedPairs);
+      if (prompts.length > 0) {
+        console.log(
+          `   🤖 Sending ${prompts.length} request(s) to ${this.provider.name} ${this.comparisonModel}...`,
+        );
+      }
 
       const startTime = Date.now();
-      const response = await this.openai.chat.completions.create({
-        model: "gpt-4",
-        messages: [
-          {
-            role: "system",
-            content:
-              "You are an expert translation quality analyst. Analyze the provided content and identify translation issues, inconsistencies, and quality problems. Provide specific, actionable feedback.",
-          },
-          {
-            role: "user",
-            content: prompt,
-          },
-        ],
-        max_tokens: 2000,
-        temperature: 0.3,
-      });
+      // A batch may come back split, so responses carry their own prompt
+      const settled = await mapSettled(
+        prompts,
+        (entry) => this.requestComparisonEntry(baseline, target, entry),
+        { pool: this.requestPool },
+      );
+      const failure = settled.find((outcome) => outcome.status === "rejected");
+      if (failure) throw failure.reason;
+      const responses = settled.flatMap((outcome) => outcome.value);
 
       const analysisTime = Date.now() - startTime;
-      console.log(`   ⏱️ OpenAI response received in ${analysisTime}ms`);
+      console.log(
+        `   ⏱️ ${this.provider.name} responses received in ${analysisTime}ms`,
+      );
 
-      console.log(`   🔍 Parsing AI response...`);
-      const analysis = JSON.parse(response.choices[0].message.content);
+      const tokenUsage = responses.map(({ entry, usage }) => ({
+        promptTokens: usage?.prompt_tokens ?? entry.promptTokens,
+        completionTokens: usage?.completion_tokens ?? null,
+        budget: entry.budget,
+      }));
+      tokenUsage.forEach((usage, index) => {
+        console.log(
+          `   🔢 Request ${index + 1}/${tokenUsage.length}: ${usage.promptTokens}/${usage.budget} prompt tokens, ${usage.completionTokens ?? "?"} completion tokens`,
+        );
+      });
+
+      let analysis;
+      if (pairs.length === 0) {
+        analysis = responses[0].analysis;
+      } else {
+        const records = new Map();
+        for (const pair of pairs) {
+          if (previous?.[pair.hash]) {
+            records.set(pair.hash, this.carryForward(previous[pair.hash], pair));
+          }
+        }
+        responses.forEach(({ entry, analysis: batchAnalysis }) => {
+          for (const record of this.splitBatchAnalysis(
+            entry.batch,
+            batchAnalysis,
+          )) {
+            records.set(record.hash, record);
+          }
+        });
+
+        const segmentRecords = pairs.map((pair) => records.get(pair.hash));
+        analysis = this.mergeAnalyses(
+          segmentRecords,
+          segmentRecords.map((record) => record.weight),
+        );
+        await this.segmentStore?.save(
+          baseline.url,
+          target.url,
+          Object.fromEntries(records),
+        );
+      }
 
       console.log(
         `   📊 Analysis results: ${analysis.issues?.length || 0} issues found`,
       );
 
-      return {
+      const comparison = {
         targetUrl: target.url,
         targetLanguage: target.detectedLanguage,
         targetTitle: target.title,
@@ -171,46 +694,22 @@ class TranslationAnalyzer {
         suggestions: analysis.suggestions || [],
         terminologyIssues: analysis.terminologyIssues || [],
         brandConsistency: analysis.brandConsistency || [],
+        tokenUsage,
       };
+      await checkpoint?.put("comparison", checkpointKey, comparison);
+      return comparison;
     } catch (error) {
       console.error(`   ❌ Error comparing content: ${error.message}`);
-      if (error.message.includes("JSON")) {
-        console.log(`   🔧 Attempting to fix JSON parsing...`);
-        // Try to extract JSON from response if it's wrapped in text
-        try {
-          const jsonMatch = error.message.match(/\{[\s\S]*\}/);
-          if (jsonMatch) {
-            const analysis = JSON.parse(jsonMatch[0]);
-            console.log(`   ✅ JSON parsing fixed`);
-            return {
-              targetUrl: target.url,
-              targetLanguage: target.detectedLanguage,
-              targetTitle: target.title,
-              qualityScore: analysis.qualityScore || 0,
-              issues: analysis.issues || [],
-              suggestions: analysis.suggestions || [],
-              terminologyIssues: analysis.terminologyIssues || [],
-              brandConsistency: analysis.brandConsistency || [],
-            };
-          }
-        } catch (fixError) {
-          console.log(`   ❌ Could not fix JSON parsing`);
-        }
-      }
-
+      // Flag the comparison instead of inventing a score; it is excluded
+      // from the overall score and retried on the next run
       return {
         targetUrl: target.url,
         targetLanguage: target.detectedLanguage,
         targetTitle: target.title,
-        qualityScore: 0,
-        issues: [
-          {
-            type: "analysis_error",
-            severity: "critical",
-            message: "Failed to analyze content",
-            suggestion: "Check content accessibility",
-          },
-        ],
+        failed: true,
+        error: error.message,
+        qualityScore: null,
+        issues: [],
         suggestions: [],
         terminologyIssues: [],
         brandConsistency: [],
@@ -218,22 +717,287 @@ class TranslationAnalyzer {
     }
   }
 
+  /**
+   * Send one prompt from buildComparisonPrompts. A segment batch whose reply
+   * is cut off even at maxCompletionTokens is split in two and sent again,
+   * one half after the other within the caller's request slot.
+   * @returns {Array} - [{ entry, analysis, usage }], one per prompt sent
+   */
+  async requestComparisonEntry(baseline, target, entry) {
+    try {
+      const { analysis, usage } = await this.requestComparison(entry.prompt);
+      return [{ entry, analysis, usage }];
+    } catch (error) {
+      if (!error.truncated || !(entry.batch?.length > 1)) throw error;
+
+      const middle = Math.ceil(entry.batch.length / 2);
+      console.log(
+        `   ✂️ Reply for ${entry.batch.length} segments still cut off, splitting the batch`,
+      );
+      const results = [];
+      for (const batch of [
+        entry.batch.slice(0, middle),
+        entry.batch.slice(middle),
+      ]) {
+        results.push(
+          ...(await this.requestComparisonEntry(
+            baseline,
+            target,
+            this.buildBatchPrompt(baseline, target, batch, entry.budget),
+          )),
+        );
+      }
+      return results;
+    }
+  }
+
+  /**
+   * Send one comparison prompt and return the schema-validated analysis
+   * @returns {Object} - { analysis, usage }
+   */
+  async requestComparison(prompt) {
+    const { data, response } = await this.createStructuredCompletion(
+      {
+        model: this.comparisonModel,
+        messages: [
+          {
+            role: "system",
+            content:
+              "You are an expert translation quality analyst. Analyze the provided content and identify translation issues, inconsistencies, and quality problems. Provide specific, actionable feedback.",
+          },
+          {
+            role: "user",
+            content: prompt,
+          },
+        ],
+        max_tokens: this.completionTokens,
+        temperature: 0.3,
+      },
+      COMPARISON_OUTPUT,
+    );
+
+    return { analysis: data, usage: response.usage };
+  }
+
+  /**
+   * Split a batch analysis into per-segment records: issues go to the
+   * segment they cite, batch-level findings to the batch's first segment
+   * @returns {Array} - [{ hash, weight, qualityScore, issues, ... }]
+   */
+  splitBatchAnalysis(batch, analysis) {
+    const ids = new Set(batch.map((pair) => pair.id));
+
+    return batch.map((pair, index) => ({
+      hash: pair.hash,
+      weight: pair.weight,
+      qualityScore: analysis.qualityScore || 0,
+      issues: (analysis.issues || []).filter((issue) =>
+        ids.has(issue.segment) ? issue.segment === pair.id : index === 0,
+      ),
+      suggestions: index === 0 ? analysis.suggestions || [] : [],
+      terminologyIssues: index === 0 ? analysis.terminologyIssues || [] : [],
+      brandConsistency: index === 0 ? analysis.brandConsistency || [] : [],
+    }));
+  }
+
+  /**
+   * Reuse a previous run's record for an unchanged segment under its current id
+   */
+  carryForward(record, pair) {
+    return {
+      ...record,
+      issues: record.issues.map((issue) => ({
+        ...issue,
+        segment: pair.id,
+        carriedForward: true,
+      })),
+    };
+  }
+
+  /**
+   * Combine analyses into one, weighting scores by content size
+   */
+  mergeAnalyses(analyses, weights) {
+    const totalWeight = weights.reduce((sum, weight) => sum + weight, 0) || 1;
+    const weightedScore = analyses.reduce(
+      (sum, analysis, index) =>
+        sum + (analysis.qualityScore || 0) * weights[index],
+      0,
+    );
+
+    return {
+      qualityScore: Math.round(weightedScore / totalWeight),
+      issues: analyses.flatMap((analysis) => analysis.issues || []),
+      suggestions: [
+        ...new Set(analyses.flatMap((analysis) => analysis.suggestions || [])),
+      ],
+      terminologyIssues: analyses.flatMap(
+        (analysis) => analysis.terminologyIssues || [],
+      ),
+      brandConsistency: analyses.flatMap(
+        (analysis) => analysis.brandConsistency || [],
+      ),
+    };
+  }
+
+  /**
+   * Single whole-page prompt, for pages without heading/paragraph segments
+   * @returns {Array} - [{ prompt, weight, promptTokens, budget }]
+   */
+  buildWholePagePrompts(baseline, target) {
+    const model = this.comparisonModel;
+    const prompt = this.buildComparisonPrompt(baseline, target);
+    return [
+      {
+        prompt,
+        weight: 1,
+        promptTokens: countTokens(prompt, model),
+        budget: this.promptTokenBudget(model),
+      },
+    ];
+  }
+
+  /**
+   * Build the comparison prompts for aligned heading/paragraph segment
+   * pairs packed into as few token-budgeted batches as possible
+   * @returns {Array} - [{ prompt, batch, weight, promptTokens, budget }]
+   */
+  buildComparisonPrompts(baseline, target, pairs) {
+    const model = this.comparisonModel;
+    const budget = this.promptTokenBudget(model);
+    if (pairs.length === 0) return [];
+
+    // Whatever the instructions and page headers leave is for segments
+    const overhead = countTokens(
+      this.buildSegmentComparisonPrompt(baseline, target, []),
+      model,
+    );
+    const segmentBudget = Math.max(200, budget - overhead);
+    pairs.forEach((pair) => {
+      pair.weight =
+        countTokens(pair.baseline, model) + countTokens(pair.target, model) + 12;
+    });
+
+    const batches = batchPairs(pairs, {
+      budget: segmentBudget,
+      measure: (pair) => pair.weight,
+    });
+    console.log(
+      `   🧩 ${pairs.length} aligned segments packed into ${batches.length} request(s) of up to ${budget} prompt tokens`,
+    );
+
+    return batches.map((batch) =>
+      this.buildBatchPrompt(baseline, target, batch, budget),
+    );
+  }
+
+  /**
+   * Prompt entry for one batch of segment pairs
+   * @returns {Object} - { prompt, batch, weight, promptTokens, budget }
+   */
+  buildBatchPrompt(baseline, target, batch, budget) {
+    const prompt = this.buildSegmentComparisonPrompt(baseline, target, batch);
+    return {
+      prompt,
+      batch,
+      weight: batch.reduce((sum, pair) => sum + pair.weight, 0),
+      promptTokens: countTokens(prompt, this.comparisonModel),
+      budget,
+    };
+  }
+
+  /**
+   * Build comparison prompt for a batch of aligned segment pairs
+   */
+  buildSegmentComparisonPrompt(baseline, target, batch) {
+    const model = this.comparisonModel;
+    // A single oversized pair still has to fit into one request
+    const maxSegmentTokens = Math.floor(this.promptTokenBudget(model) / 3);
+    const segments = batch
+      .map(
+        (pair) => `[${pair.id}] (${pair.type})
+BASELINE: ${pair.baseline === null ? "(no counterpart - content added in target)" : truncateToTokens(pair.baseline, maxSegmentTokens, model)}
+TARGET: ${pair.target === null ? "(missing - not translated)" : truncateToTokens(pair.target, maxSegmentTokens, model)}`,
+      )
+      .join("\n\n");
+
+    return `
+Analyze the translation quality of these aligned segments of two web pages.
+Each segment shows the baseline text and its translation in the target page.
+
+BASELINE (${baseline.detectedLanguage}): ${baseline.url}
+Title: ${baseline.title}
+TARGET (${target.detectedLanguage}): ${target.url}
+Title: ${target.title}
+
+${segments}
+
+Please analyze and return a JSON response with the following structure:
+{
+  "qualityScore": 85,
+  "issues": [
+    {
+      "type": "grammar_error",
+      "severity": "medium",
+      "segment": "S1",
+      "message": "Specific issue description",
+      "context": "Surrounding text",
+      "suggestion": "How to fix it"
+    }
+  ],
+  "suggestions": [
+    "General improvement suggestions"
+  ],
+  "terminologyIssues": [
+    {
+      "term": "inconsistent term",
+      "baseline": "correct term in baseline",
+      "target": "incorrect term in target",
+      "suggestion": "use consistent terminology"
+    }
+  ],
+  "brandConsistency": [
+    {
+      "brandElement": "brand name or element",
+      "issue": "description of inconsistency",
+      "suggestion": "how to maintain consistency"
+    }
+  ]
+}
+
+Focus on:
+1. Grammar and syntax errors
+2. Translation accuracy and fluency
+3. Terminology consistency
+4. Brand name consistency
+5. Cultural appropriateness
+6. Missing or mistranslated content (segments marked as missing)
+7. Formatting and structure issues
+
+Reference the segment id in every issue.
+Rate quality of these segments from 0-100 (100 = perfect translation).
+`;
+  }
+
   /**
    * Build comparison prompt for OpenAI
    */
   buildComparisonPrompt(baseline, target) {
+    const pageTokens = Math.floor(
+      (this.promptTokenBudget(this.comparisonModel) - 600) / 2,
+    );
     return `
 Analyze the translation quality between these two web pages:
 
 BASELINE (${baseline.detectedLanguage}):
 URL: ${baseline.url}
 Title: ${baseline.title}
-Content: ${baseline.bodyText.substring(0, 2000)}...
+Content: ${truncateToTokens(baseline.bodyText, pageTokens, this.comparisonModel)}...
 
 TARGET (${target.detectedLanguage}):
 URL: ${target.url}
 Title: ${target.title}
-Content: ${target.bodyText.substring(0, 2000)}...
+Content: ${truncateToTokens(target.bodyText, pageTokens, this.comparisonModel)}...
 
 Please analyze and return a JSON response with the following structure:
 {
@@ -281,30 +1045,54 @@ Rate quality from 0-100 (100 = perfect translation).
   }
 
   /**
-   * Analyze terminology consistency across multiple versions
+   * Build the map-step prompt extracting key terms from one page
    */
-  async analyzeTerminologyConsistency(scrapedContent) {
-    try {
-      console.log("🔍 Analyzing terminology consistency...");
-      console.log(
-        `📊 Analyzing ${scrapedContent.length} content pieces for terminology consistency`,
-      );
-
-      const prompt = `
-Analyze terminology consistency across these web pages:
+  buildTermExtractionPrompt(content, excerpt) {
+    return `
+Extract the key terminology used on this web page (${content.detectedLanguage}):
 
-${scrapedContent
-  .map(
-    (content, index) => `
-Page ${index + 1} (${content.detectedLanguage}):
 URL: ${content.url}
 Title: ${content.title}
-Content: ${content.bodyText.substring(0, 1500)}...
+Content: ${excerpt}...
+
+List up to ${MAX_TERMS_PER_PAGE} terms that matter for terminology consistency across language versions:
+brand names, product and feature names, UI labels and domain-specific terms.
+Copy each term exactly as written on the page and give the English concept it stands for.
+
+Return a JSON response with:
+{
+  "terms": [
+    {
+      "term": "term as written on the page",
+      "concept": "English name of the concept",
+      "category": "brand | product | ui | domain"
+    }
+  ]
+}
+`;
+  }
+
+  /**
+   * Build the reduce-step prompt for term clusters the local merge could not decide
+   */
+  buildTerminologyReducePrompt(clusters) {
+    return `
+These term clusters come from the language versions of one web page.
+Each cluster groups the terms used for one concept. Decide which clusters
+show a real terminology or brand inconsistency (a brand or product name altered,
+a term translated in some languages but not others, or several terms used for
+the same concept within one language) and which are acceptable localization.
+
+${clusters
+  .map(
+    (cluster) => `
+Cluster ${cluster.id}: "${cluster.concept}" (${cluster.category})
+${cluster.variants.map((variant) => `- ${variant.language}: ${variant.term}`).join("\n")}
 `,
   )
   .join("\n")}
 
-Return a JSON response with:
+Return a JSON response listing only the real inconsistencies:
 {
   "inconsistentTerms": [
     {
@@ -322,53 +1110,195 @@ Return a JSON response with:
       "variations": ["version1", "version2"],
       "recommendedVersion": "consistent version"
     }
-  ],
-  "overallConsistencyScore": 85
+  ]
 }
 `;
+  }
 
-      console.log("🤖 Sending terminology analysis request to OpenAI...");
-      const startTime = Date.now();
-
-      const response = await this.openai.chat.completions.create({
-        model: "gpt-4",
+  /**
+   * Send one terminology prompt and return the schema-validated result
+   */
+  async requestTerminology(prompt, systemPrompt, output) {
+    const { data } = await this.createStructuredCompletion(
+      {
+        model: this.terminologyModel,
         messages: [
           {
             role: "system",
-            content:
-              "You are a terminology and brand consistency expert. Analyze the provided content for terminology and brand inconsistencies.",
+            content: systemPrompt,
           },
           {
             role: "user",
             content: prompt,
           },
         ],
-        max_tokens: 2000,
+        max_tokens: this.completionTokens,
         temperature: 0.3,
-      });
+      },
+      output,
+    );
+    return data;
+  }
 
-      const analysisTime = Date.now() - startTime;
-      console.log(`⏱️ Terminology analysis completed in ${analysisTime}ms`);
 
-      console.log("🔍 Parsing terminology analysis results...");
+  /**
+   * Map step: extract key terms from every page in parallel
+   * @returns {Array} - [{ language, url, terms }] for pages that succeeded
+   */
+  async extractTerms(scrapedContent) {
+    const model = this.terminologyModel;
+    const budget = this.promptTokenBudget(model);
+
+    const settled = await mapSettled(
+      scrapedContent,
+      async (content) => {
+        const overhead = countTokens(
+          this.buildTermExtractionPrompt(content, ""),
+          model,
+        );
+        const excerpt = truncateToTokens(
+          content.bodyText,
+          Math.max(0, budget - overhead),
+          model,
+        );
+        const { terms } = await this.requestTerminology(
+          this.buildTermExtractionPrompt(content, excerpt),
+          "You are a terminology expert. Extract the key terms of the provided page exactly as written.",
+          TERM_EXTRACTION_OUTPUT,
+        );
+        return { language: content.detectedLanguage, url: content.url, terms };
+      },
+      { concurrency: this.requestConcurrency },
+    );
+
+    return settled.flatMap((outcome, index) => {
+      if (outcome.status === "fulfilled") return [outcome.value];
+      console.warn(
+        `⚠️ Term extraction failed for ${scrapedContent[index].url}: ${outcome.reason?.message}`,
+      );
+      return [];
+    });
+  }
+
+  /**
+   * Analyze terminology consistency across multiple versions: terms are
+   * extracted per language in parallel (map), clustered across languages
+   * locally (reduce), and only ambiguous clusters go to a final LLM review,
+   * so cost grows linearly with the number of locales
+   * @param {Array} scrapedContent - Scraped language versions
+   * @param {Object} options - Analysis options
+   * @param {Object} options.baseline - Baseline page the quality analysis
+   *   compared against; the glossary checks translations against it
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
+   */
+  async analyzeTerminologyConsistency(
+    scrapedContent,
+    { baseline = this.selectBaseline(scrapedContent), checkpoint = null } = {},
+  ) {
+    const checkpointKey = scrapedContent
+      .map((content) => content.url)
+      .sort()
+      .join("\n");
+    const restored = checkpoint?.get("terminology", checkpointKey);
+    if (restored) {
+      console.log("♻️ Terminology analysis restored from checkpoint");
+      return restored;
+    }
+
+    try {
+      console.log("🔍 Analyzing terminology consistency...");
+      console.log(
+        `📊 Extracting terms from ${scrapedContent.length} content pieces`,
+      );
+
+      await loadTokenizer();
+      const startTime = Date.now();
+
+      // Glossary terms are decided locally, without API cost
+      const glossary = await this.loadGlossary();
+      const glossaryCheck = glossary?.check(scrapedContent, baseline);
+      if (glossaryCheck) {
+        console.log(
+          `📖 Glossary check: ${glossaryCheck.entriesSeen} glossary terms found, ${glossaryCheck.issues.length} issues`,
+        );
+      }
+
+      const extractions = await this.extractTerms(scrapedContent);
+      if (extractions.length === 0) {
+        throw new Error("Term extraction failed for every page");
+      }
+
+      const clusters = clusterTerms(extractions);
+      const merged = classifyClusters(clusters);
+      if (glossary) {
+        merged.ambiguous = merged.ambiguous.filter(
+          (cluster) =>
+            !cluster.variants.every((variant) => glossary.covers(variant.term)),
+        );
+      }
+      console.log(
+        `🧮 ${clusters.length} term clusters: ${merged.consistent} consistent, ${merged.brandInconsistencies.length} resolved locally, ${merged.ambiguous.length} ambiguous`,
+      );
+
+      const result = {
+        inconsistentTerms: [],
+        brandInconsistencies: merged.brandInconsistencies,
+        glossaryIssues: glossaryCheck?.issues || [],
+        overallConsistencyScore: 100,
+      };
+
+      if (merged.ambiguous.length > 0) {
+        const model = this.terminologyModel;
+        const budget = this.promptTokenBudget(model);
+        const overhead = countTokens(
+          this.buildTerminologyReducePrompt([]),
+          model,
+        );
+        const ambiguous = merged.ambiguous.map((cluster, index) => ({
+          id: `C${index + 1}`,
+          ...cluster,
+        }));
+        const batches = batchPairs(ambiguous, {
+          budget: Math.max(200, budget - overhead),
+          measure: (cluster) =>
+            countTokens(this.buildTerminologyReducePrompt([cluster]), model) -
+            overhead,
+        });
 
-      let result;
-      try {
-        result = JSON.parse(response.choices[0].message.content);
-      } catch (parseError) {
         console.log(
-          "🔧 JSON parsing failed, attempting to extract JSON from response...",
+          `🤖 Sending ${batches.length} terminology review request(s) to ${this.provider.name}...`,
+        );
+        const reviews = await Promise.all(
+          batches.map((batch) =>
+            this.requestTerminology(
+              this.buildTerminologyReducePrompt(batch),
+              "You are a terminology and brand consistency expert. Judge whether the provided term variants are inconsistencies or acceptable localization.",
+              TERMINOLOGY_REVIEW_OUTPUT,
+            ),
+          ),
         );
-        const responseText = response.choices[0].message.content;
-        const jsonMatch = responseText.match(/\{[\s\S]*\}/);
-        if (jsonMatch) {
-          result = JSON.parse(jsonMatch[0]);
-          console.log("✅ JSON extraction successful");
-        } else {
-          throw new Error("Could not extract JSON from response");
+        for (const review of reviews) {
+          result.inconsistentTerms.push(...(review.inconsistentTerms || []));
+          result.brandInconsistencies.push(
+            ...(review.brandInconsistencies || []),
+          );
         }
       }
 
+      // Share of comparable concepts without a reported inconsistency
+      const flagged =
+        result.inconsistentTerms.length +
+        result.brandInconsistencies.length +
+        new Set(result.glossaryIssues.map((issue) => issue.entry)).size;
+      const comparable = merged.comparable + (glossaryCheck?.entriesSeen || 0);
+      result.overallConsistencyScore =
+        comparable > 0
+          ? Math.round(100 * (1 - Math.min(flagged, comparable) / comparable))
+          : 100;
+
+      const analysisTime = Date.now() - startTime;
+      console.log(`⏱️ Terminology analysis completed in ${analysisTime}ms`);
+
       console.log(`📊 Terminology analysis results:`);
       console.log(
         `   - Inconsistent terms: ${result.inconsistentTerms?.length || 0}`,
@@ -376,10 +1306,12 @@ Return a JSON response with:
       console.log(
         `   - Brand inconsistencies: ${result.brandInconsistencies?.length || 0}`,
       );
+      console.log(`   - Glossary issues: ${result.glossaryIssues.length}`);
       console.log(
         `   - Overall consistency score: ${result.overallConsistencyScore || 0}/100`,
       );
 
+      await checkpoint?.put("terminology", checkpointKey, result);
       return result;
     } catch (error) {
       console.error("❌ Error in terminology analysis:", error.message);
@@ -387,6 +1319,7 @@ Return a JSON response with:
       return {
         inconsistentTerms: [],
         brandInconsistencies: [],
+        glossaryIssues: [],
         overallConsistencyScore: 0,
       };
     }
@@ -397,22 +1330,55 @@ Return a JSON response with:
  * Main translation quality analysis tool
  */
 class TranslationQualityAnalyzer {
-  constructor() {
-    this.scraper = new WebScraper();
-    this.analyzer = new TranslationAnalyzer();
+  /**
+   * @param {Object} options - Analyzer options
+   * @param {Object} options.scraper - Options forwarded to WebScraper
+   * @param {Object} options.analyzer - Options forwarded to TranslationAnalyzer
+   * @param {boolean} options.resume - Resume interrupted runs from their checkpoint journal
+   * @param {string} options.checkpointDir - Directory for checkpoint journals
+   * @param {RetryPolicy|Object} options.retry - Retry policy shared by scraping and OpenAI calls, or its options
+   * @param {string} options.reportDir - Directory for saved reports
+   * @param {Array} options.reportFormats - Machine-readable exports saved next to the
+   *   text report: "json", "ndjson" and/or "csv"
+   */
+  constructor(options = {}) {
+    this.resume = options.resume ?? true;
+    this.checkpointDir = options.checkpointDir || ".checkpoints";
+    this.reportDir = options.reportDir || ".";
+    this.reportFormats = options.reportFormats || [];
+    for (const format of this.reportFormats) {
+      if (!REPORT_FORMATS[format]) {
+        throw new Error(`Unknown report format: ${format}`);
+      }
+    }
+    // One retry budget and set of circuits for the whole run
+    this.retry =
+      options.retry instanceof RetryPolicy
+        ? options.retry
+        : new RetryPolicy(options.retry);
+    this.scraper = new WebScraper({ retry: this.retry, ...options.scraper });
+    this.analyzer = new TranslationAnalyzer({
+      retry: this.retry,
+      ...options.analyzer,
+    });
     this.reportGenerator = new ReportGenerator();
+    this.languageDiscovery = new LanguageDiscovery({
+      http: this.scraper.http,
+      userAgent: this.scraper.userAgent,
+    });
   }
 
   /**
-   * Use AI to discover language-specific URLs from a website
+   * Discover language-specific URLs from a website: hreflang alternates,
+   * language switchers, sitemap.xml and URL patterns first, AI as a fallback
    */
-  async discoverLanguageUrls(baseUrl) {
+  async discoverLanguageUrls(baseUrl, { checkpoint = null } = {}) {
     try {
-      console.log("🔍 Using AI to discover language-specific URLs...");
+      console.log("🔍 Discovering language-specific URLs...");
 
       // First, scrape the base URL to get initial content
       console.log(`📥 Scraping base URL: ${baseUrl}`);
-      const baseContent = await this.scraper.scrapeUrl(baseUrl);
+      const baseContent = await this.scraper.scrapeUrl(baseUrl, { checkpoint });
 
       if (!baseContent) {
         throw new Error("Could not scrape base URL");
@@ -420,14 +1386,34 @@ class TranslationQualityAnalyzer {
 
       console.log(`✅ Base content scraped (${baseContent.wordCount} words)`);
 
+      const localStartTime = Date.now();
+      const localUrls = await this.languageDiscovery.discover(
+        baseUrl,
+        baseContent,
+      );
+      if (localUrls.length > 0) {
+        const sources = [...new Set(localUrls.map((lang) => lang.source))];
+        console.log(
+          `🎯 Found ${localUrls.length} language URLs locally in ${Date.now() - localStartTime}ms (${sources.join(", ")})`,
+        );
+        return localUrls;
+      }
+
       // Use AI to analyze the content and discover language URLs
-      console.log("🤖 Analyzing content with AI to find language URLs...");
+      console.log(
+        "🤖 No local language signals found, asking AI to find language URLs...",
+      );
       const prompt = `
       Enter the website and analyze the content to find all possible language-specific URLs for different language versions.
 
 Base URL: ${baseUrl}
 Title: ${baseContent.title}
 Content: ${baseContent.bodyText.substring(0, 3000)}...
+Links:
+${[...(baseContent.navigationLinks || []), ...baseContent.links]
+  .slice(0, 150)
+  .map((link) => `- ${link.href}${link.text ? ` (${link.text})` : ""}`)
+  .join("\n")}
 
 Look for:
 1. Language switcher links
@@ -463,24 +1449,25 @@ Return a JSON response with this structure:
 Focus on finding actual working URLs, not just patterns. Confidence levels: high, medium, low.
 `;
 
-      const response = await this.analyzer.openai.chat.completions.create({
-        model: "gpt-5",
-        messages: [
-          {
-            role: "system",
-            content:
-              "You are an expert web analyst specializing in multilingual website structure. Analyze the provided content to discover language-specific URLs and patterns.",
-          },
+      const { data: discovery } =
+        await this.analyzer.createStructuredCompletion(
           {
-            role: "user",
-            content: prompt,
+            model: this.analyzer.discoveryModel,
+            messages: [
+              {
+                role: "system",
+                content:
+                  "You are an expert web analyst specializing in multilingual website structure. Analyze the provided content to discover language-specific URLs and patterns.",
+              },
+              {
+                role: "user",
+                content: prompt,
+              },
+            ],
+            temperature: 1,
           },
-        ],
-        temperature: 1,
-      });
-      console.log(response.choices[0].message.content);
-      const discovery = JSON.parse(response.choices[0].message.content);
-      console.log(discovery);
+          LANGUAGE_URLS_OUTPUT,
+        );
       console.log(
         `🎯 AI discovered ${discovery.totalLanguages} potential language URLs`,
       );
@@ -496,6 +1483,44 @@ Focus on finding actual working URLs, not just patterns. Confidence levels: high
     }
   }
 
+  /**
+   * Crawl a whole site from its sitemap and analyze every cross-locale page cluster
+   * @param {string} sitemapUrl - sitemap.xml or sitemap index URL
+   * @param {Object} options - SiteCrawler options (concurrency, progressFile, maxClusters)
+   * @returns {Object} - Crawl summary; per-cluster results are in the progress file
+   */
+  async analyzeSite(sitemapUrl, options = {}) {
+    console.log(chalk.cyan("🚀 Starting Site-wide Translation Analysis...\n"));
+    const startTime = Date.now();
+
+    const crawler = new SiteCrawler({
+      scraper: this.scraper,
+      analyzer: this.analyzer,
+      // In batch mode clusters only wait for batches, so let thousands of
+      // them wait together: each analysis phase of the whole crawl then
+      // goes out in a few large batches instead of one round trip per
+      // handful of clusters. Scraping stays bounded by the fetch pool.
+      concurrency: this.analyzer.batch ? 10000 : undefined,
+      ...options,
+    });
+    const summary = await crawler.crawl(sitemapUrl);
+
+    console.log(
+      chalk.green(
+        `\n🎉 Site analysis completed in ${Date.now() - startTime}ms - average score ${summary.averageScore}/100, ${summary.totalIssues} issues (${summary.criticalIssues} critical)`,
+      ),
+    );
+    console.log(chalk.cyan(`📄 Cluster results: ${summary.progressFile}`));
+
+    // Exports are streamed from the journal, never built in memory
+    const timestamp = new Date().toISOString().replace(/[:.]/g, "-");
+    await this.saveExports(
+      () => crawler.results(),
+      `site-analysis-${timestamp}`,
+    );
+    return summary;
+  }
+
   /**
    * Generate a simple report for single language content
    */
@@ -535,158 +1560,318 @@ ${chalk.cyan("=".repeat(80))}
   }
 
   /**
-   * Analyze a single URL or multiple language versions
+   * Open the checkpoint journal for a run; the stages of the run pass it down
+   * to the scraper and analyzer calls, which may be shared with other runs
    */
-  async analyzeUrl(url) {
-    try {
-      console.log(chalk.cyan("🚀 Starting Translation Quality Analysis...\n"));
-
+  async startCheckpoint(runId) {
+    if (!this.resume) return null;
+
+    const checkpoint = await CheckpointStore.forRun(
+      runId,
+      this.checkpointDir,
+    ).open();
+    if (checkpoint.size > 0) {
       console.log(
-        chalk.yellow("🔍 Step 0: Discovering language-specific URLs..."),
+        chalk.cyan(
+          `♻️ Resuming interrupted run: ${checkpoint.size} finished steps restored from ${checkpoint.file}`,
+        ),
       );
-      const discoveryStartTime = Date.now();
-      const languageUrls = await this.discoverLanguageUrls(url);
-      const discoveryTime = Date.now() - discoveryStartTime;
-
-      if (languageUrls.length > 0) {
-        console.log(
-          `✅ Discovered ${languageUrls.length} language URLs in ${discoveryTime}ms:`,
-        );
-        languageUrls.forEach((lang, index) => {
-          console.log(
-            `   ${index + 1}. ${lang.languageName} (${lang.language}) - ${lang.url} [${lang.confidence}]`,
-          );
-        });
-      } else {
-        console.log(
-          "⚠️ No language URLs discovered, analyzing single URL only",
-        );
-      }
-
-      console.log(chalk.yellow("\n📥 Step 1: Scraping web content..."));
-      const scrapeStartTime = Date.now();
-
-      let scrapedContent;
-      if (languageUrls.length > 0) {
-        const urlsToScrape = [url, ...languageUrls.map((lang) => lang.url)];
-        console.log(`🌍 Scraping ${urlsToScrape.length} URLs...`);
-        scrapedContent = await this.scraper.scrapeMultipleLanguages(
-          url,
-          urlsToScrape.slice(1),
-        );
-      } else {
-        scrapedContent = await this.scraper.scrapeMultipleLanguages(url);
-      }
-
-      const scrapeTime = Date.now() - scrapeStartTime;
+    }
+    return checkpoint;
+  }
 
-      if (scrapedContent.length === 0) {
-        throw new Error("No content could be scraped from the provided URLs");
-      }
+  /**
+   * Close the checkpoint journal; a completed run no longer needs it
+   */
+  async finishCheckpoint(checkpoint, completed) {
+    if (!checkpoint) return;
 
+    if (completed) {
+      await checkpoint.clear();
+    } else {
+      await checkpoint.writeChain.catch(() => {});
       console.log(
-        chalk.green(
-          `✅ Successfully scraped ${scrapedContent.length} pages in ${scrapeTime}ms`,
-        ),
+        chalk.yellow(`💾 Progress kept in ${checkpoint.file} - re-run to resume`),
       );
-      scrapedContent.forEach((content, index) => {
-        console.log(
-          `   ${index + 1}. ${content.detectedLanguage.toUpperCase()} - ${content.url} (${content.wordCount} words)`,
-        );
-      });
+    }
+  }
 
-      if (scrapedContent.length < 2) {
-        console.log(
-          chalk.yellow(
-            "\n⚠️ Translation Analysis Skipped: Only one language found",
-          ),
-        );
-        console.log(chalk.cyan("💡 Try a URL with multiple language versions"));
+  /**
+   * Analyze a single URL or multiple language versions
+   */
+  async analyzeUrl(url) {
+    const checkpoint = await this.startCheckpoint(url);
+
+    try {
+      console.log(chalk.cyan("🚀 Starting Translation Quality Analysis...\n"));
 
-        const simpleReport = this.generateSingleLanguageReport(
-          scrapedContent[0],
+      // Scraped pages stream into the quality stage, which compares each
+      // one as soon as it arrives; the bounded queue pauses scraping while
+      // comparisons are behind. Terminology needs every page, so it starts
+      // once scraping is done and runs alongside the remaining comparisons.
+      const pages = new BoundedQueue(this.analyzer.comparisonConcurrency);
+      const pipeline = new Pipeline()
+        .stage("discover", [], () => this.discoverStage(url, checkpoint))
+        .stage("scrape", ["discover"], ({ discover }) =>
+          this.scrapeStage(url, discover, pages, checkpoint),
+        )
+        .stage("quality", ["discover"], ({ discover }) =>
+          this.analyzer.analyzeTranslationQualityStream(pages, {
+            urlOrder: [url, ...discover.map((lang) => lang.url)],
+            checkpoint,
+          }),
+        )
+        .stage("terminology", ["scrape"], ({ scrape }) =>
+          scrape.scrapedContent.length < 2
+            ? null
+            : this.analyzer.analyzeTerminologyConsistency(
+                scrape.scrapedContent,
+                {
+                  baseline: this.analyzer.selectBaseline(scrape.scrapedContent),
+                  checkpoint,
+                },
+              ),
+        )
+        .stage("report", ["scrape", "quality", "terminology"], (results) =>
+          this.reportStage(results),
         );
-        console.log("\n" + simpleReport);
 
-        const timestamp = new Date().toISOString().replace(/[:.]/g, "-");
-        const filename = `single-language-analysis-${timestamp}.txt`;
-        await this.reportGenerator.saveReport(simpleReport, filename);
+      const run = await pipeline.run();
+      const { scrape, report } = run.results;
+
+      console.log(chalk.cyan("\n⏱️ Stage timings:"));
+      console.log(Pipeline.formatTimings(run));
 
+      await this.finishCheckpoint(checkpoint, true);
+      if (!run.results.quality) {
         console.log(chalk.green("\n🎉 Single language analysis completed!"));
         return {
-          scrapedContent,
-          report: simpleReport,
+          scrapedContent: scrape.scrapedContent,
+          report,
           analysisType: "single-language",
+          timings: run.timings,
         };
       }
 
+      console.log(chalk.green(`\n🎉 Analysis completed successfully!`));
+      console.log(chalk.cyan(`📊 Performance: ${run.totalMs}ms total`));
+      return {
+        analysisResults: run.results.quality,
+        terminologyResults: run.results.terminology,
+        scrapedContent: scrape.scrapedContent,
+        scrapeFailures: scrape.scrapeFailures,
+        report,
+        timings: run.timings,
+      };
+    } catch (error) {
+      console.error(chalk.red(`❌ Analysis failed: ${error.message}`));
+      await this.finishCheckpoint(checkpoint, false);
+      throw error;
+    }
+  }
+
+  /**
+   * Pipeline stage: discover the language versions of a URL
+   */
+  async discoverStage(url, checkpoint = null) {
+    console.log(
+      chalk.yellow("🔍 Step 0: Discovering language-specific URLs..."),
+    );
+    const languageUrls = await this.discoverLanguageUrls(url, { checkpoint });
+
+    if (languageUrls.length > 0) {
+      console.log(`✅ Discovered ${languageUrls.length} language URLs:`);
+      languageUrls.forEach((lang, index) => {
+        console.log(
+          `   ${index + 1}. ${lang.languageName} (${lang.language}) - ${lang.url} [${lang.confidence}]`,
+        );
+      });
+    } else {
       console.log(
-        chalk.yellow("\n🔍 Step 2: Analyzing translation quality..."),
+        "⚠️ No language URLs discovered, analyzing single URL only",
       );
-      const analysisStartTime = Date.now();
-      const analysisResults =
-        await this.analyzer.analyzeTranslationQuality(scrapedContent);
-      const analysisTime = Date.now() - analysisStartTime;
-      console.log(
-        `⏱️ Translation quality analysis completed in ${analysisTime}ms`,
+    }
+    return languageUrls;
+  }
+
+  /**
+   * Pipeline stage: scrape the base URL and its language versions
+   * @param {BoundedQueue} pages - Receives each page as soon as it is scraped; closed when done
+   * @param {CheckpointStore} checkpoint - Journal of the current run
+   * @returns {Object} - { scrapedContent, scrapeFailures }
+   */
+  async scrapeStage(url, languageUrls, pages = null, checkpoint = null) {
+    console.log(chalk.yellow("\n📥 Step 1: Scraping web content..."));
+    const failuresBefore = this.scraper.failures.length;
+
+    if (languageUrls.length > 0) {
+      console.log(`🌍 Scraping ${languageUrls.length + 1} URLs...`);
+    }
+    let scrapedContent;
+    try {
+      scrapedContent = await this.scraper.scrapeMultipleLanguages(
+        url,
+        languageUrls.map((lang) => lang.url),
+        {
+          onPage: pages && ((content) => pages.push(content)),
+          // The quality stage waits for failed pages when picking a baseline
+          onError: pages && ((url, error) => pages.push({ url, error })),
+          checkpoint,
+        },
+      );
+    } finally {
+      pages?.close();
+    }
+
+    const scrapeFailures = this.scraper.failures.slice(failuresBefore);
+    if (scrapeFailures.length > 0) {
+      console.warn(
+        `⚠️ ${scrapeFailures.length} URL(s) could not be scraped after retries:`,
       );
+      scrapeFailures.forEach((failure) => {
+        console.warn(`   - ${failure.url}: ${failure.error}`);
+      });
+    }
+
+    if (scrapedContent.length === 0) {
+      throw new Error("No content could be scraped from the provided URLs");
+    }
 
+    console.log(
+      chalk.green(`✅ Successfully scraped ${scrapedContent.length} pages`),
+    );
+    scrapedContent.forEach((content, index) => {
       console.log(
-        chalk.yellow("\n📚 Step 3: Analyzing terminology consistency..."),
+        `   ${index + 1}. ${content.detectedLanguage.toUpperCase()} - ${content.url} (${content.wordCount} words)`,
       );
-      const terminologyStartTime = Date.now();
-      const terminologyResults =
-        await this.analyzer.analyzeTerminologyConsistency(scrapedContent);
-      const terminologyTime = Date.now() - terminologyStartTime;
-      console.log(`⏱️ Terminology analysis completed in ${terminologyTime}ms`);
+    });
 
+    if (scrapedContent.length < 2) {
       console.log(
-        chalk.yellow("\n📄 Step 4: Generating comprehensive report..."),
+        chalk.yellow(
+          "\n⚠️ Translation Analysis Skipped: Only one language found",
+        ),
       );
-      const reportStartTime = Date.now();
-      const report = this.reportGenerator.generateReport(
-        analysisResults,
-        terminologyResults,
-        scrapedContent,
+      console.log(chalk.cyan("💡 Try a URL with multiple language versions"));
+    } else {
+      console.log(
+        chalk.yellow(
+          "\n🔍 Steps 2-3: Finishing translation quality analysis and checking terminology consistency...",
+        ),
       );
-      const reportTime = Date.now() - reportStartTime;
-      console.log(`⏱️ Report generation completed in ${reportTime}ms`);
+    }
+    return { scrapedContent, scrapeFailures };
+  }
 
-      console.log("\n" + report);
+  /**
+   * Pipeline stage: generate, print and save the report
+   * @returns {string} - Report text
+   */
+  async reportStage({ scrape, quality, terminology }) {
+    const timestamp = new Date().toISOString().replace(/[:.]/g, "-");
 
-      const timestamp = new Date().toISOString().replace(/[:.]/g, "-");
-      const filename = `translation-analysis-${timestamp}.txt`;
-      await this.reportGenerator.saveReport(report, filename);
+    if (!quality) {
+      const simpleReport = this.generateSingleLanguageReport(
+        scrape.scrapedContent[0],
+      );
+      console.log("\n" + simpleReport);
+      await this.reportGenerator.saveReport(
+        simpleReport,
+        path.join(this.reportDir, `single-language-analysis-${timestamp}.txt`),
+      );
+      return simpleReport;
+    }
 
-      const totalTime = Date.now() - scrapeStartTime;
-      console.log(chalk.green(`\n🎉 Analysis completed successfully!`));
-      console.log(chalk.cyan(`📊 Performance: ${totalTime}ms total`));
+    console.log(
+      chalk.yellow("\n📄 Step 4: Generating comprehensive report..."),
+    );
+    quality.scrapeFailures = scrape.scrapeFailures;
+    const report = this.reportGenerator.generateReport(
+      quality,
+      terminology,
+      scrape.scrapedContent,
+    );
+    console.log("\n" + report);
+    await this.reportGenerator.saveReport(
+      report,
+      path.join(this.reportDir, `translation-analysis-${timestamp}.txt`),
+    );
+    const results = {
+      analysisResults: quality,
+      terminologyResults: terminology,
+      urls: scrape.scrapedContent.map((content) => content.url),
+    };
+    await this.saveExports(
+      () => [results],
+      `translation-analysis-${timestamp}`,
+    );
+    return report;
+  }
 
-      return {
-        analysisResults,
-        terminologyResults,
-        scrapedContent,
-        report,
-      };
-    } catch (error) {
-      console.error(chalk.red(`❌ Analysis failed: ${error.message}`));
-      throw error;
+  /**
+   * Save the configured machine-readable exports (reportFormats)
+   * @param {Function} results - Returns a fresh (async) iterable of
+   *   { analysisResults, terminologyResults, urls }; called once per format
+   * @param {string} baseName - File name without extension
+   */
+  async saveExports(results, baseName) {
+    for (const format of this.reportFormats) {
+      await this.reportGenerator.saveReport(
+        this.reportGenerator.formatReport(format, results()),
+        path.join(this.reportDir, `${baseName}.${REPORT_FORMATS[format]}`),
+      );
     }
   }
 }
 
 async function main() {
+  const args = process.argv.slice(2);
+  const option = (name) => {
+    const index = args.indexOf(name);
+    return index === -1 ? undefined : args[index + 1];
+  };
+  const valueOptions = new Set([
+    "--sitemap",
+    "--glossary",
+    "--provider",
+    "--format",
+  ]);
+  const positional = args.filter(
+    (arg, index) => !arg.startsWith("--") && !valueOptions.has(args[index - 1]),
+  );
+
   console.log(chalk.blue("🔧 Initializing Translation Quality Analyzer..."));
-  const analyzer = new TranslationQualityAnalyzer();
+  const glossary = option("--glossary");
+  const provider = option("--provider") || process.env.LLM_PROVIDER || "openai";
+  const formats = option("--format");
+  const analyzer = new TranslationQualityAnalyzer({
+    ...(formats && { reportFormats: formats.split(",") }),
+    analyzer: {
+      provider,
+      ...(glossary && { glossary }),
+      ...(args.includes("--batch") && { batch: {} }),
+    },
+  });
 
   try {
-    console.log("🔑 Checking OpenAI API key...");
-    if (!process.env.OPENAI_API_KEY) {
-      console.error(chalk.red("❌ OpenAI API key not found!"));
-      process.exit(1);
+    if (provider === "openai") {
+      console.log("🔑 Checking OpenAI API key...");
+      if (!process.env.OPENAI_API_KEY) {
+        console.error(chalk.red("❌ OpenAI API key not found!"));
+        process.exit(1);
+      }
+    }
+
+    const sitemapUrl = option("--sitemap");
+    if (sitemapUrl) {
+      console.log(`🗺️ Starting site crawl for: ${sitemapUrl}`);
+      console.log(`⏰ Analysis started at: ${new Date().toLocaleString()}`);
+      await analyzer.analyzeSite(sitemapUrl);
+      console.log(`⏰ Analysis completed at: ${new Date().toLocaleString()}`);
+      return;
     }
 
-    const url = "https://www.bobcat.com/eu/en";
+    const url = positional[0] || "https://www.bobcat.com/eu/en";
     console.log(`🎯 Starting analysis for: ${url}`);
     console.log(`⏰ Analysis started at: ${new Date().toLocaleString()}`);
 
@@ -699,6 +1884,11 @@ async function main() {
 }
 
 // Run if this file is executed directly
-main();
+if (
+  process.argv[1] &&
+  import.meta.url === pathToFileURL(process.argv[1]).href
+) {
+  main();
+}
 
 export { TranslationQualityAnalyzer };
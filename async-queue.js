@@ -0,0 +1,75 @@
+/**
+ * Bounded async queue connecting a producer stage to a consumer stage:
+ * push() waits while the queue is full (backpressure), and consumers read
+ * with for await until the producer closes it
+ */
+export class BoundedQueue {
+  /**
+   * @param {number} capacity - Items buffered before push() waits
+   */
+  constructor(capacity = 1) {
+    this.capacity = Math.max(1, capacity);
+    this.items = [];
+    this.closed = false;
+    this.waitingPushers = [];
+    this.waitingReaders = [];
+  }
+
+  get size() {
+    return this.items.length;
+  }
+
+  /**
+   * Add an item, waiting for room if the queue is full.
+   * Items pushed after close() are dropped.
+   */
+  async push(item) {
+    while (this.items.length >= this.capacity && !this.closed) {
+      await new Promise((resolve) => this.waitingPushers.push(resolve));
+    }
+    if (this.closed) return;
+
+    const reader = this.waitingReaders.shift();
+    if (reader) {
+      reader({ value: item, done: false });
+    } else {
+      this.items.push(item);
+    }
+  }
+
+  /**
+   * Signal that no more items will come
+   */
+  close() {
+    this.closed = true;
+    this.waitingPushers.splice(0).forEach((resolve) => resolve());
+    this.waitingReaders
+      .splice(0)
+      .forEach((resolve) => resolve({ value: undefined, done: true }));
+  }
+
+  /**
+   * Take the next item
+   * @returns {Promise} - { value, done } like an async iterator
+   */
+  next() {
+    if (this.items.length > 0) {
+      const value = this.items.shift();
+      this.waitingPushers.shift()?.();
+      return Promise.resolve({ value, done: false });
+    }
+    if (this.closed) return Promise.resolve({ value: undefined, done: true });
+    return new Promise((resolve) => this.waitingReaders.push(resolve));
+  }
+
+  [Symbol.asyncIterator]() {
+    return {
+      next: () => this.next(),
+      // A consumer that stops early releases blocked producers
+      return: async () => {
+        this.close();
+        return { value: undefined, done: true };
+      },
+    };
+  }
+}
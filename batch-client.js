@@ -0,0 +1,193 @@
+import { toFile } from "openai";
+import { classifyError } from "./retry.js";
+
+const TERMINAL_STATUSES = new Set([
+  "completed",
+  "failed",
+  "expired",
+  "cancelled",
+]);
+
+/**
+ * Collects chat completion requests and runs them through the OpenAI Batch
+ * API: pending requests are flushed as one JSONL batch per model once no new
+ * request has arrived for a moment, then polled and mapped back to callers
+ */
+export class BatchCollector {
+  /**
+   * @param {Object} options - Batch options
+   * @param {OpenAI} options.openai - OpenAI client (or any client with files/batches)
+   * @param {RetryPolicy} options.retry - Retry policy for the batch API calls
+   * @param {number} options.flushDelayMs - Idle time after the last request before submitting
+   * @param {number} options.pollIntervalMs - Delay between status checks
+   * @param {number} options.maxRequests - Requests per batch (API limit: 50,000)
+   * @param {string} options.completionWindow - Batch completion window
+   * @param {number} options.maxAttempts - Batches a request may go through
+   *   when its line fails with a transient error (429, 5xx, expired batch)
+   */
+  constructor({
+    openai,
+    retry,
+    flushDelayMs = 2000,
+    pollIntervalMs = 30000,
+    maxRequests = 50000,
+    completionWindow = "24h",
+    maxAttempts = 3,
+  }) {
+    this.openai = openai;
+    this.retry = retry;
+    this.flushDelayMs = flushDelayMs;
+    this.pollIntervalMs = pollIntervalMs;
+    this.maxRequests = maxRequests;
+    this.completionWindow = completionWindow;
+    this.maxAttempts = maxAttempts;
+    this.pending = [];
+    this.timer = null;
+    this.nextId = 1;
+    this.stats = { batches: 0, requests: 0, failed: 0, requeued: 0 };
+  }
+
+  /**
+   * Queue a chat completion request
+   * @param {Object} params - chat.completions.create parameters
+   * @returns {Promise} - Resolves with the chat completion once its batch is done
+   */
+  submit(params) {
+    return new Promise((resolve, reject) => {
+      this.enqueue({ params, resolve, reject, attempts: 1 });
+    });
+  }
+
+  /**
+   * Add a request to the next batch and restart the idle timer
+   */
+  enqueue(request) {
+    // Every batch needs unique custom ids, so a requeued request gets a new one
+    request.customId = `request-${this.nextId++}`;
+    this.pending.push(request);
+
+    clearTimeout(this.timer);
+    if (this.pending.length >= this.maxRequests) {
+      this.flush();
+    } else {
+      this.timer = setTimeout(() => this.flush(), this.flushDelayMs);
+    }
+  }
+
+  /**
+   * Submit everything queued so far, one batch per model
+   */
+  flush() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    const requests = this.pending.splice(0);
+
+    const byModel = new Map();
+    for (const request of requests) {
+      const model = request.params.model;
+      if (!byModel.has(model)) byModel.set(model, []);
+      byModel.get(model).push(request);
+    }
+
+    return Promise.all(
+      [...byModel.values()].map((group) =>
+        this.runBatch(group).catch((error) => {
+          group.forEach((request) => request.reject(error));
+        }),
+      ),
+    );
+  }
+
+  call(label, operation) {
+    return this.retry
+      ? this.retry.run(operation, { key: "openai", label })
+      : operation();
+  }
+
+  /**
+   * Upload, create, poll and distribute the results of one batch
+   */
+  async runBatch(requests) {
+    const jsonl = requests
+      .map((request) =>
+        JSON.stringify({
+          custom_id: request.customId,
+          method: "POST",
+          url: "/v1/chat/completions",
+          body: request.params,
+        }),
+      )
+      .join("\n");
+
+    const file = await this.call("batch upload", async () =>
+      this.openai.files.create({
+        file: await toFile(Buffer.from(jsonl, "utf8"), "batch.jsonl"),
+        purpose: "batch",
+      }),
+    );
+    let batch = await this.call("batch create", () =>
+      this.openai.batches.create({
+        input_file_id: file.id,
+        endpoint: "/v1/chat/completions",
+        completion_window: this.completionWindow,
+      }),
+    );
+    this.stats.batches++;
+    this.stats.requests += requests.length;
+    console.log(
+      `📦 Submitted batch ${batch.id} with ${requests.length} ${requests[0].params.model} request(s)`,
+    );
+
+    while (!TERMINAL_STATUSES.has(batch.status)) {
+      await new Promise((resolve) => setTimeout(resolve, this.pollIntervalMs));
+      batch = await this.call("batch status", () =>
+        this.openai.batches.retrieve(batch.id),
+      );
+      const counts = batch.request_counts || {};
+      console.log(
+        `📦 Batch ${batch.id}: ${batch.status}, ${counts.completed ?? 0}/${counts.total ?? requests.length} done`,
+      );
+    }
+
+    const results = new Map();
+    for (const fileId of [batch.output_file_id, batch.error_file_id]) {
+      if (!fileId) continue;
+      const content = await this.call("batch results", async () =>
+        (await this.openai.files.content(fileId)).text(),
+      );
+      for (const line of content.split("\n")) {
+        if (!line.trim()) continue;
+        const result = JSON.parse(line);
+        results.set(result.custom_id, result);
+      }
+    }
+
+    for (const request of requests) {
+      const result = results.get(request.customId);
+      if (result?.response?.status_code === 200) {
+        request.resolve(result.response.body);
+        continue;
+      }
+
+      const message =
+        result?.error?.message ||
+        result?.response?.body?.error?.message ||
+        `batch ${batch.id} ended as ${batch.status} without a result`;
+      const error = new Error(`Batch request failed: ${message}`);
+      error.status = result?.response?.status_code;
+
+      // Transient line failures join the next batch instead of failing
+      const retryable = result
+        ? classifyError(error).retryable
+        : batch.status === "expired";
+      if (retryable && request.attempts < this.maxAttempts) {
+        request.attempts++;
+        this.stats.requeued++;
+        this.enqueue(request);
+        continue;
+      }
+      this.stats.failed++;
+      request.reject(error);
+    }
+  }
+}
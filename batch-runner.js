@@ -0,0 +1,406 @@
+#!/usr/bin/env node
+
+import fs from "fs/promises";
+import path from "path";
+import { pathToFileURL } from "url";
+import chalk from "chalk";
+import dotenv from "dotenv";
+import { TranslationQualityAnalyzer } from "./analyzer.js";
+import { TaskPool, mapSettled } from "./task-pool.js";
+import { ConnectionPool } from "./connection-pool.js";
+import { ExtractionPool } from "./extraction-pool.js";
+import { RateLimiter } from "./rate-limiter.js";
+import { RetryPolicy } from "./retry.js";
+import { BatchCollector } from "./batch-client.js";
+import { Glossary } from "./glossary.js";
+import { LLMResponseCache } from "./llm-cache.js";
+import { SegmentStore } from "./segment-store.js";
+import { MockProvider, createProvider } from "./llm-provider.js";
+
+dotenv.config();
+
+/**
+ * Audit many sites in one process: every site runs through
+ * TranslationQualityAnalyzer.analyzeUrl, while the fetch pool, connections,
+ * extraction workers, retry budget, LLM backend and API rate limits are
+ * shared by all of them.
+ *
+ * Usage: node batch-runner.js <manifest|-> [--out dir] [--sites n]
+ *                             [--provider name] [--glossary file] [--batch]
+ *                             [--format json,ndjson,csv]
+ *
+ * The manifest lists one site per line ("<url> [name]", # starts a
+ * comment) or is a JSON array of URLs or { url, name } objects. "-" or no
+ * manifest reads it from stdin.
+ */
+
+/**
+ * Parse a site manifest
+ * @param {string} text - Manifest content
+ * @returns {Array} - Unique sites in manifest order: { url, name }
+ */
+export function parseManifest(text) {
+  const trimmed = text.trim();
+  const entries = trimmed.startsWith("[")
+    ? JSON.parse(trimmed).map((entry) =>
+        typeof entry === "string" ? { url: entry } : entry,
+      )
+    : trimmed
+        .split("\n")
+        .map((line) => line.replace(/#.*/, "").trim())
+        .filter(Boolean)
+        .map((line) => {
+          const [url, ...name] = line.split(/\s+/);
+          return { url, name: name.join(" ") };
+        });
+
+  const sites = new Map();
+  for (const entry of entries) {
+    const url = new URL(entry.url).href;
+    if (!sites.has(url)) {
+      sites.set(url, { url, name: entry.name || new URL(url).host });
+    }
+  }
+  return [...sites.values()];
+}
+
+/**
+ * Read a manifest from a file, or from stdin for "-"
+ * @param {string} source - Manifest path or "-"
+ * @returns {Array} - Sites: { url, name }
+ */
+export async function readManifest(source = "-") {
+  if (source !== "-") return parseManifest(await fs.readFile(source, "utf8"));
+
+  const chunks = [];
+  for await (const chunk of process.stdin) chunks.push(chunk);
+  return parseManifest(Buffer.concat(chunks).toString("utf8"));
+}
+
+/**
+ * File-system-safe directory name for a site
+ */
+export function siteSlug(url) {
+  const { host, pathname } = new URL(url);
+  return `${host}${pathname}`
+    .replace(/[^a-zA-Z0-9.-]+/g, "-")
+    .replace(/^-+|-+$/g, "");
+}
+
+/**
+ * Summary row of a site whose analysis threw
+ */
+function failedRow(site, error) {
+  return {
+    ...site,
+    status: "failed",
+    error: error.message,
+    overallScore: null,
+    totalIssues: 0,
+    criticalIssues: 0,
+  };
+}
+
+/**
+ * Runs many sites with shared scraping and LLM resources
+ */
+export class BatchRunner {
+  /**
+   * @param {Object} options - Runner options
+   * @param {string} options.outputDir - Directory for per-site results and the run summary
+   * @param {number} options.siteConcurrency - Sites analyzed at the same time
+   * @param {Object} options.scraper - WebScraper options; maxConcurrency and maxPerHost apply across all sites
+   * @param {Object} options.analyzer - TranslationAnalyzer options; requestsPerMinute, tokensPerMinute, cache and incremental apply across all sites
+   * @param {Object} options.retry - RetryPolicy options for the shared retry budget
+   * @param {boolean} options.resume - Resume interrupted sites from their checkpoint journal
+   * @param {Array} options.reportFormats - Machine-readable exports per site ("json", "ndjson", "csv")
+   */
+  constructor({
+    outputDir = "batch-results",
+    siteConcurrency = Number(process.env.SITE_CONCURRENCY) || 4,
+    scraper = {},
+    analyzer = {},
+    retry = {},
+    resume = true,
+    reportFormats = [],
+  } = {}) {
+    this.outputDir = outputDir;
+    this.reportFormats = reportFormats;
+    this.siteConcurrency = siteConcurrency;
+    this.resume = resume;
+    this.retry = new RetryPolicy(retry);
+
+    const {
+      maxConcurrency = 6,
+      maxPerHost = 3,
+      connections,
+      workers = {},
+      ...scraperOptions
+    } = scraper;
+    this.scraperOptions = {
+      ...scraperOptions,
+      pool: new TaskPool({
+        concurrency: maxConcurrency,
+        perKeyLimit: maxPerHost,
+      }),
+      connections: new ConnectionPool(connections),
+      workers: workers === false ? false : new ExtractionPool(workers),
+    };
+
+    const {
+      provider = process.env.LLM_PROVIDER || "openai",
+      requestsPerMinute = Number(process.env.OPENAI_RPM) || 500,
+      tokensPerMinute = Number(process.env.OPENAI_TPM) || 30000,
+      glossary = process.env.GLOSSARY_FILE,
+      batch = false,
+      cache,
+      incremental = {},
+      ...analyzerOptions
+    } = analyzer;
+    const llm = createProvider(provider);
+    if (batch !== false && !llm.batchClient) {
+      throw new Error(`Batch mode is not supported by ${llm.name}`);
+    }
+    // Recorded responses are replayed by the mock itself
+    const cacheOptions = cache ?? (llm instanceof MockProvider ? false : {});
+    this.analyzerOptions = {
+      ...analyzerOptions,
+      provider: llm,
+      // One cache and one segment store for all sites: their indexes are
+      // loaded once and LRU eviction sees every site's entries
+      cache:
+        cacheOptions === false ? false : new LLMResponseCache(cacheOptions),
+      incremental:
+        incremental === false ? false : new SegmentStore(incremental),
+      glossary,
+      rateLimiter: new RateLimiter({ requestsPerMinute, tokensPerMinute }),
+      batch:
+        batch === false
+          ? false
+          : new BatchCollector({
+              openai: llm.batchClient,
+              retry: this.retry,
+              ...batch,
+            }),
+    };
+  }
+
+  /**
+   * Analyze every site and write the run summary
+   * @param {Array} sites - Sites from parseManifest
+   * @returns {Object} - Run summary (also written to summary.json)
+   */
+  async run(sites) {
+    const startedAt = new Date();
+    await fs.mkdir(this.outputDir, { recursive: true });
+
+    // Parse the glossary once instead of once per site
+    if (typeof this.analyzerOptions.glossary === "string") {
+      this.analyzerOptions.glossary = await Glossary.load(
+        this.analyzerOptions.glossary,
+      );
+    }
+
+    console.log(
+      chalk.cyan(
+        `🚀 Batch run: ${sites.length} sites, ${this.siteConcurrency} at a time, results in ${this.outputDir}\n`,
+      ),
+    );
+
+    let finished = 0;
+    const settled = await mapSettled(
+      sites,
+      async (site) => {
+        const row = await this.runSite(site);
+        finished++;
+        const outcome =
+          row.status === "completed"
+            ? chalk.green(`✅ ${row.overallScore ?? "-"}/100`)
+            : chalk.red(`❌ ${row.error}`);
+        console.log(
+          chalk.cyan(`📦 [${finished}/${sites.length}] ${site.name}: `) +
+            outcome,
+        );
+        return row;
+      },
+      { concurrency: this.siteConcurrency },
+    );
+    const rows = settled.map((outcome, index) =>
+      outcome.status === "fulfilled"
+        ? outcome.value
+        : failedRow(sites[index], outcome.reason),
+    );
+
+    const scored = rows.filter((row) => row.overallScore != null);
+    const summary = {
+      startedAt: startedAt.toISOString(),
+      durationMs: Date.now() - startedAt.getTime(),
+      sites: rows.length,
+      completed: rows.filter((row) => row.status === "completed").length,
+      failed: rows.filter((row) => row.status === "failed").length,
+      averageScore:
+        scored.length > 0
+          ? Math.round(
+              scored.reduce((sum, row) => sum + row.overallScore, 0) /
+                scored.length,
+            )
+          : null,
+      totalIssues: rows.reduce((sum, row) => sum + row.totalIssues, 0),
+      criticalIssues: rows.reduce((sum, row) => sum + row.criticalIssues, 0),
+      connections: this.scraperOptions.connections.getStats(),
+      results: rows,
+    };
+    summary.file = path.join(this.outputDir, "summary.json");
+    await fs.writeFile(summary.file, JSON.stringify(summary, null, 2), "utf8");
+
+    this.printSummary(summary);
+    return summary;
+  }
+
+  /**
+   * Analyze one site and write its result file
+   * @returns {Object} - Summary row for the site
+   */
+  async runSite(site) {
+    const siteDir = path.join(this.outputDir, siteSlug(site.url));
+    await fs.mkdir(siteDir, { recursive: true });
+    const analyzer = new TranslationQualityAnalyzer({
+      resume: this.resume,
+      reportDir: siteDir,
+      reportFormats: this.reportFormats,
+      retry: this.retry,
+      scraper: this.scraperOptions,
+      analyzer: this.analyzerOptions,
+    });
+
+    const startTime = Date.now();
+    let result;
+    let row;
+    try {
+      const analysis = await analyzer.analyzeUrl(site.url);
+      const quality = analysis.analysisResults;
+      result = {
+        ...site,
+        status: "completed",
+        analysisType: analysis.analysisType || "multi-language",
+        pages: analysis.scrapedContent.map((content) => ({
+          url: content.url,
+          language: content.detectedLanguage,
+          title: content.title,
+          wordCount: content.wordCount,
+        })),
+        analysisResults: quality || null,
+        terminologyResults: analysis.terminologyResults || null,
+        scrapeFailures: analysis.scrapeFailures || [],
+        timings: analysis.timings,
+      };
+      row = {
+        ...site,
+        status: "completed",
+        overallScore: quality ? quality.overallScore : null,
+        languages: result.pages.length,
+        failedComparisons: quality?.failedComparisons || 0,
+        totalIssues: quality?.totalIssues || 0,
+        criticalIssues: quality?.criticalIssues || 0,
+        consistencyScore:
+          analysis.terminologyResults?.overallConsistencyScore ?? null,
+        scrapeFailures: result.scrapeFailures.length,
+      };
+    } catch (error) {
+      result = { ...site, status: "failed", error: error.message };
+      row = failedRow(site, error);
+    }
+
+    result.durationMs = row.durationMs = Date.now() - startTime;
+    row.resultFile = path.join(siteDir, "result.json");
+    await fs.writeFile(row.resultFile, JSON.stringify(result, null, 2), "utf8");
+    return row;
+  }
+
+  /**
+   * Print one line per site, lowest scores first
+   */
+  printSummary(summary) {
+    console.log(chalk.cyan("\n📊 Batch summary"));
+    const rows = [...summary.results].sort(
+      (a, b) => (a.overallScore ?? -1) - (b.overallScore ?? -1),
+    );
+    for (const row of rows) {
+      const score =
+        row.status === "failed"
+          ? chalk.red("failed")
+          : `${row.overallScore ?? "-"}/100`;
+      console.log(
+        `   ${String(score).padEnd(8)} ${row.name.padEnd(30)} ${row.totalIssues} issues (${row.criticalIssues} critical) - ${row.url}`,
+      );
+    }
+    console.log(
+      chalk.green(
+        `\n🎉 ${summary.completed}/${summary.sites} sites analyzed in ${summary.durationMs}ms - average score ${summary.averageScore ?? "-"}/100, ${summary.totalIssues} issues (${summary.criticalIssues} critical)`,
+      ),
+    );
+    if (summary.failed > 0) {
+      console.warn(chalk.yellow(`⚠️ ${summary.failed} site(s) failed`));
+    }
+    console.log(chalk.cyan(`📄 Summary: ${summary.file}`));
+  }
+}
+
+async function main() {
+  const args = process.argv.slice(2);
+  const option = (name) => {
+    const index = args.indexOf(name);
+    return index === -1 ? undefined : args[index + 1];
+  };
+  const valueOptions = new Set([
+    "--out",
+    "--sites",
+    "--glossary",
+    "--provider",
+    "--format",
+  ]);
+  const positional = args.filter(
+    (arg, index) => !arg.startsWith("--") && !valueOptions.has(args[index - 1]),
+  );
+
+  try {
+    const provider =
+      option("--provider") || process.env.LLM_PROVIDER || "openai";
+    if (provider === "openai" && !process.env.OPENAI_API_KEY) {
+      console.error(chalk.red("❌ OpenAI API key not found!"));
+      process.exit(1);
+    }
+
+    const sites = await readManifest(positional[0]);
+    if (sites.length === 0) {
+      console.error(chalk.red("❌ The manifest lists no sites"));
+      process.exit(1);
+    }
+
+    const glossary = option("--glossary");
+    const formats = option("--format");
+    const runner = new BatchRunner({
+      ...(formats && { reportFormats: formats.split(",") }),
+      ...(option("--out") && { outputDir: option("--out") }),
+      ...(option("--sites") && { siteConcurrency: Number(option("--sites")) }),
+      analyzer: {
+        provider,
+        ...(glossary && { glossary }),
+        ...(args.includes("--batch") && { batch: {} }),
+      },
+    });
+    const summary = await runner.run(sites);
+    process.exitCode = summary.failed > 0 ? 1 : 0;
+  } catch (error) {
+    console.error(chalk.red(`❌ Error: ${error.message}`));
+    process.exit(1);
+  }
+}
+
+// Run if this file is executed directly
+if (
+  process.argv[1] &&
+  import.meta.url === pathToFileURL(process.argv[1]).href
+) {
+  main();
+}
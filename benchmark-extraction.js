@@ -0,0 +1,135 @@
+#!/usr/bin/env node
+
+import * as cheerio from "cheerio";
+import { extractContent } from "./html-extractor.js";
+
+/**
+ * Previous multi-pass cheerio extraction, kept as the benchmark reference
+ */
+function extractWithCheerio(html, url) {
+  const $ = cheerio.load(html);
+  $("script, style, nav, footer, header").remove();
+
+  const title = $("title").text().trim();
+  const metaDescription = $('meta[name="description"]').attr("content") || "";
+  const bodyText = $("body").text().replace(/\s+/g, " ").trim();
+
+  const headings = [];
+  $("h1, h2, h3, h4, h5, h6").each((i, el) => {
+    const text = $(el).text().trim();
+    if (text) headings.push({ level: el.tagName.toLowerCase(), text });
+  });
+
+  const links = [];
+  $("a[href]").each((i, el) => {
+    const href = $(el).attr("href");
+    const text = $(el).text().trim();
+    if (href && text && !href.startsWith("#") && !href.startsWith("javascript:")) {
+      links.push({ href, text });
+    }
+  });
+
+  const paragraphs = [];
+  $("p").each((i, el) => {
+    const text = $(el).text().trim();
+    if (text && text.length > 10) paragraphs.push(text);
+  });
+
+  const htmlLang = $("html").attr("lang") || "";
+
+  return {
+    url,
+    title,
+    metaDescription,
+    bodyText,
+    headings,
+    links,
+    paragraphs,
+    htmlLang,
+    detectedLanguage: htmlLang.split("-")[0] || "unknown",
+    wordCount: bodyText.split(/\s+/).length,
+  };
+}
+
+/**
+ * Build a product-listing style page of roughly the requested size
+ */
+function buildPage(targetBytes) {
+  const items = [];
+  let size = 0;
+
+  for (let i = 0; size < targetBytes; i++) {
+    const item = `
+    <section class="product">
+      <h2>Compact Track Loader T${i}</h2>
+      <p>The T${i} delivers &amp; outstanding lifting performance, comfort and uptime for demanding jobsites.</p>
+      <ul><li><a href="/eu/en/equipment/loaders/t${i}">View T${i} details</a></li>
+      <li><a href="#specs-${i}">Specs</a></li></ul>
+      <script>window.dataLayer.push({ product: "T${i}" });</script>
+    </section>`;
+    items.push(item);
+    size += item.length;
+  }
+
+  return `<!DOCTYPE html>
+<html lang="en-GB">
+<head>
+  <title>Loaders | Bobcat Company Europe</title>
+  <meta name="description" content="Bobcat loaders for every jobsite">
+  <style>.product { margin: 0 }</style>
+</head>
+<body>
+  <header><nav><a href="/eu/de">Deutsch</a></nav></header>
+  <h1>Loaders</h1>
+  ${items.join("")}
+  <footer><p>© Bobcat Company. All rights reserved.</p></footer>
+</body>
+</html>`;
+}
+
+function time(fn, iterations) {
+  fn();
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < iterations; i++) fn();
+  return Number(process.hrtime.bigint() - start) / 1e6 / iterations;
+}
+
+function sameOutput(singlePass, legacy) {
+  return Object.keys(legacy).every(
+    (key) => JSON.stringify(singlePass[key]) === JSON.stringify(legacy[key]),
+  );
+}
+
+const sizes = [100 * 1024, 1024 * 1024, 2 * 1024 * 1024];
+const url = "https://www.bobcat.com/eu/en/equipment/loaders";
+
+// Whitespace at the edges of the body must not change text or word count
+const edgeCases = {
+  "trailing whitespace": "<html><body><p>hello world </p>\n  </body></html>",
+  "leading whitespace": "<html><body>\n  <p>hello world</p></body></html>",
+  "whitespace only": "<html><body> \n </body></html>",
+  "empty body": "<html><body></body></html>",
+};
+for (const [name, html] of Object.entries(edgeCases)) {
+  if (!sameOutput(extractContent(html, url), extractWithCheerio(html, url))) {
+    console.error(`❌ Extractors disagree on ${name}`);
+    process.exitCode = 1;
+  }
+}
+
+console.log("📏 HTML extraction benchmark (ms per page)\n");
+for (const bytes of sizes) {
+  const html = buildPage(bytes);
+  const iterations = bytes > 1024 * 1024 ? 5 : 20;
+
+  const legacyMs = time(() => extractWithCheerio(html, url), iterations);
+  const singlePassMs = time(() => extractContent(html, url), iterations);
+  const identical = sameOutput(
+    extractContent(html, url),
+    extractWithCheerio(html, url),
+  );
+
+  console.log(
+    `${(html.length / 1024).toFixed(0).padStart(6)} KB  cheerio: ${legacyMs.toFixed(1).padStart(7)}  single-pass: ${singlePassMs.toFixed(1).padStart(7)}  speedup: ${(legacyMs / singlePassMs).toFixed(2)}x  identical output: ${identical ? "yes" : "no"}`,
+  );
+}
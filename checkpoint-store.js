@@ -0,0 +1,101 @@
+import crypto from "crypto";
+import fs from "fs/promises";
+import path from "path";
+
+/**
+ * Append-only JSONL journal of finished work (scrapes, comparisons, ...)
+ * so an interrupted run can resume where it stopped
+ */
+export class CheckpointStore {
+  /**
+   * @param {string} file - Journal file path
+   */
+  constructor(file) {
+    this.file = file;
+    this.entries = new Map();
+    this.writeChain = Promise.resolve();
+  }
+
+  /**
+   * Journal location for a run identified by a string (e.g. the analyzed URL)
+   * @param {string} runId - Run identifier
+   * @param {string} dir - Checkpoint directory
+   */
+  static forRun(runId, dir = ".checkpoints") {
+    const hash = crypto
+      .createHash("sha1")
+      .update(runId)
+      .digest("hex")
+      .slice(0, 16);
+    return new CheckpointStore(path.join(dir, `${hash}.jsonl`));
+  }
+
+  /**
+   * Load the journal written by a previous run, if any
+   * @returns {CheckpointStore} - this, for chaining
+   */
+  async open() {
+    await fs.mkdir(path.dirname(this.file), { recursive: true });
+
+    let journal = "";
+    try {
+      journal = await fs.readFile(this.file, "utf8");
+    } catch (error) {
+      if (error.code !== "ENOENT") throw error;
+    }
+
+    for (const line of journal.split("\n")) {
+      if (!line.trim()) continue;
+      try {
+        const { kind, key, value } = JSON.parse(line);
+        this.entries.set(`${kind}\n${key}`, value);
+      } catch {
+        // A torn final line from a crash is simply redone
+      }
+    }
+    return this;
+  }
+
+  /**
+   * Number of restored or recorded entries
+   */
+  get size() {
+    return this.entries.size;
+  }
+
+  /**
+   * Look up a recorded result
+   * @param {string} kind - Entry kind, e.g. "scrape" or "comparison"
+   * @param {string} key - Entry key within the kind
+   * @returns {*} - Recorded value or undefined
+   */
+  get(kind, key) {
+    return this.entries.get(`${kind}\n${key}`);
+  }
+
+  /**
+   * Record a finished result, appending it to the journal
+   * @param {string} kind - Entry kind
+   * @param {string} key - Entry key within the kind
+   * @param {*} value - JSON-serializable result
+   */
+  put(kind, key, value) {
+    this.entries.set(`${kind}\n${key}`, value);
+    const line = JSON.stringify({ kind, key, value }) + "\n";
+
+    // Serialize appends so concurrent writers never interleave lines
+    this.writeChain = this.writeChain
+      .catch(() => {})
+      .then(() => fs.appendFile(this.file, line, "utf8"));
+    return this.writeChain;
+  }
+
+  /**
+   * Delete the journal once the run has completed
+   */
+  async clear() {
+    await this.writeChain;
+    this.entries.clear();
+    await fs.rm(this.file, { force: true });
+  }
+}
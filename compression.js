@@ -0,0 +1,156 @@
+import { Transform, pipeline } from "stream";
+import zlib from "zlib";
+
+const ZSTD_AVAILABLE = typeof zlib.createZstdDecompress === "function";
+
+/**
+ * Accept-Encoding value advertising every encoding this runtime can decode
+ */
+export const ACCEPT_ENCODING = [
+  "br",
+  ...(ZSTD_AVAILABLE ? ["zstd"] : []),
+  "gzip",
+  "deflate",
+].join(", ");
+
+/**
+ * Create a streaming decoder for one content-coding
+ */
+function createDecoder(encoding) {
+  switch (encoding) {
+    case "br":
+      return zlib.createBrotliDecompress();
+    case "zstd":
+      if (ZSTD_AVAILABLE) return zlib.createZstdDecompress();
+      break;
+    case "gzip":
+    case "x-gzip":
+    case "deflate":
+      return zlib.createUnzip();
+    case "identity":
+    case "":
+      return null;
+  }
+  throw new Error(`Unsupported Content-Encoding: ${encoding}`);
+}
+
+/**
+ * Pass-through stream counting the bytes flowing through it
+ */
+function createByteCounter(counters, field, onChunk = null) {
+  return new Transform({
+    transform(chunk, encoding, callback) {
+      counters[field] += chunk.length;
+      onChunk?.();
+      callback(null, chunk);
+    },
+  });
+}
+
+/**
+ * Decompress a response body stream, counting bytes on the wire and after
+ * decoding. With responseType "stream" the HTTP client's timeout stops at
+ * the headers, so the body gets its own: the stream fails with ETIMEDOUT
+ * when no bytes arrive for idleTimeoutMs or the download outlasts
+ * totalTimeoutMs (0 disables either).
+ * @param {Readable} body - Raw (still encoded) response stream
+ * @param {string} contentEncoding - Content-Encoding response header
+ * @param {Object} options - Timeouts for reading the body
+ * @param {number} options.idleTimeoutMs - Longest pause between chunks
+ * @param {number} options.totalTimeoutMs - Longest time for the whole body
+ * @returns {Object} - { stream, transfer } where transfer holds the byte counters
+ */
+export function decodeResponseStream(
+  body,
+  contentEncoding = "",
+  { idleTimeoutMs = 0, totalTimeoutMs = 0 } = {},
+) {
+  const encodings = contentEncoding
+    .split(",")
+    .map((encoding) => encoding.trim().toLowerCase())
+    .filter((encoding) => encoding && encoding !== "identity");
+
+  const transfer = {
+    contentEncoding: encodings.join(", ") || "identity",
+    compressedBytes: 0,
+    decompressedBytes: 0,
+  };
+
+  // Codings are listed in the order they were applied, so undo them in reverse
+  let decoders;
+  try {
+    decoders = encodings.reverse().map(createDecoder).filter(Boolean);
+  } catch (error) {
+    // Nobody is going to read the body; release its socket
+    body.destroy();
+    throw error;
+  }
+
+  const expire = (message) => {
+    const error = new Error(message);
+    error.code = "ETIMEDOUT";
+    body.destroy(error);
+  };
+  let idleTimer = null;
+  const touch = () => {
+    if (idleTimeoutMs <= 0) return;
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(
+      expire,
+      idleTimeoutMs,
+      `Response body stalled for ${idleTimeoutMs}ms`,
+    );
+  };
+  const totalTimer =
+    totalTimeoutMs > 0
+      ? setTimeout(
+          expire,
+          totalTimeoutMs,
+          `Response body not complete after ${totalTimeoutMs}ms`,
+        )
+      : null;
+  touch();
+
+  const stream = pipeline(
+    body,
+    createByteCounter(transfer, "compressedBytes", touch),
+    ...decoders,
+    createByteCounter(transfer, "decompressedBytes"),
+    () => {
+      clearTimeout(idleTimer);
+      clearTimeout(totalTimer);
+    },
+  );
+
+  return { stream, transfer };
+}
+
+/**
+ * Read a whole stream into a UTF-8 string
+ */
+export async function readStreamAsText(stream) {
+  const chunks = [];
+  for await (const chunk of stream) chunks.push(chunk);
+  return Buffer.concat(chunks).toString("utf8");
+}
+
+/**
+ * Read a whole stream into a Uint8Array that owns its ArrayBuffer, so the
+ * buffer can be transferred to a worker without copying
+ */
+export async function readStreamAsBytes(stream) {
+  const chunks = [];
+  let length = 0;
+  for await (const chunk of stream) {
+    chunks.push(chunk);
+    length += chunk.length;
+  }
+
+  const bytes = new Uint8Array(length);
+  let offset = 0;
+  for (const chunk of chunks) {
+    bytes.set(chunk, offset);
+    offset += chunk.length;
+  }
+  return bytes;
+}
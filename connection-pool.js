@@ -0,0 +1,125 @@
+import dns from "dns";
+import http from "http";
+import https from "https";
+
+/**
+ * Shared keep-alive HTTP/HTTPS agents with a DNS cache and connection reuse metrics
+ */
+export class ConnectionPool {
+  /**
+   * @param {Object} options - Pool options
+   * @param {number} options.maxSockets - Maximum open sockets per host
+   * @param {number} options.maxFreeSockets - Idle sockets kept per host
+   * @param {number} options.keepAliveMsecs - TCP keep-alive initial delay
+   * @param {number} options.freeSocketTimeout - Idle time before a pooled socket is closed
+   * @param {number} options.dnsTtlMs - How long resolved addresses are reused
+   */
+  constructor({
+    maxSockets = 10,
+    maxFreeSockets = 10,
+    keepAliveMsecs = 1000,
+    freeSocketTimeout = 15000,
+    dnsTtlMs = 60000,
+  } = {}) {
+    this.dnsTtlMs = dnsTtlMs;
+    this.dnsCache = new Map();
+    this.stats = {
+      requests: 0,
+      reusedConnections: 0,
+      newConnections: 0,
+      dnsLookups: 0,
+      dnsCacheHits: 0,
+    };
+
+    const agentOptions = {
+      keepAlive: true,
+      keepAliveMsecs,
+      maxSockets,
+      maxFreeSockets,
+      timeout: freeSocketTimeout,
+      lookup: (hostname, options, callback) =>
+        this.lookup(hostname, options, callback),
+    };
+    this.httpAgent = new http.Agent(agentOptions);
+    this.httpsAgent = new https.Agent(agentOptions);
+  }
+
+  /**
+   * dns.lookup-compatible resolver that caches answers for dnsTtlMs
+   */
+  lookup(hostname, options, callback) {
+    if (typeof options === "function") {
+      callback = options;
+      options = {};
+    }
+
+    const reply = (addresses) => {
+      const family = options.family === 6 ? 6 : options.family === 4 ? 4 : 0;
+      const matching = family
+        ? addresses.filter((entry) => entry.family === family)
+        : addresses;
+
+      if (matching.length === 0) {
+        const error = new Error(`getaddrinfo ENOTFOUND ${hostname}`);
+        error.code = "ENOTFOUND";
+        callback(error);
+      } else if (options.all) {
+        callback(null, matching);
+      } else {
+        callback(null, matching[0].address, matching[0].family);
+      }
+    };
+
+    const cached = this.dnsCache.get(hostname);
+    if (cached && cached.expiresAt > Date.now()) {
+      this.stats.dnsCacheHits++;
+      reply(cached.addresses);
+      return;
+    }
+
+    this.stats.dnsLookups++;
+    dns.lookup(hostname, { all: true }, (error, addresses) => {
+      if (error) {
+        callback(error);
+        return;
+      }
+      this.dnsCache.set(hostname, {
+        addresses,
+        expiresAt: Date.now() + this.dnsTtlMs,
+      });
+      reply(addresses);
+    });
+  }
+
+  /**
+   * Record whether a completed request reused a pooled socket
+   * @param {Object} request - Node ClientRequest (axios response.request)
+   */
+  recordRequest(request) {
+    this.stats.requests++;
+    if (request?.reusedSocket) {
+      this.stats.reusedConnections++;
+    } else {
+      this.stats.newConnections++;
+    }
+  }
+
+  /**
+   * Connection reuse metrics
+   */
+  getStats() {
+    const { requests, reusedConnections } = this.stats;
+    return {
+      ...this.stats,
+      reuseRate: requests > 0 ? reusedConnections / requests : 0,
+    };
+  }
+
+  /**
+   * Close all pooled sockets
+   */
+  destroy() {
+    this.httpAgent.destroy();
+    this.httpsAgent.destroy();
+  }
+}
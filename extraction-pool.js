@@ -0,0 +1,125 @@
+import os from "os";
+import { Worker } from "worker_threads";
+
+const WORKER_URL = new URL("./extraction-worker.js", import.meta.url);
+
+/**
+ * Pool of worker threads running HTML extraction, so parsing large pages
+ * does not stall network I/O and LLM response handling on the main thread.
+ * The raw HTML bytes are transferred to the worker rather than copied.
+ */
+export class ExtractionPool {
+  /**
+   * @param {Object} options - Pool options
+   * @param {number} options.size - Maximum worker threads (defaults to the CPU count)
+   */
+  constructor({
+    size = Number(process.env.EXTRACTION_WORKERS) ||
+      os.availableParallelism?.() ||
+      os.cpus().length,
+  } = {}) {
+    this.size = Math.max(1, size);
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.nextId = 1;
+    this.stats = { jobs: 0, bytes: 0, crashes: 0 };
+  }
+
+  /**
+   * Extract the content object from raw HTML in a worker thread
+   * @param {Uint8Array} html - UTF-8 HTML; its ArrayBuffer is transferred and unusable afterwards
+   * @param {string} url - URL the HTML was fetched from
+   * @returns {Promise} - Extracted content and metadata
+   */
+  extract(html, url) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, html, url, resolve, reject });
+      this.drain();
+    });
+  }
+
+  /**
+   * Hand queued jobs to idle workers, starting workers up to the pool size
+   */
+  drain() {
+    while (this.queue.length > 0) {
+      const worker =
+        this.idle.pop() ||
+        (this.workers.length < this.size ? this.spawn() : null);
+      if (!worker) return;
+
+      const job = this.queue.shift();
+      worker.job = job;
+      // Busy workers keep the process alive, idle ones do not
+      worker.ref();
+      this.stats.jobs++;
+      this.stats.bytes += job.html.byteLength;
+
+      // Only transfer an ArrayBuffer the bytes own; a view on a shared
+      // buffer (e.g. Node's Buffer pool) is copied instead
+      const owned =
+        job.html.byteOffset === 0 &&
+        job.html.byteLength === job.html.buffer.byteLength;
+      worker.postMessage(
+        { id: job.id, url: job.url, html: job.html },
+        owned ? [job.html.buffer] : [],
+      );
+    }
+  }
+
+  spawn() {
+    const worker = new Worker(WORKER_URL);
+    worker.job = null;
+
+    worker.on("message", ({ id, content, error }) => {
+      const { job } = worker;
+      if (!job || job.id !== id) return;
+      worker.job = null;
+      worker.unref();
+      this.idle.push(worker);
+      if (error) {
+        job.reject(new Error(`Extraction failed for ${job.url}: ${error}`));
+      } else {
+        job.resolve(content);
+      }
+      this.drain();
+    });
+
+    // A crashed worker fails its job and is replaced on the next drain
+    const remove = (error) => {
+      if (!this.workers.includes(worker)) return;
+      this.workers.splice(this.workers.indexOf(worker), 1);
+      this.idle = this.idle.filter((entry) => entry !== worker);
+      if (worker.job) {
+        this.stats.crashes++;
+        worker.job.reject(
+          error || new Error(`Extraction worker exited (${worker.job.url})`),
+        );
+        worker.job = null;
+      }
+      this.drain();
+    };
+    worker.on("error", remove);
+    worker.on("exit", () => remove());
+
+    worker.unref();
+    this.workers.push(worker);
+    return worker;
+  }
+
+  /**
+   * Stop all workers; queued jobs are rejected
+   */
+  async close() {
+    const pending = this.queue.splice(0);
+    pending.forEach((job) => job.reject(new Error("Extraction pool closed")));
+    const workers = this.workers.splice(0);
+    this.idle = [];
+    for (const worker of workers) {
+      worker.job?.reject(new Error("Extraction pool closed"));
+      worker.job = null;
+    }
+    await Promise.all(workers.map((worker) => worker.terminate()));
+  }
+}
@@ -0,0 +1,17 @@
+import { parentPort } from "worker_threads";
+import { extractContent } from "./html-extractor.js";
+
+/**
+ * Worker side of ExtractionPool: decodes the transferred HTML bytes and runs
+ * the extractor, off the main event loop
+ */
+parentPort.on("message", ({ id, url, html }) => {
+  try {
+    // A view on the transferred ArrayBuffer, not a copy
+    const bytes = Buffer.from(html.buffer, html.byteOffset, html.byteLength);
+    const content = extractContent(bytes.toString("utf8"), url);
+    parentPort.postMessage({ id, content });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
@@ -0,0 +1,472 @@
+import fs from "fs/promises";
+import path from "path";
+import { Parser } from "htmlparser2";
+
+/**
+ * Local brand/terminology glossary checks: terms from a CSV or TBX glossary
+ * are compiled into an Aho-Corasick automaton and every page is scanned in
+ * one linear pass for missing, misspelled and inconsistent terms
+ */
+
+// Term statuses mapped from TBX administrativeStatus/normativeAuthorization
+const TBX_STATUS = {
+  "preferredterm-admn-sts": "preferred",
+  "admittedterm-admn-sts": "admitted",
+  "deprecatedterm-admn-sts": "forbidden",
+  "supersededterm-admn-sts": "forbidden",
+  preferred: "preferred",
+  admitted: "admitted",
+  deprecated: "forbidden",
+  superseded: "forbidden",
+};
+
+// TBX term types marking names that must never be translated or altered
+const TBX_NAME_TYPES = new Set(["productname", "propernoun", "brand"]);
+
+// Scripts written with spaces between words, where matches need word boundaries
+const SPACED_SCRIPT_CHAR =
+  /[\p{Script=Latin}\p{Script=Cyrillic}\p{Script=Greek}\p{Script=Arabic}\p{Script=Hebrew}\p{N}]/u;
+const WORD_CHAR = /[\p{L}\p{N}]/u;
+
+function foldChar(char) {
+  const lower = char.toLowerCase();
+  // Keep offsets aligned with the original text
+  return lower.length === 1 ? lower : char;
+}
+
+function fold(text) {
+  let folded = "";
+  for (let i = 0; i < text.length; i++) folded += foldChar(text[i]);
+  return folded;
+}
+
+function primaryLanguage(code) {
+  return code === "*"
+    ? "*"
+    : String(code || "*")
+        .toLowerCase()
+        .split(/[-_]/)[0];
+}
+
+/**
+ * Preferred form of an entry for a language, falling back to all-language terms
+ */
+function preferredTerm(entry, language) {
+  const candidates = entry.terms.filter(
+    (term) =>
+      term.status !== "forbidden" &&
+      (term.language === language || term.language === "*"),
+  );
+  const ranked = [...candidates].sort(
+    (a, b) =>
+      (a.language === "*") - (b.language === "*") ||
+      (a.status !== "preferred") - (b.status !== "preferred"),
+  );
+  return ranked[0]?.text;
+}
+
+/**
+ * Case-insensitive multi-pattern matcher (Aho-Corasick)
+ */
+export class AhoCorasick {
+  /**
+   * @param {Array} patterns - Pattern strings
+   */
+  constructor(patterns) {
+    this.patterns = patterns;
+    this.transitions = [new Map()];
+    this.fail = [0];
+    this.outputs = [[]];
+
+    patterns.forEach((pattern, index) => {
+      let state = 0;
+      for (const char of fold(pattern).split("")) {
+        let next = this.transitions[state].get(char);
+        if (next === undefined) {
+          next = this.transitions.length;
+          this.transitions.push(new Map());
+          this.fail.push(0);
+          this.outputs.push([]);
+          this.transitions[state].set(char, next);
+        }
+        state = next;
+      }
+      this.outputs[state].push(index);
+    });
+
+    // Breadth-first failure links
+    const queue = [...this.transitions[0].values()];
+    while (queue.length > 0) {
+      const state = queue.shift();
+      for (const [char, next] of this.transitions[state]) {
+        let fallback = this.fail[state];
+        while (fallback > 0 && !this.transitions[fallback].has(char)) {
+          fallback = this.fail[fallback];
+        }
+        const target = this.transitions[fallback].get(char);
+        this.fail[next] = target !== undefined && target !== next ? target : 0;
+        this.outputs[next] = [
+          ...this.outputs[next],
+          ...this.outputs[this.fail[next]],
+        ];
+        queue.push(next);
+      }
+    }
+  }
+
+  /**
+   * Find all pattern occurrences in a text
+   * @returns {Array} - [{ start, end, pattern }] in order of their end offset
+   */
+  search(text) {
+    const matches = [];
+    let state = 0;
+    for (let i = 0; i < text.length; i++) {
+      const char = foldChar(text[i]);
+      while (state > 0 && !this.transitions[state].has(char)) {
+        state = this.fail[state];
+      }
+      state = this.transitions[state].get(char) ?? 0;
+      for (const pattern of this.outputs[state]) {
+        matches.push({
+          start: i + 1 - this.patterns[pattern].length,
+          end: i + 1,
+          pattern,
+        });
+      }
+    }
+    return matches;
+  }
+}
+
+/**
+ * Minimal RFC 4180 CSV parser
+ */
+function parseCsv(text) {
+  const rows = [];
+  let row = [];
+  let field = "";
+  let quoted = false;
+
+  for (let i = 0; i < text.length; i++) {
+    const char = text[i];
+    if (quoted) {
+      if (char === '"' && text[i + 1] === '"') {
+        field += '"';
+        i++;
+      } else if (char === '"') {
+        quoted = false;
+      } else {
+        field += char;
+      }
+    } else if (char === '"') {
+      quoted = true;
+    } else if (char === ",") {
+      row.push(field);
+      field = "";
+    } else if (char === "\n" || char === "\r") {
+      if (char === "\r" && text[i + 1] === "\n") i++;
+      row.push(field);
+      rows.push(row);
+      row = [];
+      field = "";
+    } else {
+      field += char;
+    }
+  }
+  if (field || row.length > 0) {
+    row.push(field);
+    rows.push(row);
+  }
+  return rows.filter((cells) => cells.some((cell) => cell.trim()));
+}
+
+/**
+ * Brand and terminology glossary with a linear-time page scanner
+ */
+export class Glossary {
+  /**
+   * @param {Array} entries - [{ id, brand, terms: [{ text, language, status }] }]
+   */
+  constructor(entries) {
+    this.entries = entries;
+    this.variants = entries.flatMap((entry) =>
+      entry.terms.map((term) => ({ ...term, entry })),
+    );
+    this.automaton = new AhoCorasick(this.variants.map((term) => term.text));
+    this.folded = new Set(this.variants.map((term) => fold(term.text)));
+  }
+
+  /**
+   * Load a glossary from a .csv or .tbx file
+   */
+  static async load(file) {
+    const text = await fs.readFile(file, "utf8");
+    const extension = path.extname(file).toLowerCase();
+    return extension === ".tbx" || extension === ".xml"
+      ? Glossary.fromTbx(text)
+      : Glossary.fromCsv(text);
+  }
+
+  /**
+   * CSV with a header row: id, language, term, status, type.
+   * Only "term" is required; language defaults to "*" (all languages),
+   * status to "preferred" (or "admitted", "forbidden") and type to "term"
+   * (or "brand" for names that must stay identical everywhere)
+   */
+  static fromCsv(text) {
+    const [header = [], ...rows] = parseCsv(text);
+    const columns = header.map((name) => name.trim().toLowerCase());
+    if (!columns.includes("term")) {
+      throw new Error('Glossary CSV needs a "term" column');
+    }
+
+    const entries = new Map();
+    for (const cells of rows) {
+      const row = Object.fromEntries(
+        columns.map((name, index) => [name, (cells[index] || "").trim()]),
+      );
+      if (!row.term) continue;
+
+      const id = row.id || row.term;
+      if (!entries.has(id)) entries.set(id, { id, brand: false, terms: [] });
+      const entry = entries.get(id);
+      entry.brand ||= ["brand", "product"].includes(row.type?.toLowerCase());
+      entry.terms.push({
+        text: row.term,
+        language: primaryLanguage(row.language || "*"),
+        status: row.status?.toLowerCase() || "preferred",
+      });
+    }
+    return new Glossary([...entries.values()]);
+  }
+
+  /**
+   * TBX (TermBase eXchange): termEntry > langSet > tig|ntig|termSec > term
+   */
+  static fromTbx(text) {
+    const entries = [];
+    let entry = null;
+    let language = "*";
+    let term = null;
+    let capture = null;
+    let buffer = "";
+
+    const parser = new Parser(
+      {
+        onopentag(name, attributes) {
+          const tag = name.toLowerCase();
+          if (tag === "termentry" || tag === "conceptentry") {
+            entry = {
+              id: attributes.id || `entry-${entries.length + 1}`,
+              brand: false,
+              terms: [],
+            };
+          } else if (tag === "langset" || tag === "langsec") {
+            language = primaryLanguage(attributes["xml:lang"]);
+          } else if (
+            entry &&
+            (tag === "tig" || tag === "ntig" || tag === "termsec")
+          ) {
+            term = { text: "", language, status: "preferred" };
+          } else if (tag === "term" && term) {
+            capture = "term";
+            buffer = "";
+          } else if (
+            (tag === "termnote" || tag === "descrip") &&
+            (term || entry)
+          ) {
+            capture = attributes.type;
+            buffer = "";
+          }
+        },
+        ontext(data) {
+          if (capture) buffer += data;
+        },
+        onclosetag(name) {
+          const tag = name.toLowerCase();
+          const value = buffer.trim();
+          if (capture === "term" && tag === "term") {
+            term.text = value;
+          } else if (
+            capture === "administrativeStatus" ||
+            capture === "normativeAuthorization"
+          ) {
+            if (term) {
+              term.status = TBX_STATUS[value.toLowerCase()] || term.status;
+            }
+          } else if (capture === "termType") {
+            if (TBX_NAME_TYPES.has(value.toLowerCase())) entry.brand = true;
+          } else if (capture === "subjectField") {
+            if (value.toLowerCase() === "brand") entry.brand = true;
+          }
+          if (tag === "term" || tag === "termnote" || tag === "descrip") {
+            capture = null;
+          }
+
+          if ((tag === "tig" || tag === "ntig" || tag === "termsec") && term) {
+            if (term.text) entry.terms.push(term);
+            term = null;
+          } else if (tag === "langset" || tag === "langsec") {
+            language = "*";
+          } else if (tag === "termentry" || tag === "conceptentry") {
+            if (entry.terms.length > 0) entries.push(entry);
+            entry = null;
+          }
+        },
+      },
+      { xmlMode: true },
+    );
+    parser.write(text);
+    parser.end();
+
+    return new Glossary(entries);
+  }
+
+  /**
+   * Whether a term (in any casing) is a glossary variant
+   */
+  covers(text) {
+    return this.folded.has(fold(String(text || "").trim()));
+  }
+
+  /**
+   * Non-overlapping, word-bounded glossary term occurrences in a text
+   * (leftmost-longest)
+   * @returns {Array} - [{ start, end, found, variant }]
+   */
+  scan(text) {
+    const matches = this.automaton
+      .search(text)
+      .filter(({ start, end, pattern }) => {
+        const variant = this.variants[pattern].text;
+        const boundedStart =
+          !SPACED_SCRIPT_CHAR.test(variant[0]) ||
+          start === 0 ||
+          !WORD_CHAR.test(text[start - 1]);
+        const boundedEnd =
+          !SPACED_SCRIPT_CHAR.test(variant[variant.length - 1]) ||
+          end === text.length ||
+          !WORD_CHAR.test(text[end]);
+        return boundedStart && boundedEnd;
+      })
+      .sort((a, b) => a.start - b.start || b.end - a.end);
+
+    const result = [];
+    let covered = 0;
+    for (const match of matches) {
+      if (match.start < covered) continue;
+      covered = match.end;
+      result.push({
+        start: match.start,
+        end: match.end,
+        found: text.slice(match.start, match.end),
+        variant: this.variants[match.pattern],
+      });
+    }
+    return result;
+  }
+
+  /**
+   * Check scraped pages against the glossary
+   * @param {Array} scrapedContent - Pages, baseline included
+   * @param {Object} baseline - The page translations are checked against
+   *   for missing terms (defaults to the first page)
+   * @returns {Object} - { issues, entriesSeen }
+   */
+  check(scrapedContent, baseline = scrapedContent[0]) {
+    const baselineIndex = Math.max(0, scrapedContent.indexOf(baseline));
+    const pages = scrapedContent.map((content) => {
+      const byEntry = new Map();
+      for (const match of this.scan(content.bodyText || "")) {
+        const { entry } = match.variant;
+        if (!byEntry.has(entry)) byEntry.set(entry, []);
+        byEntry.get(entry).push(match);
+      }
+      return {
+        url: content.url,
+        language: primaryLanguage(content.detectedLanguage),
+        byEntry,
+      };
+    });
+
+    const issues = [];
+    const entriesSeen = new Set();
+    const report = (type, entry, page, found, expected, count = 1) =>
+      issues.push({
+        type,
+        entry: entry.id,
+        brand: entry.brand,
+        language: page.language,
+        url: page.url,
+        found,
+        expected,
+        count,
+      });
+
+    pages.forEach((page, pageIndex) => {
+      for (const [entry, matches] of page.byEntry) {
+        entriesSeen.add(entry.id);
+        const forLanguage = entry.terms.filter(
+          (term) => term.language === page.language,
+        );
+        const allowed = entry.terms.filter(
+          (term) =>
+            term.status !== "forbidden" &&
+            (term.language === page.language || term.language === "*"),
+        );
+        const expected = preferredTerm(entry, page.language);
+
+        const counts = new Map();
+        for (const match of matches) {
+          const { variant, found } = match;
+          if (variant.status === "forbidden") {
+            report("misspelled", entry, page, found, expected);
+          } else if (entry.brand && found !== variant.text) {
+            report("misspelled", entry, page, found, variant.text);
+          } else if (
+            forLanguage.length > 0 &&
+            variant.language !== page.language &&
+            !allowed.some((term) => fold(term.text) === fold(found))
+          ) {
+            report("inconsistent", entry, page, found, expected);
+          } else {
+            counts.set(variant.text, (counts.get(variant.text) || 0) + 1);
+          }
+        }
+
+        // Several allowed variants of one concept on the same page
+        if (counts.size > 1) {
+          report(
+            "inconsistent",
+            entry,
+            page,
+            [...counts.keys()].join(", "),
+            expected,
+            [...counts.values()].reduce((sum, count) => sum + count, 0),
+          );
+        }
+      }
+
+      // Baseline terms the translation lost entirely
+      if (pageIndex === baselineIndex) return;
+      for (const entry of pages[baselineIndex].byEntry.keys()) {
+        if (page.byEntry.has(entry)) continue;
+        const expected = preferredTerm(entry, page.language);
+        if (expected) report("missing", entry, page, null, expected);
+      }
+    });
+
+    // Repeated occurrences of the same finding collapse into one issue
+    const merged = new Map();
+    for (const issue of issues) {
+      const key = [issue.type, issue.entry, issue.url, issue.found].join("\n");
+      if (merged.has(key)) {
+        merged.get(key).count += issue.count;
+      } else {
+        merged.set(key, issue);
+      }
+    }
+    return { issues: [...merged.values()], entriesSeen: entriesSeen.size };
+  }
+}
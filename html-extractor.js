@@ -0,0 +1,287 @@
+import { Parser } from "htmlparser2";
+import { StringDecoder } from "string_decoder";
+
+const SKIPPED_TAGS = new Set(["script", "style", "nav", "footer", "header"]);
+const HEADING_TAGS = new Set(["h1", "h2", "h3", "h4", "h5", "h6"]);
+const MAX_NAVIGATION_LINKS = 500;
+
+/**
+ * Single-pass, streaming extractor producing the scraper's content object.
+ * Feed HTML with write() (whole document or chunks) and call end().
+ */
+export class ContentExtractor {
+  /**
+   * @param {string} url - URL the HTML belongs to
+   * @param {Object} options - Extractor options
+   * @param {number} options.maxBodyTextLength - Cap on collected text, bounding memory on huge
+   *   pages: body text (and so wordCount) stops growing at this many characters, and paragraphs,
+   *   links and headings together stop at the same number of characters
+   */
+  constructor(url, { maxBodyTextLength = Infinity } = {}) {
+    this.url = url;
+    this.maxBodyTextLength = maxBodyTextLength;
+    this.title = "";
+    this.metaDescription = null;
+    this.htmlLang = "";
+    this.headings = [];
+    this.links = [];
+    this.paragraphs = [];
+    this.alternateLinks = [];
+    this.navigationLinks = [];
+    this.navigationHrefs = new Set();
+
+    // Characters held by paragraphs, links and headings, open captures included
+    this.capturedLength = 0;
+
+    this.bodyText = "";
+    this.bodyEndsWithSpace = true;
+    this.wordCount = 1;
+
+    this.skipDepth = 0;
+    this.headDepth = 0;
+    this.titleDepth = 0;
+    this.captures = [];
+
+    this.parser = new Parser(
+      {
+        onopentag: (name, attributes) => this.onOpenTag(name, attributes),
+        ontext: (text) => this.onText(text),
+        onclosetag: (name) => this.onCloseTag(name),
+      },
+      { decodeEntities: true, lowerCaseTags: true },
+    );
+  }
+
+  /**
+   * Parse another chunk of HTML
+   */
+  write(chunk) {
+    this.parser.write(chunk);
+  }
+
+  /**
+   * Finish parsing and return the extracted content
+   * @returns {Object} - Same shape as WebScraper.scrapeUrl results
+   */
+  end() {
+    this.parser.end();
+
+    const bodyText = this.bodyText.trimEnd();
+
+    return {
+      url: this.url,
+      title: this.title.trim(),
+      metaDescription: this.metaDescription || "",
+      bodyText,
+      headings: this.headings,
+      links: this.links,
+      paragraphs: this.paragraphs,
+      alternateLinks: this.alternateLinks,
+      navigationLinks: this.navigationLinks,
+      htmlLang: this.htmlLang,
+      detectedLanguage: this.htmlLang.split("-")[0] || "unknown",
+      // Every space counted a word boundary; a trailing one did not start a word
+      wordCount: this.bodyText.endsWith(" ")
+        ? this.wordCount - 1
+        : this.wordCount,
+      scrapedAt: new Date().toISOString(),
+    };
+  }
+
+  onOpenTag(name, attributes) {
+    if (name === "link") {
+      this.collectAlternateLink(attributes);
+    } else if (name === "a") {
+      this.collectNavigationLink(attributes);
+    }
+
+    if (this.skipDepth > 0 || SKIPPED_TAGS.has(name)) {
+      this.skipDepth++;
+      return;
+    }
+
+    switch (name) {
+      case "html":
+        if (!this.htmlLang) this.htmlLang = attributes.lang || "";
+        break;
+      case "head":
+        this.headDepth++;
+        break;
+      case "title":
+        this.titleDepth++;
+        break;
+      case "meta":
+        if (
+          attributes.name === "description" &&
+          this.metaDescription === null
+        ) {
+          this.metaDescription = attributes.content || "";
+        }
+        break;
+      case "a":
+        if (attributes.href !== undefined) {
+          this.captures.push({ name, parts: [], href: attributes.href });
+        }
+        break;
+      case "p":
+        this.captures.push({ name, parts: [] });
+        break;
+      default:
+        if (HEADING_TAGS.has(name)) {
+          this.captures.push({ name, parts: [] });
+        }
+    }
+  }
+
+  onText(text) {
+    if (this.skipDepth > 0) return;
+
+    if (this.titleDepth > 0) this.title += text;
+
+    for (const capture of this.captures) {
+      const room = this.maxBodyTextLength - this.capturedLength;
+      if (room <= 0) break;
+      const part = text.length > room ? text.slice(0, room) : text;
+      capture.parts.push(part);
+      this.capturedLength += part.length;
+    }
+
+    if (this.headDepth === 0 && this.titleDepth === 0) {
+      this.appendBodyText(text);
+    }
+  }
+
+  onCloseTag(name) {
+    if (this.skipDepth > 0) {
+      this.skipDepth--;
+      return;
+    }
+
+    switch (name) {
+      case "head":
+        this.headDepth = Math.max(0, this.headDepth - 1);
+        return;
+      case "title":
+        this.titleDepth = Math.max(0, this.titleDepth - 1);
+        return;
+    }
+
+    const index = this.captures.findLastIndex(
+      (capture) => capture.name === name,
+    );
+    if (index === -1) return;
+
+    const [capture] = this.captures.splice(index, 1);
+    const raw = capture.parts.join("");
+    const text = raw.trim();
+    // Only the kept text counts against the cap
+    this.capturedLength -= raw.length - text.length;
+
+    if (name === "a") {
+      const { href } = capture;
+      if (
+        href &&
+        text &&
+        !href.startsWith("#") &&
+        !href.startsWith("javascript:")
+      ) {
+        this.links.push({ href, text });
+        return;
+      }
+    } else if (name === "p") {
+      if (text && text.length > 10) {
+        this.paragraphs.push(text);
+        return;
+      }
+    } else if (text) {
+      this.headings.push({ level: name, text });
+      return;
+    }
+    // Dropped captures give their characters back
+    this.capturedLength -= text.length;
+  }
+
+  /**
+   * Record <link rel="alternate" hreflang> translations of the page
+   */
+  collectAlternateLink(attributes) {
+    const rel = (attributes.rel || "").toLowerCase().split(/\s+/);
+    if (rel.includes("alternate") && attributes.hreflang && attributes.href) {
+      this.alternateLinks.push({
+        hreflang: attributes.hreflang,
+        href: attributes.href,
+      });
+    }
+  }
+
+  /**
+   * Record links that language switchers are made of: anchors carrying
+   * hreflang/lang, and any anchor inside the nav/header/footer chrome that
+   * is otherwise dropped from the extracted content
+   */
+  collectNavigationLink(attributes) {
+    const { href } = attributes;
+    const hreflang = attributes.hreflang || attributes.lang || "";
+    if (!href || (!hreflang && this.skipDepth === 0)) return;
+    if (this.navigationLinks.length >= MAX_NAVIGATION_LINKS) return;
+    if (this.navigationHrefs.has(href)) return;
+
+    this.navigationHrefs.add(href);
+    this.navigationLinks.push({ href, hreflang });
+  }
+
+  /**
+   * Append text with whitespace collapsed to single spaces, counting words
+   * as it goes so the body text is never rescanned
+   */
+  appendBodyText(text) {
+    if (this.bodyText.length >= this.maxBodyTextLength) return;
+
+    let normalized = text.replace(/\s+/g, " ");
+    if (this.bodyEndsWithSpace && normalized.startsWith(" ")) {
+      normalized = normalized.slice(1);
+    }
+    if (!normalized) return;
+    normalized = normalized.slice(
+      0,
+      this.maxBodyTextLength - this.bodyText.length,
+    );
+
+    for (let i = 0; i < normalized.length; i++) {
+      if (normalized.charCodeAt(i) === 32) this.wordCount++;
+    }
+    this.bodyText += normalized;
+    this.bodyEndsWithSpace = normalized.endsWith(" ");
+  }
+}
+
+/**
+ * Extract the content object from a complete HTML document in one pass
+ * @param {string} html - Raw HTML
+ * @param {string} url - URL the HTML was fetched from
+ * @returns {Object} - Extracted content and metadata
+ */
+export function extractContent(html, url) {
+  const extractor = new ContentExtractor(url);
+  extractor.write(html);
+  return extractor.end();
+}
+
+/**
+ * Extract the content object from a readable HTML stream, chunk by chunk
+ * @param {Readable} stream - Response body stream
+ * @param {string} url - URL the HTML was fetched from
+ * @param {Object} options - ContentExtractor options
+ * @returns {Object} - Extracted content and metadata
+ */
+export async function extractContentFromStream(stream, url, options = {}) {
+  const extractor = new ContentExtractor(url, options);
+  const decoder = new StringDecoder("utf8");
+
+  for await (const chunk of stream) {
+    extractor.write(typeof chunk === "string" ? chunk : decoder.write(chunk));
+  }
+  extractor.write(decoder.end());
+
+  return extractor.end();
+}
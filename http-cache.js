@@ -0,0 +1,68 @@
+import crypto from "crypto";
+import fs from "fs/promises";
+import path from "path";
+
+/**
+ * Persistent store of HTTP validators (ETag / Last-Modified) and the
+ * structured content extracted from each URL
+ */
+export class HttpCache {
+  /**
+   * @param {Object} options - Cache options
+   * @param {string} options.dir - Directory holding one JSON file per URL
+   */
+  constructor({ dir = ".cache/http" } = {}) {
+    this.dir = dir;
+    this.hits = 0;
+  }
+
+  /**
+   * File path for a URL
+   */
+  fileFor(url) {
+    const hash = crypto.createHash("sha256").update(url).digest("hex");
+    return path.join(this.dir, `${hash}.json`);
+  }
+
+  /**
+   * Load the cached entry for a URL
+   * @param {string} url - Requested URL
+   * @returns {Object|null} - { etag, lastModified, content } or null
+   */
+  async get(url) {
+    try {
+      return JSON.parse(await fs.readFile(this.fileFor(url), "utf8"));
+    } catch {
+      return null;
+    }
+  }
+
+  /**
+   * Conditional request headers for a cached entry
+   */
+  conditionalHeaders(entry) {
+    const headers = {};
+    if (entry?.etag) headers["If-None-Match"] = entry.etag;
+    if (entry?.lastModified) headers["If-Modified-Since"] = entry.lastModified;
+    return headers;
+  }
+
+  /**
+   * Store validators and extracted content, if the response has any validators
+   * @param {string} url - Requested URL
+   * @param {Object} headers - Response headers
+   * @param {Object} content - Extracted content object
+   */
+  async set(url, headers, content) {
+    const etag = headers.etag || null;
+    const lastModified = headers["last-modified"] || null;
+    if (!etag && !lastModified) return;
+
+    await fs.mkdir(this.dir, { recursive: true });
+    await fs.writeFile(
+      this.fileFor(url),
+      JSON.stringify({ url, etag, lastModified, content }),
+      "utf8",
+    );
+  }
+}
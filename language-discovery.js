@@ -0,0 +1,196 @@
+import { SitemapReader } from "./sitemap.js";
+
+const LOCALE_SEGMENT = /^([a-z]{2,3})(?:[-_]([a-z]{2}|\d{3}))?$/i;
+const languageNames = new Intl.DisplayNames(["en"], { type: "language" });
+
+/**
+ * Parse a locale code such as "de", "de-AT" or "pt_BR"
+ * @returns {Object|null} - { code, language, languageName } or null for non-locales
+ */
+export function parseLocale(value) {
+  const match = LOCALE_SEGMENT.exec(value || "");
+  if (!match) return null;
+
+  const language = match[1].toLowerCase();
+  let languageName;
+  try {
+    languageName = languageNames.of(language);
+  } catch {
+    return null;
+  }
+  // DisplayNames echoes codes it does not know
+  if (!languageName || languageName.toLowerCase() === language) return null;
+
+  const code = match[2] ? `${language}-${match[2].toLowerCase()}` : language;
+  return { code, language, languageName };
+}
+
+/**
+ * Normalize a URL for comparisons (no hash, no trailing slash)
+ */
+export function normalizeUrl(url) {
+  const parsed = new URL(url);
+  parsed.hash = "";
+  return parsed.href.replace(/\/$/, "");
+}
+
+/**
+ * Deterministic discovery of a page's language versions from hreflang
+ * alternates, language-switcher links, sitemap alternates and URL patterns
+ */
+export class LanguageDiscovery {
+  /**
+   * @param {Object} options - Discovery options
+   * @param {Object} options.http - axios instance used to read sitemap.xml
+   * @param {string} options.userAgent - User-Agent for sitemap requests
+   */
+  constructor({ http, userAgent } = {}) {
+    this.http = http;
+    this.userAgent = userAgent;
+  }
+
+  /**
+   * Discover language URLs for a scraped page
+   * @param {string} baseUrl - URL of the page
+   * @param {Object} baseContent - Content object returned by WebScraper.scrapeUrl
+   * @returns {Array} - [{ language, languageName, url, confidence, source }]
+   */
+  async discover(baseUrl, baseContent) {
+    const found = new Map();
+    const base = normalizeUrl(baseContent.url || baseUrl);
+
+    const add = (locale, href, confidence, source) => {
+      if (!locale) return;
+      let url;
+      try {
+        url = normalizeUrl(new URL(href, baseUrl).href);
+      } catch {
+        return;
+      }
+      if (url === base || found.has(url)) return;
+
+      found.set(url, {
+        language: locale.code,
+        languageName: locale.languageName,
+        url,
+        confidence,
+        source,
+      });
+    };
+
+    for (const link of baseContent.alternateLinks || []) {
+      add(parseLocale(link.hreflang), link.href, "high", "hreflang");
+    }
+
+    for (const link of baseContent.navigationLinks || []) {
+      if (link.hreflang) {
+        add(parseLocale(link.hreflang), link.href, "high", "language-switcher");
+      }
+    }
+
+    if (found.size === 0) {
+      for (const link of await this.fromSitemap(baseUrl)) {
+        add(parseLocale(link.hreflang), link.href, "high", "sitemap");
+      }
+    }
+
+    if (found.size === 0) {
+      const hrefs = [
+        ...(baseContent.navigationLinks || []),
+        ...(baseContent.links || []),
+      ].map((link) => link.href);
+
+      for (const candidate of this.fromUrlPatterns(baseUrl, hrefs)) {
+        add(candidate.locale, candidate.url, "medium", "url-pattern");
+      }
+    }
+
+    return [...found.values()];
+  }
+
+  /**
+   * Read xhtml:link alternates for the page from the site's sitemap.xml
+   * @returns {Array} - [{ hreflang, href }]
+   */
+  async fromSitemap(baseUrl) {
+    if (!this.http) return [];
+
+    const sitemapUrl = new URL("/sitemap.xml", baseUrl).href;
+    const target = normalizeUrl(baseUrl);
+    const reader = new SitemapReader({
+      http: this.http,
+      userAgent: this.userAgent,
+      maxSitemaps: 20,
+    });
+
+    try {
+      for await (const entry of reader.entries(sitemapUrl)) {
+        try {
+          if (normalizeUrl(entry.loc) === target) return entry.alternates;
+        } catch {
+          // Ignore malformed <loc> entries
+        }
+      }
+    } catch {
+      // No readable sitemap
+    }
+    return [];
+  }
+
+  /**
+   * Find sibling URLs that differ from the base URL only in a locale path
+   * segment (or a lang query parameter)
+   * @returns {Array} - [{ locale, url }]
+   */
+  fromUrlPatterns(baseUrl, hrefs) {
+    const base = new URL(baseUrl);
+    const baseSegments = base.pathname.split("/").filter(Boolean);
+    const localePositions = baseSegments
+      .map((segment, index) => (parseLocale(segment) ? index : -1))
+      .filter((index) => index !== -1);
+
+    const byPosition = new Map(localePositions.map((index) => [index, []]));
+    const byQuery = [];
+
+    for (const href of hrefs) {
+      let url;
+      try {
+        url = new URL(href, base);
+      } catch {
+        continue;
+      }
+      if (url.origin !== base.origin) continue;
+
+      const langParam = url.searchParams.get("lang");
+      if (langParam && parseLocale(langParam)) {
+        byQuery.push({ locale: parseLocale(langParam), url: url.href });
+      }
+
+      const segments = url.pathname.split("/").filter(Boolean);
+      for (const index of localePositions) {
+        const locale = parseLocale(segments[index]);
+        const samePrefix = baseSegments
+          .slice(0, index)
+          .every((segment, i) => segments[i] === segment);
+
+        if (locale && samePrefix && segments[index] !== baseSegments[index]) {
+          // Same page with only the locale segment swapped
+          const sibling = new URL(base.href);
+          sibling.pathname = baseSegments
+            .map((segment, i) => (i === index ? segments[index] : segment))
+            .join("/");
+          byPosition.get(index).push({ locale, url: sibling.href });
+        }
+      }
+    }
+
+    // A locale position is only trusted when several languages vary there;
+    // the deepest one wins, since region segments usually precede language
+    for (const index of [...localePositions].reverse()) {
+      const matches = byPosition.get(index);
+      const languages = new Set(matches.map((match) => match.locale.code));
+      if (languages.size >= 2) return matches;
+    }
+    return byQuery;
+  }
+}
@@ -0,0 +1,154 @@
+import crypto from "crypto";
+import fs from "fs/promises";
+import path from "path";
+
+/**
+ * On-disk, content-addressed cache for LLM responses with TTL and LRU eviction
+ */
+export class LLMResponseCache {
+  /**
+   * @param {Object} options - Cache options
+   * @param {string} options.dir - Directory holding one JSON file per response
+   * @param {number} options.ttlMs - Maximum age of an entry
+   * @param {number} options.maxBytes - Total size above which the least recently used entries are evicted
+   */
+  constructor({
+    dir = ".cache/llm",
+    ttlMs = 7 * 24 * 60 * 60 * 1000,
+    maxBytes = 50 * 1024 * 1024,
+  } = {}) {
+    this.dir = dir;
+    this.ttlMs = ttlMs;
+    this.maxBytes = maxBytes;
+    this.index = null;
+    this.indexPromise = null;
+    this.hits = 0;
+    this.misses = 0;
+  }
+
+  /**
+   * Hash every request parameter that influences the response
+   * (model, system and user prompts, temperature, max_tokens, ...)
+   */
+  static keyFor(params) {
+    return crypto
+      .createHash("sha256")
+      .update(JSON.stringify(params))
+      .digest("hex");
+  }
+
+  /**
+   * Load file sizes and access times once so eviction does not rescan the directory
+   */
+  loadIndex() {
+    if (!this.indexPromise) {
+      this.indexPromise = (async () => {
+        const index = new Map();
+        await fs.mkdir(this.dir, { recursive: true });
+        const files = await fs.readdir(this.dir);
+
+        await Promise.all(
+          files
+            .filter((file) => file.endsWith(".json"))
+            .map(async (file) => {
+              const stat = await fs.stat(path.join(this.dir, file));
+              index.set(file, { size: stat.size, usedAt: stat.mtimeMs });
+            }),
+        );
+        this.index = index;
+        return index;
+      })();
+    }
+    return this.indexPromise;
+  }
+
+  /**
+   * Look up a cached response
+   * @param {string} key - Cache key from keyFor()
+   * @returns {Object|null} - Cached response or null when missing/expired
+   */
+  async get(key) {
+    const index = await this.loadIndex();
+    const file = `${key}.json`;
+
+    if (!index.has(file)) {
+      this.misses++;
+      return null;
+    }
+
+    try {
+      const entry = JSON.parse(
+        await fs.readFile(path.join(this.dir, file), "utf8"),
+      );
+
+      if (Date.now() - entry.createdAt > this.ttlMs) {
+        await this.delete(file);
+        this.misses++;
+        return null;
+      }
+
+      // Touch the file so the LRU order survives restarts
+      const now = new Date();
+      await fs.utimes(path.join(this.dir, file), now, now);
+      index.get(file).usedAt = now.getTime();
+
+      this.hits++;
+      return entry.response;
+    } catch {
+      await this.delete(file);
+      this.misses++;
+      return null;
+    }
+  }
+
+  /**
+   * Store a response and evict least recently used entries above maxBytes
+   * @param {string} key - Cache key from keyFor()
+   * @param {Object} response - Response to store
+   */
+  async set(key, response) {
+    const index = await this.loadIndex();
+    const file = `${key}.json`;
+    const data = JSON.stringify({ createdAt: Date.now(), response });
+
+    await fs.writeFile(path.join(this.dir, file), data, "utf8");
+    index.set(file, { size: Buffer.byteLength(data), usedAt: Date.now() });
+
+    await this.evict();
+  }
+
+  /**
+   * Drop a cached response, e.g. one that turned out to be unusable
+   * @param {string} key - Cache key from keyFor()
+   */
+  async invalidate(key) {
+    await this.loadIndex();
+    await this.delete(`${key}.json`);
+  }
+
+  /**
+   * Remove least recently used entries until the cache fits into maxBytes
+   */
+  async evict() {
+    let totalBytes = 0;
+    for (const { size } of this.index.values()) totalBytes += size;
+    if (totalBytes <= this.maxBytes) return;
+
+    const byAge = [...this.index.entries()].sort(
+      (a, b) => a[1].usedAt - b[1].usedAt,
+    );
+    for (const [file, { size }] of byAge) {
+      if (totalBytes <= this.maxBytes) break;
+      await this.delete(file);
+      totalBytes -= size;
+    }
+  }
+
+  /**
+   * Delete one cache file
+   */
+  async delete(file) {
+    this.index?.delete(file);
+    await fs.rm(path.join(this.dir, file), { force: true });
+  }
+}
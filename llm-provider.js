@@ -0,0 +1,112 @@
+import fs from "fs/promises";
+import path from "path";
+import OpenAI from "openai";
+import { LLMResponseCache } from "./llm-cache.js";
+import { mockCompletion } from "./mock-openai-server.js";
+
+/**
+ * LLM backends behind one interface:
+ *   name                        - label for logs and retry circuits
+ *   createChatCompletion(params) - chat completion in the OpenAI response shape
+ *   batchClient                 - client with files/batches for batch mode, or null
+ */
+
+/**
+ * OpenAI, or any server speaking the OpenAI API at another base URL
+ * (vLLM, Ollama, LiteLLM, Azure-compatible gateways, ...)
+ */
+export class OpenAIProvider {
+  /**
+   * @param {Object} options - Provider options
+   * @param {string} options.apiKey - API key
+   * @param {string} options.baseURL - API base URL (defaults to api.openai.com)
+   */
+  constructor({ apiKey = process.env.OPENAI_API_KEY, baseURL } = {}) {
+    this.client = new OpenAI({
+      apiKey,
+      ...(baseURL && { baseURL }),
+      // Retries go through the analyzer's shared policy
+      maxRetries: 0,
+    });
+    this.name = baseURL ? `LLM ${new URL(baseURL).host}` : "OpenAI";
+    this.batchClient = this.client;
+  }
+
+  createChatCompletion(params) {
+    return this.client.chat.completions.create(params);
+  }
+}
+
+/**
+ * Deterministic offline backend: replays responses recorded by
+ * LLMResponseCache for identical requests and answers everything else with
+ * schema-valid placeholders, after a fixed latency
+ */
+export class MockProvider {
+  /**
+   * @param {Object} options - Provider options
+   * @param {string} options.recordingsDir - Directory of recorded responses (an LLM cache dir)
+   * @param {number} options.latencyMs - Delay of every response
+   */
+  constructor({ recordingsDir = ".cache/llm", latencyMs = 0 } = {}) {
+    this.recordingsDir = recordingsDir;
+    this.latencyMs = latencyMs;
+    this.name = "mock";
+    this.batchClient = null;
+    this.replayed = 0;
+    this.generated = 0;
+  }
+
+  async createChatCompletion(params) {
+    await new Promise((resolve) => setTimeout(resolve, this.latencyMs));
+
+    const file = path.join(
+      this.recordingsDir,
+      `${LLMResponseCache.keyFor(params)}.json`,
+    );
+    try {
+      const { response } = JSON.parse(await fs.readFile(file, "utf8"));
+      this.replayed++;
+      return response;
+    } catch {
+      this.generated++;
+      return mockCompletion(params);
+    }
+  }
+}
+
+/**
+ * Build a provider from a name, an options object or an existing provider
+ * @param {string|Object} spec - "openai", "openai-compatible", "mock",
+ *   { type, ...options }, or an object implementing createChatCompletion
+ * @returns {Object} - Provider
+ */
+export function createProvider(spec = process.env.LLM_PROVIDER || "openai") {
+  if (typeof spec?.createChatCompletion === "function") return spec;
+
+  const { type, ...options } = typeof spec === "string" ? { type: spec } : spec;
+  switch (type) {
+    case "openai":
+      return new OpenAIProvider(options);
+    case "openai-compatible": {
+      const baseURL = options.baseURL || process.env.LLM_BASE_URL;
+      if (!baseURL) {
+        throw new Error("openai-compatible provider needs LLM_BASE_URL");
+      }
+      return new OpenAIProvider({
+        // Self-hosted servers often take no key, but the SDK requires one
+        apiKey:
+          process.env.LLM_API_KEY || process.env.OPENAI_API_KEY || "unused",
+        ...options,
+        baseURL,
+      });
+    }
+    case "mock":
+      return new MockProvider({
+        latencyMs: Number(process.env.MOCK_LATENCY_MS) || 0,
+        ...options,
+      });
+    default:
+      throw new Error(`Unknown LLM provider: ${type}`);
+  }
+}
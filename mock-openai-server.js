@@ -0,0 +1,259 @@
+#!/usr/bin/env node
+
+import http from "http";
+import crypto from "crypto";
+import { pathToFileURL } from "url";
+
+/**
+ * Local stand-in for the OpenAI endpoints the analyzer uses (chat
+ * completions, files and batches), for testing batch mode without an API
+ * key or cost. Replies satisfy the requested json_schema with placeholder
+ * values.
+ *
+ * Usage: node mock-openai-server.js [port]
+ *        OPENAI_BASE_URL=http://localhost:8787/v1 node analyzer.js --batch <url>
+ */
+
+/**
+ * Smallest value satisfying a JSON schema
+ */
+export function sampleFromSchema(schema) {
+  if (schema.enum) return schema.enum[0];
+  const type = [].concat(schema.type).find((item) => item !== "null");
+
+  switch (type) {
+    case "object":
+      return Object.fromEntries(
+        Object.entries(schema.properties || {}).map(([key, property]) => [
+          key,
+          sampleFromSchema(property),
+        ]),
+      );
+    case "array":
+      return [];
+    case "integer":
+    case "number":
+      return Math.min(
+        Math.max(80, schema.minimum ?? -Infinity),
+        schema.maximum ?? Infinity,
+      );
+    case "boolean":
+      return false;
+    case "string":
+      return "mock";
+    default:
+      return null;
+  }
+}
+
+/**
+ * Deterministic chat completion for a request body
+ */
+export function mockCompletion(params) {
+  const schema = params.response_format?.json_schema?.schema;
+  const content = JSON.stringify(schema ? sampleFromSchema(schema) : {});
+  const promptTokens = Math.ceil(JSON.stringify(params.messages).length / 4);
+  const completionTokens = Math.ceil(content.length / 4);
+
+  const hash = crypto
+    .createHash("sha1")
+    .update(JSON.stringify(params))
+    .digest("hex");
+
+  return {
+    id: `chatcmpl-${hash.slice(0, 24)}`,
+    object: "chat.completion",
+    created: Math.floor(Date.now() / 1000),
+    model: params.model,
+    choices: [
+      {
+        index: 0,
+        message: { role: "assistant", content, refusal: null },
+        finish_reason: "stop",
+      },
+    ],
+    usage: {
+      prompt_tokens: promptTokens,
+      completion_tokens: completionTokens,
+      total_tokens: promptTokens + completionTokens,
+    },
+  };
+}
+
+function readBody(req) {
+  return new Promise((resolve, reject) => {
+    const chunks = [];
+    req.on("data", (chunk) => chunks.push(chunk));
+    req.on("end", () => resolve(Buffer.concat(chunks)));
+    req.on("error", reject);
+  });
+}
+
+/**
+ * Content of the "file" field of a multipart/form-data upload
+ */
+function multipartFile(body, contentType) {
+  const boundary = /boundary=(?:"([^"]+)"|([^;]+))/.exec(contentType);
+  if (!boundary) return null;
+
+  const raw = body.toString("latin1");
+  for (const part of raw.split(`--${boundary[1] || boundary[2]}`)) {
+    const headerEnd = part.indexOf("\r\n\r\n");
+    if (headerEnd === -1 || !/name="file"/.test(part.slice(0, headerEnd))) {
+      continue;
+    }
+    return Buffer.from(part.slice(headerEnd + 4, -2), "latin1");
+  }
+  return null;
+}
+
+/**
+ * Start the mock server
+ * @param {Object} options - Server options
+ * @param {number} options.port - Port to listen on (0 = any free port)
+ * @param {number} options.latencyMs - Delay of every chat completion
+ * @param {number} options.processingMs - Time a batch stays in progress
+ * @returns {http.Server} - Listening server
+ */
+export function startMockServer({
+  port = 8787,
+  latencyMs = 0,
+  processingMs = 1000,
+} = {}) {
+  const files = new Map();
+  const batches = new Map();
+  let nextId = 1;
+
+  const batchView = (batch) => {
+    const done = Date.now() - batch.createdAt >= processingMs;
+    return {
+      id: batch.id,
+      object: "batch",
+      endpoint: batch.endpoint,
+      input_file_id: batch.inputFileId,
+      completion_window: batch.completionWindow,
+      status: done ? "completed" : "in_progress",
+      output_file_id: done ? batch.outputFileId : null,
+      error_file_id: null,
+      created_at: Math.floor(batch.createdAt / 1000),
+      request_counts: {
+        total: batch.total,
+        completed: done ? batch.total : 0,
+        failed: 0,
+      },
+    };
+  };
+
+  const server = http.createServer(async (req, res) => {
+    const send = (status, payload) => {
+      res.writeHead(status, { "Content-Type": "application/json" });
+      res.end(JSON.stringify(payload));
+    };
+    const notFound = () =>
+      send(404, {
+        error: { message: `No route for ${req.method} ${req.url}` },
+      });
+
+    try {
+      const { pathname } = new URL(req.url, "http://localhost");
+      const body = await readBody(req);
+
+      if (req.method === "POST" && pathname === "/v1/chat/completions") {
+        const params = JSON.parse(body.toString("utf8"));
+        await new Promise((resolve) => setTimeout(resolve, latencyMs));
+        return send(200, mockCompletion(params));
+      }
+
+      if (req.method === "POST" && pathname === "/v1/files") {
+        const content = multipartFile(body, req.headers["content-type"] || "");
+        if (!content) return send(400, { error: { message: "No file field" } });
+        const id = `file-${nextId++}`;
+        files.set(id, content);
+        return send(200, {
+          id,
+          object: "file",
+          bytes: content.length,
+          created_at: Math.floor(Date.now() / 1000),
+          filename: "batch.jsonl",
+          purpose: "batch",
+        });
+      }
+
+      const fileContent = /^\/v1\/files\/([^/]+)\/content$/.exec(pathname);
+      if (req.method === "GET" && fileContent) {
+        const content = files.get(fileContent[1]);
+        if (!content) return notFound();
+        res.writeHead(200, { "Content-Type": "application/octet-stream" });
+        return res.end(content);
+      }
+
+      if (req.method === "POST" && pathname === "/v1/batches") {
+        const params = JSON.parse(body.toString("utf8"));
+        const input = files.get(params.input_file_id);
+        if (!input) return send(400, { error: { message: "Unknown file" } });
+
+        const lines = input
+          .toString("utf8")
+          .split("\n")
+          .filter((line) => line.trim())
+          .map((line) => JSON.parse(line));
+        const outputFileId = `file-${nextId++}`;
+        files.set(
+          outputFileId,
+          Buffer.from(
+            lines
+              .map((line, index) =>
+                JSON.stringify({
+                  id: `batch_req_${index + 1}`,
+                  custom_id: line.custom_id,
+                  response: {
+                    status_code: 200,
+                    request_id: `req_${index + 1}`,
+                    body: mockCompletion(line.body),
+                  },
+                  error: null,
+                }),
+              )
+              .join("\n"),
+            "utf8",
+          ),
+        );
+
+        const batch = {
+          id: `batch_${nextId++}`,
+          endpoint: params.endpoint,
+          inputFileId: params.input_file_id,
+          completionWindow: params.completion_window,
+          outputFileId,
+          total: lines.length,
+          createdAt: Date.now(),
+        };
+        batches.set(batch.id, batch);
+        return send(200, batchView(batch));
+      }
+
+      const batchStatus = /^\/v1\/batches\/([^/]+)$/.exec(pathname);
+      if (req.method === "GET" && batchStatus) {
+        const batch = batches.get(batchStatus[1]);
+        return batch ? send(200, batchView(batch)) : notFound();
+      }
+
+      return notFound();
+    } catch (error) {
+      return send(500, { error: { message: error.message } });
+    }
+  });
+
+  server.listen(port);
+  return server;
+}
+
+// Run if this file is executed directly
+if (
+  process.argv[1] &&
+  import.meta.url === pathToFileURL(process.argv[1]).href
+) {
+  const port = Number(process.argv[2]) || 8787;
+  startMockServer({ port });
+  console.log(`🧪 Mock OpenAI server listening on http://localhost:${port}/v1`);
+}
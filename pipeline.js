@@ -0,0 +1,82 @@
+/**
+ * Small DAG executor: every stage starts as soon as the stages it depends
+ * on have finished, so independent stages run concurrently
+ */
+export class Pipeline {
+  constructor() {
+    this.stages = new Map();
+  }
+
+  /**
+   * Add a stage
+   * @param {string} name - Stage name
+   * @param {Array} deps - Names of the stages whose results this stage needs
+   * @param {Function} run - async (results) => value; results holds the dependencies' values by name
+   * @returns {Pipeline} - this, for chaining
+   */
+  stage(name, deps, run) {
+    for (const dep of deps) {
+      if (!this.stages.has(dep)) {
+        throw new Error(`Stage "${name}" depends on unknown stage "${dep}"`);
+      }
+    }
+    this.stages.set(name, { deps, run });
+    return this;
+  }
+
+  /**
+   * Run every stage
+   * @returns {Object} - { results: { [stage]: value }, timings: { [stage]: { startMs, endMs, durationMs } }, totalMs }
+   */
+  async run() {
+    const startedAt = Date.now();
+    const promises = new Map();
+    const results = {};
+    const timings = {};
+
+    // Stages are registered after their dependencies, so promises exist in order
+    for (const [name, { deps, run }] of this.stages) {
+      promises.set(
+        name,
+        Promise.all(deps.map((dep) => promises.get(dep))).then(async () => {
+          const start = Date.now();
+          const inputs = Object.fromEntries(
+            deps.map((dep) => [dep, results[dep]]),
+          );
+          results[name] = await run(inputs);
+          const end = Date.now();
+          timings[name] = {
+            startMs: start - startedAt,
+            endMs: end - startedAt,
+            durationMs: end - start,
+          };
+        }),
+      );
+    }
+
+    // Let running stages settle before reporting the first failure
+    const settled = await Promise.allSettled(promises.values());
+    const failure = settled.find((outcome) => outcome.status === "rejected");
+    if (failure) throw failure.reason;
+
+    return { results, timings, totalMs: Date.now() - startedAt };
+  }
+
+  /**
+   * One log line per stage plus what running them one after another would have taken
+   */
+  static formatTimings({ timings, totalMs }) {
+    const lines = Object.entries(timings).map(
+      ([name, { startMs, endMs, durationMs }]) =>
+        `   ${name.padEnd(12)} ${String(durationMs).padStart(7)}ms  (+${startMs}ms → +${endMs}ms)`,
+    );
+    const sequentialMs = Object.values(timings).reduce(
+      (sum, { durationMs }) => sum + durationMs,
+      0,
+    );
+    lines.push(
+      `   ${"total".padEnd(12)} ${String(totalMs).padStart(7)}ms  (${sequentialMs}ms if run sequentially)`,
+    );
+    return lines.join("\n");
+  }
+}
@@ -0,0 +1,96 @@
+/**
+ * Token-bucket rate limiter for requests-per-minute and tokens-per-minute budgets
+ */
+export class RateLimiter {
+  /**
+   * @param {Object} options - Limiter options
+   * @param {number} options.requestsPerMinute - Request budget per minute
+   * @param {number} options.tokensPerMinute - Token budget per minute
+   */
+  constructor({ requestsPerMinute = 500, tokensPerMinute = 30000 } = {}) {
+    this.requestsPerMinute = requestsPerMinute;
+    this.tokensPerMinute = tokensPerMinute;
+    this.availableRequests = requestsPerMinute;
+    this.availableTokens = tokensPerMinute;
+    this.lastRefill = Date.now();
+    this.waiters = [];
+    this.timer = null;
+  }
+
+  /**
+   * Wait until one request costing `tokens` fits into both budgets
+   * @param {number} tokens - Estimated tokens (prompt + completion) for the request
+   */
+  acquire(tokens = 0) {
+    const cost = Math.min(Math.max(0, tokens), this.tokensPerMinute);
+
+    return new Promise((resolve) => {
+      this.waiters.push({ cost, resolve });
+      this.release();
+    });
+  }
+
+  /**
+   * Return unused tokens once the real usage of a request is known
+   * @param {number} tokens - Tokens to give back to the budget
+   */
+  refund(tokens) {
+    if (tokens > 0) {
+      this.refill();
+      this.availableTokens = Math.min(
+        this.tokensPerMinute,
+        this.availableTokens + tokens,
+      );
+      this.release();
+    }
+  }
+
+  /**
+   * Top the buckets up according to elapsed time
+   */
+  refill() {
+    const now = Date.now();
+    const elapsedMinutes = (now - this.lastRefill) / 60000;
+    this.lastRefill = now;
+
+    this.availableRequests = Math.min(
+      this.requestsPerMinute,
+      this.availableRequests + elapsedMinutes * this.requestsPerMinute,
+    );
+    this.availableTokens = Math.min(
+      this.tokensPerMinute,
+      this.availableTokens + elapsedMinutes * this.tokensPerMinute,
+    );
+  }
+
+  /**
+   * Grant waiters in FIFO order and schedule a wake-up for the next one
+   */
+  release() {
+    this.refill();
+
+    while (this.waiters.length > 0) {
+      const { cost, resolve } = this.waiters[0];
+      if (this.availableRequests < 1 || this.availableTokens < cost) break;
+
+      this.waiters.shift();
+      this.availableRequests -= 1;
+      this.availableTokens -= cost;
+      resolve();
+    }
+
+    if (this.waiters.length > 0 && !this.timer) {
+      const { cost } = this.waiters[0];
+      const requestWait =
+        ((1 - this.availableRequests) / this.requestsPerMinute) * 60000;
+      const tokenWait =
+        ((cost - this.availableTokens) / this.tokensPerMinute) * 60000;
+      const delay = Math.max(10, Math.ceil(Math.max(requestWait, tokenWait)));
+
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        this.release();
+      }, delay);
+    }
+  }
+}
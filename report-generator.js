@@ -1,4 +1,30 @@
 import chalk from "chalk";
+import fs from "fs";
+import { Readable } from "stream";
+import { pipeline } from "stream/promises";
+
+// Machine-readable export formats and their file extensions
+export const REPORT_FORMATS = { json: "json", ndjson: "ndjson", csv: "csv" };
+
+const CSV_COLUMNS = [
+  "baseline_url",
+  "baseline_language",
+  "language",
+  "url",
+  "status",
+  "quality_score",
+  "issues",
+  "critical_issues",
+  "error",
+];
+
+/**
+ * Quote a CSV field when it contains a separator, quote or line break
+ */
+function csvField(value) {
+  const text = value == null ? "" : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
 
 /**
  * Generate comprehensive reports for translation quality analysis
@@ -101,6 +127,12 @@ ${this.colors.info("📊 Analysis Summary:")}
     summary += `• Quality Score: ${this.getScoreColor(score)}${score}/100${chalk.reset}\n`;
     summary += `• Total Issues: ${totalIssues}\n`;
     summary += `• Critical Issues: ${this.colors.critical(criticalIssues)}\n`;
+    if (analysisResults.failedComparisons > 0) {
+      summary += `• Failed Comparisons: ${this.colors.warning(analysisResults.failedComparisons)} (excluded from the score)\n`;
+    }
+    if (analysisResults.scrapeFailures?.length > 0) {
+      summary += `• Pages Not Scraped: ${this.colors.warning(analysisResults.scrapeFailures.length)}\n`;
+    }
 
     if (terminologyResults.overallConsistencyScore) {
       summary += `• Terminology Consistency: ${this.getScoreColor(terminologyResults.overallConsistencyScore)}${terminologyResults.overallConsistencyScore}/100${chalk.reset}\n`;
@@ -117,6 +149,13 @@ ${this.colors.info("📊 Analysis Summary:")}
     section += `${"=".repeat(50)}\n\n`;
 
     analysisResults.comparisons.forEach((comparison, index) => {
+      if (comparison.failed) {
+        section += `${this.colors.info(`${index + 1}. ${comparison.targetLanguage.toUpperCase()}`)}\n`;
+        section += `   URL: ${comparison.targetUrl}\n`;
+        section += `   ${this.colors.warning("Analysis failed:")} ${comparison.error}\n\n`;
+        return;
+      }
+
       const score = comparison.qualityScore;
       const issues = comparison.issues.length;
       const criticalIssues = comparison.issues.filter(
@@ -180,11 +219,27 @@ ${this.colors.info("📊 Analysis Summary:")}
       });
     }
 
+    if (
+      terminologyResults.glossaryIssues &&
+      terminologyResults.glossaryIssues.length > 0
+    ) {
+      section += `${this.colors.warning("Glossary Violations:")}\n`;
+      terminologyResults.glossaryIssues.forEach((issue, index) => {
+        const found = issue.found ? `"${issue.found}"` : "not found";
+        section += `${index + 1}. [${issue.type.toUpperCase()}] ${this.colors.high(issue.entry)} (${issue.language}): ${found}`;
+        section += issue.count > 1 ? ` ×${issue.count}\n` : "\n";
+        section += `   URL: ${issue.url}\n`;
+        section += `   ${this.colors.success("Expected:")} "${issue.expected}"\n\n`;
+      });
+    }
+
     if (
       (!terminologyResults.inconsistentTerms ||
         terminologyResults.inconsistentTerms.length === 0) &&
       (!terminologyResults.brandInconsistencies ||
-        terminologyResults.brandInconsistencies.length === 0)
+        terminologyResults.brandInconsistencies.length === 0) &&
+      (!terminologyResults.glossaryIssues ||
+        terminologyResults.glossaryIssues.length === 0)
     ) {
       section += `${this.colors.success("✅ No terminology or brand inconsistencies found!")}\n`;
     }
@@ -329,15 +384,120 @@ ${this.colors.info("=".repeat(80))}
     }
   }
 
+  /**
+   * Machine-readable report, produced chunk by chunk so large crawls are
+   * never held in memory as one string
+   * @param {string} format - "json", "ndjson" (one issue per line) or "csv" (scores per language)
+   * @param {Iterable|AsyncIterable} results - { analysisResults, terminologyResults, urls } per analyzed page group
+   * @returns {AsyncGenerator} - Text chunks to write in order
+   */
+  formatReport(format, results) {
+    switch (format) {
+      case "json":
+        return this.jsonChunks(results);
+      case "ndjson":
+        return this.ndjsonLines(results);
+      case "csv":
+        return this.csvRows(results);
+      default:
+        throw new Error(`Unknown report format: ${format}`);
+    }
+  }
+
+  /**
+   * One JSON document: { generatedAt, results: [...] }
+   */
+  async *jsonChunks(results) {
+    yield `{"generatedAt":${JSON.stringify(new Date().toISOString())},"results":[`;
+    let separator = "\n";
+    for await (const { analysisResults, terminologyResults, urls } of results) {
+      const record = JSON.stringify({
+        urls,
+        ...analysisResults,
+        terminology: terminologyResults || null,
+      });
+      yield separator + record;
+      separator = ",\n";
+    }
+    yield "\n]}\n";
+  }
+
+  /**
+   * One JSON object per issue; "source" tells quality, terminology, brand
+   * and glossary issues apart
+   */
+  async *ndjsonLines(results) {
+    const line = (record) => JSON.stringify(record) + "\n";
+
+    for await (const { analysisResults, terminologyResults } of results) {
+      const baselineUrl = analysisResults.baseline.url;
+      for (const comparison of analysisResults.comparisons) {
+        for (const issue of comparison.issues) {
+          yield line({
+            source: "quality",
+            baselineUrl,
+            url: comparison.targetUrl,
+            language: comparison.targetLanguage,
+            ...issue,
+          });
+        }
+      }
+      for (const term of terminologyResults?.inconsistentTerms || []) {
+        yield line({ source: "terminology", baselineUrl, ...term });
+      }
+      for (const brand of terminologyResults?.brandInconsistencies || []) {
+        yield line({ source: "brand", baselineUrl, ...brand });
+      }
+      for (const issue of terminologyResults?.glossaryIssues || []) {
+        yield line({ source: "glossary", baselineUrl, ...issue });
+      }
+    }
+  }
+
+  /**
+   * One CSV row per compared language
+   */
+  async *csvRows(results) {
+    yield CSV_COLUMNS.join(",") + "\n";
+
+    for await (const { analysisResults } of results) {
+      const { baseline } = analysisResults;
+      for (const comparison of analysisResults.comparisons) {
+        const criticalIssues = comparison.issues.filter(
+          (issue) => issue.severity === "critical",
+        ).length;
+        const row = [
+          baseline.url,
+          baseline.language,
+          comparison.targetLanguage,
+          comparison.targetUrl,
+          comparison.failed ? "failed" : "analyzed",
+          comparison.qualityScore,
+          comparison.issues.length,
+          criticalIssues,
+          comparison.error,
+        ];
+        yield row.map(csvField).join(",") + "\n";
+      }
+    }
+  }
+
   /**
    * Save report to file
-   * @param {string} report - Report content
+   * @param {string|Iterable|AsyncIterable} report - Report content, or chunks
+   *   (e.g. from formatReport) streamed to the file as they are produced
    * @param {string} filename - Output filename
    */
   async saveReport(report, filename = "translation-analysis-report.txt") {
     try {
-      const fs = await import("fs/promises");
-      await fs.writeFile(filename, report, "utf8");
+      if (typeof report === "string") {
+        await fs.promises.writeFile(filename, report, "utf8");
+      } else {
+        await pipeline(
+          Readable.from(report),
+          fs.createWriteStream(filename, "utf8"),
+        );
+      }
       console.log(`${this.colors.success("✅ Report saved to:")} ${filename}`);
     } catch (error) {
       console.error(
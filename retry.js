@@ -0,0 +1,227 @@
+/**
+ * Shared retry layer for HTTP and OpenAI calls: jittered exponential
+ * backoff that honors Retry-After and rate-limit reset headers, a retry
+ * budget that refills as calls succeed, and a circuit breaker per target
+ * that pauses calls during its cooldown
+ */
+
+const RETRYABLE_STATUSES = new Set([408, 425, 429, 500, 502, 503, 504]);
+const RETRYABLE_CODES = new Set([
+  "ECONNRESET",
+  "ECONNREFUSED",
+  "ECONNABORTED",
+  "ETIMEDOUT",
+  "EPIPE",
+  "EAI_AGAIN",
+  "ENETUNREACH",
+  "EHOSTUNREACH",
+  "ERR_SOCKET_CONNECTION_TIMEOUT",
+  "UND_ERR_SOCKET",
+]);
+
+function headerValue(headers, name) {
+  if (!headers) return undefined;
+  if (typeof headers.get === "function") return headers.get(name) ?? undefined;
+  return headers[name] ?? headers[name.toLowerCase()];
+}
+
+/**
+ * Parse an OpenAI rate-limit reset duration such as "1s", "6m0s" or "20ms"
+ * @returns {number|null} - Milliseconds
+ */
+export function parseResetDuration(value) {
+  if (!value) return null;
+  const units = { h: 3600000, m: 60000, s: 1000, ms: 1 };
+  let total = 0;
+  let matched = false;
+  for (const [, amount, unit] of String(value).matchAll(
+    /(\d+(?:\.\d+)?)(ms|h|m|s)/g,
+  )) {
+    total += parseFloat(amount) * units[unit];
+    matched = true;
+  }
+  return matched ? total : null;
+}
+
+/**
+ * Delay requested by the server through response headers
+ * @returns {number|null} - Milliseconds, or null without a hint
+ */
+export function retryAfterMs(headers) {
+  const retryAfterMsHeader = Number(headerValue(headers, "retry-after-ms"));
+  if (retryAfterMsHeader > 0) return retryAfterMsHeader;
+
+  const retryAfter = headerValue(headers, "retry-after");
+  if (retryAfter) {
+    const seconds = Number(retryAfter);
+    if (!Number.isNaN(seconds)) return Math.max(0, seconds * 1000);
+    const date = Date.parse(retryAfter);
+    if (!Number.isNaN(date)) return Math.max(0, date - Date.now());
+  }
+
+  // OpenAI: wait for whichever exhausted window resets
+  const resets = ["requests", "tokens"]
+    .filter(
+      (kind) => headerValue(headers, `x-ratelimit-remaining-${kind}`) === "0",
+    )
+    .map((kind) =>
+      parseResetDuration(headerValue(headers, `x-ratelimit-reset-${kind}`)),
+    )
+    .filter((delay) => delay !== null);
+  return resets.length > 0 ? Math.max(...resets) : null;
+}
+
+/**
+ * Whether a failed call is worth repeating, and how long the server asked to wait
+ * @returns {Object} - { retryable, delayMs, status }
+ */
+export function classifyError(error) {
+  // axios errors carry the response, OpenAI SDK errors status and headers
+  const status = error.response?.status ?? error.status;
+  const headers = error.response?.headers ?? error.headers;
+
+  if (status === undefined) {
+    const code = error.code ?? error.cause?.code;
+    const connectionError =
+      RETRYABLE_CODES.has(code) ||
+      error.name === "APIConnectionError" ||
+      error.name === "APIConnectionTimeoutError";
+    return { retryable: connectionError, delayMs: null, status: code };
+  }
+
+  // An exhausted quota does not come back by waiting
+  const code = error.code ?? error.error?.code;
+  if (status === 429 && code === "insufficient_quota") {
+    return { retryable: false, delayMs: null, status };
+  }
+
+  return {
+    retryable: RETRYABLE_STATUSES.has(status),
+    delayMs: retryAfterMs(headers),
+    status,
+  };
+}
+
+/**
+ * Retry policy shared by every caller of one run
+ */
+export class RetryPolicy {
+  /**
+   * @param {Object} options - Retry options
+   * @param {number} options.maxAttempts - Attempts per call, including the first
+   * @param {number} options.baseDelayMs - Backoff base delay
+   * @param {number} options.maxDelayMs - Longest single wait
+   * @param {number} options.retryBudget - Retries that may be spent in a burst
+   * @param {number} options.retryRatio - Retry budget earned back per successful call
+   * @param {number} options.failureThreshold - Consecutive failures that open a circuit
+   * @param {number} options.cooldownMs - How long calls to an open circuit wait
+   */
+  constructor({
+    maxAttempts = 5,
+    baseDelayMs = 500,
+    maxDelayMs = 60000,
+    retryBudget = 100,
+    retryRatio = 0.2,
+    failureThreshold = 5,
+    cooldownMs = 30000,
+  } = {}) {
+    this.maxAttempts = maxAttempts;
+    this.baseDelayMs = baseDelayMs;
+    this.maxDelayMs = maxDelayMs;
+    this.retryBudget = retryBudget;
+    this.retryRatio = retryRatio;
+    this.failureThreshold = failureThreshold;
+    this.cooldownMs = cooldownMs;
+    this.circuits = new Map();
+    // Refilling budget: long runs keep retrying as long as most calls
+    // succeed, while a failing target cannot multiply the load
+    this.availableRetries = retryBudget;
+    this.retries = 0;
+  }
+
+  circuit(key) {
+    if (!this.circuits.has(key)) {
+      this.circuits.set(key, { failures: 0, openUntil: 0 });
+    }
+    return this.circuits.get(key);
+  }
+
+  /**
+   * Backoff before the given retry: full jitter, or the server's delay plus a little jitter
+   */
+  delayFor(attempt, serverDelayMs) {
+    if (serverDelayMs !== null && serverDelayMs !== undefined) {
+      return Math.min(
+        this.maxDelayMs,
+        serverDelayMs + Math.random() * this.baseDelayMs,
+      );
+    }
+    const ceiling = Math.min(
+      this.maxDelayMs,
+      this.baseDelayMs * 2 ** (attempt - 1),
+    );
+    return Math.random() * ceiling;
+  }
+
+  /**
+   * Run an operation, retrying transient failures
+   * @param {Function} operation - async (attempt) => result
+   * @param {Object} options - { key: circuit key (e.g. host), label: for logs }
+   * @returns {*} - Operation result
+   */
+  async run(operation, { key = "default", label = key } = {}) {
+    const circuit = this.circuit(key);
+
+    for (let attempt = 1; ; attempt++) {
+      // An open circuit holds calls back until its cooldown is over
+      while (circuit.openUntil > Date.now()) {
+        await new Promise((resolve) =>
+          setTimeout(resolve, circuit.openUntil - Date.now()),
+        );
+      }
+
+      try {
+        const result = await operation(attempt);
+        circuit.failures = 0;
+        this.availableRetries = Math.min(
+          this.retryBudget,
+          this.availableRetries + this.retryRatio,
+        );
+        return result;
+      } catch (error) {
+        const { retryable, delayMs, status } = classifyError(error);
+        if (!retryable) throw error;
+
+        // A rate limit with a reset time is the server pacing us, not a
+        // sign that it is down
+        const paced = status === 429 && delayMs !== null;
+        if (!paced) {
+          circuit.failures++;
+          if (circuit.failures === this.failureThreshold) {
+            circuit.openUntil = Date.now() + this.cooldownMs;
+            console.warn(
+              `🔌 Circuit opened for ${key} after ${circuit.failures} consecutive failures, pausing ${Math.round(this.cooldownMs / 1000)}s`,
+            );
+          } else if (circuit.failures > this.failureThreshold) {
+            // The trial call after the cooldown failed as well
+            circuit.openUntil = Date.now() + this.cooldownMs;
+          }
+        }
+
+        if (attempt >= this.maxAttempts) throw error;
+        if (this.availableRetries < 1) {
+          console.warn(`⚠️ Retry budget used up (${this.retries} retries so far)`);
+          throw error;
+        }
+
+        this.availableRetries--;
+        this.retries++;
+        const wait = this.delayFor(attempt, delayMs);
+        console.log(
+          `🔁 ${label} failed (${status ?? error.message}), retry ${attempt}/${this.maxAttempts - 1} in ${Math.round(wait)}ms`,
+        );
+        await new Promise((resolve) => setTimeout(resolve, wait));
+      }
+    }
+  }
+}
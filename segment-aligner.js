@@ -0,0 +1,199 @@
+/**
+ * Segment extraction, cross-language alignment and prompt batching for
+ * full-page translation comparisons
+ */
+
+// Penalties of the alignment DP, in units of |log(length ratio)|
+const SKIP_COST = 2.5;
+const MERGE_COST = 0.8;
+const FALLBACK_SEGMENT_CHARS = 600;
+// Segments the alignment may drift from the proportional diagonal
+const BAND_WIDTH = 100;
+
+/**
+ * Split scraped content into ordered heading and paragraph segments
+ * @param {Object} content - Content object from WebScraper.scrapeUrl
+ * @returns {Object} - { headings: [text], paragraphs: [text] }
+ */
+export function buildSegments(content) {
+  const headings = (content.headings || []).map((heading) => heading.text);
+  let paragraphs = content.paragraphs || [];
+
+  // Pages without <p> markup: cut the body text at sentence boundaries
+  if (paragraphs.length === 0 && content.bodyText) {
+    paragraphs = [];
+    let current = "";
+    for (const sentence of content.bodyText.split(/(?<=[.!?。！？])\s+/)) {
+      if (
+        current &&
+        current.length + sentence.length > FALLBACK_SEGMENT_CHARS
+      ) {
+        paragraphs.push(current);
+        current = "";
+      }
+      current = current ? `${current} ${sentence}` : sentence;
+    }
+    if (current) paragraphs.push(current);
+  }
+
+  return { headings, paragraphs };
+}
+
+/**
+ * Length-based alignment (in the spirit of Gale-Church) of two segment lists.
+ * Supports 1-1 matches, 2-1 / 1-2 merges and unmatched segments on either side.
+ * Only cells within BAND_WIDTH segments of the proportional diagonal are
+ * scored, so time and memory grow linearly with page length; lists shorter
+ * than the band get the exact alignment.
+ * @param {Array} source - Baseline segment texts
+ * @param {Array} target - Target segment texts
+ * @returns {Array} - [{ baseline: text|null, target: text|null }] in document order
+ */
+export function alignSegments(source, target) {
+  const n = source.length;
+  const m = target.length;
+  if (n === 0 || m === 0) {
+    return [
+      ...source.map((text) => ({ baseline: text, target: null })),
+      ...target.map((text) => ({ baseline: null, target: text })),
+    ];
+  }
+
+  const totalSource = source.reduce((sum, text) => sum + text.length, 0);
+  const totalTarget = target.reduce((sum, text) => sum + text.length, 0);
+  const expectedRatio = (totalTarget || 1) / (totalSource || 1);
+
+  const ratioCost = (sourceLength, targetLength) =>
+    Math.abs(
+      Math.log((targetLength + 1) / ((sourceLength + 1) * expectedRatio)),
+    );
+
+  // Row i covers target positions from the previous row's diagonal to the
+  // next row's, widened by the band, so consecutive rows always overlap
+  const lows = new Int32Array(n + 1);
+  const cost = [];
+  const step = [];
+  for (let i = 0; i <= n; i++) {
+    const low = Math.max(0, Math.floor(((i - 1) * m) / n) - BAND_WIDTH);
+    const high = Math.min(m, Math.ceil(((i + 1) * m) / n) + BAND_WIDTH);
+    lows[i] = low;
+    cost.push(new Float64Array(high - low + 1).fill(Infinity));
+    step.push(new Int8Array(high - low + 1));
+  }
+  const costAt = (i, j) => {
+    const index = j - lows[i];
+    return index >= 0 && index < cost[i].length ? cost[i][index] : Infinity;
+  };
+  cost[0][0] = 0;
+
+  // Moves: [source consumed, target consumed]
+  const moves = [
+    [1, 1],
+    [1, 0],
+    [0, 1],
+    [2, 1],
+    [1, 2],
+  ];
+
+  for (let i = 0; i <= n; i++) {
+    const row = cost[i];
+    for (let index = 0; index < row.length; index++) {
+      const j = lows[i] + index;
+      if (i === 0 && j === 0) continue;
+
+      for (let k = 0; k < moves.length; k++) {
+        const [di, dj] = moves[k];
+        if (i < di || j < dj) continue;
+        const previous = costAt(i - di, j - dj);
+        if (previous === Infinity) continue;
+
+        let moveCost;
+        if (di === 0 || dj === 0) {
+          moveCost = SKIP_COST;
+        } else {
+          const sourceLength =
+            source[i - 1].length + (di === 2 ? source[i - 2].length : 0);
+          const targetLength =
+            target[j - 1].length + (dj === 2 ? target[j - 2].length : 0);
+          moveCost =
+            ratioCost(sourceLength, targetLength) +
+            (di + dj > 2 ? MERGE_COST : 0);
+        }
+
+        if (previous + moveCost < row[index]) {
+          row[index] = previous + moveCost;
+          step[i][index] = k;
+        }
+      }
+    }
+  }
+
+  const pairs = [];
+  for (let i = n, j = m; i > 0 || j > 0; ) {
+    const [di, dj] = moves[step[i][j - lows[i]]];
+    pairs.push({
+      baseline: di > 0 ? source.slice(i - di, i).join(" ") : null,
+      target: dj > 0 ? target.slice(j - dj, j).join(" ") : null,
+    });
+    i -= di;
+    j -= dj;
+  }
+  return pairs.reverse();
+}
+
+/**
+ * Align baseline and target pages segment by segment
+ * @returns {Array} - [{ id, type, baseline, target }]
+ */
+export function alignContent(baseline, target) {
+  const source = buildSegments(baseline);
+  const translated = buildSegments(target);
+
+  const headingPairs = alignSegments(source.headings, translated.headings).map(
+    (pair) => ({ type: "heading", ...pair }),
+  );
+  const paragraphPairs = alignSegments(
+    source.paragraphs,
+    translated.paragraphs,
+  ).map((pair) => ({ type: "paragraph", ...pair }));
+
+  return [...headingPairs, ...paragraphPairs].map((pair, index) => ({
+    id: `S${index + 1}`,
+    ...pair,
+  }));
+}
+
+/**
+ * Size of an aligned pair as it appears in a prompt
+ */
+export function pairSize(pair) {
+  return (pair.baseline || "").length + (pair.target || "").length;
+}
+
+/**
+ * Greedily pack aligned pairs, in order, into as few batches as fit the budget
+ * @param {Array} pairs - Aligned pairs from alignContent()
+ * @param {Object} options - Packing options
+ * @param {number} options.budget - Maximum size per batch
+ * @param {Function} options.measure - Size of a pair (defaults to characters)
+ * @returns {Array} - Array of batches (arrays of pairs)
+ */
+export function batchPairs(pairs, { budget, measure = pairSize }) {
+  const batches = [];
+  let batch = [];
+  let used = 0;
+
+  for (const pair of pairs) {
+    const size = measure(pair);
+    if (batch.length > 0 && used + size > budget) {
+      batches.push(batch);
+      batch = [];
+      used = 0;
+    }
+    batch.push(pair);
+    used += size;
+  }
+  if (batch.length > 0) batches.push(batch);
+
+  return batches;
+}
@@ -0,0 +1,82 @@
+import crypto from "crypto";
+import fs from "fs/promises";
+import path from "path";
+
+/**
+ * Hash of an aligned segment pair's texts
+ */
+export function hashPair(pair) {
+  return crypto
+    .createHash("sha1")
+    .update(`${pair.type}\n${pair.baseline ?? ""}\n\0\n${pair.target ?? ""}`)
+    .digest("hex");
+}
+
+/**
+ * Set pair.hash on every pair of a page. Identical pairs (a repeated
+ * heading or boilerplate paragraph) get distinct keys: the first keeps the
+ * plain hash, the nth repeat gets the hash plus ":n".
+ * @param {Array} pairs - Aligned segment pairs, in page order
+ */
+export function hashPairs(pairs) {
+  const occurrences = new Map();
+  for (const pair of pairs) {
+    const hash = hashPair(pair);
+    const occurrence = occurrences.get(hash) || 0;
+    occurrences.set(hash, occurrence + 1);
+    pair.hash = occurrence === 0 ? hash : `${hash}:${occurrence}`;
+  }
+  return pairs;
+}
+
+/**
+ * Per-segment results of the previous audit of each baseline/target page
+ * pair, keyed by segment hash, so re-audits only analyze changed segments
+ */
+export class SegmentStore {
+  /**
+   * @param {Object} options - Store options
+   * @param {string} options.dir - Directory holding one JSON file per page pair
+   */
+  constructor({ dir = ".cache/segments" } = {}) {
+    this.dir = dir;
+  }
+
+  fileFor(baselineUrl, targetUrl) {
+    const hash = crypto
+      .createHash("sha256")
+      .update(`${baselineUrl}\n${targetUrl}`)
+      .digest("hex");
+    return path.join(this.dir, `${hash}.json`);
+  }
+
+  /**
+   * Load the segment records of the previous run
+   * @returns {Object|null} - { [pair.hash]: { weight, qualityScore, issues, ... } }
+   */
+  async load(baselineUrl, targetUrl) {
+    try {
+      const file = this.fileFor(baselineUrl, targetUrl);
+      return JSON.parse(await fs.readFile(file, "utf8")).segments;
+    } catch {
+      return null;
+    }
+  }
+
+  /**
+   * Replace the stored segment records with those of the current run
+   */
+  async save(baselineUrl, targetUrl, segments) {
+    await fs.mkdir(this.dir, { recursive: true });
+    await fs.writeFile(
+      this.fileFor(baselineUrl, targetUrl),
+      JSON.stringify({
+        baselineUrl,
+        targetUrl,
+        savedAt: new Date().toISOString(),
+        segments,
+      }),
+      "utf8",
+    );
+  }
+}
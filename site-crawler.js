@@ -0,0 +1,308 @@
+import crypto from "crypto";
+import fs from "fs/promises";
+import { createReadStream } from "fs";
+import readline from "readline";
+import { SitemapReader } from "./sitemap.js";
+import { normalizeUrl, parseLocale } from "./language-discovery.js";
+
+/**
+ * Sitemap-driven whole-site crawl: groups sitemap URLs into cross-locale
+ * page clusters via hreflang and runs each cluster through scraping and
+ * translation analysis with bounded concurrency and resumable progress
+ */
+export class SiteCrawler {
+  /**
+   * @param {Object} options - Crawler options
+   * @param {WebScraper} options.scraper - Scraper used for pages and sitemaps
+   * @param {TranslationAnalyzer} options.analyzer - Analyzer used per cluster
+   * @param {number} options.concurrency - Clusters processed in parallel
+   * @param {string} options.progressFile - JSONL file of finished clusters
+   * @param {number} options.maxClusters - Stop after this many clusters
+   */
+  constructor({
+    scraper,
+    analyzer,
+    concurrency = 2,
+    progressFile = "crawl-progress.jsonl",
+    maxClusters = Infinity,
+  }) {
+    this.scraper = scraper;
+    this.analyzer = analyzer;
+    this.concurrency = concurrency;
+    this.progressFile = progressFile;
+    this.maxClusters = maxClusters;
+    this.sitemapReader = new SitemapReader({
+      http: scraper.http,
+      userAgent: scraper.userAgent,
+    });
+  }
+
+  /**
+   * Group streamed sitemap entries into clusters of language versions
+   * @param {string} sitemapUrl - sitemap.xml or sitemap index URL
+   * @param {Set} seen - URLs already assigned to a cluster; pages added to
+   *   it later (e.g. by hreflang expansion) are skipped when they come up
+   * @yields {Object} - { id, pages: [{ url, language }] }
+   */
+  async *clusters(sitemapUrl, seen = new Set()) {
+
+    for await (const entry of this.sitemapReader.entries(sitemapUrl)) {
+      let loc;
+      try {
+        loc = normalizeUrl(entry.loc);
+      } catch {
+        continue;
+      }
+      if (seen.has(loc)) continue;
+
+      const pages = [{ url: loc, language: null }];
+      for (const alternate of entry.alternates) {
+        const locale = parseLocale(alternate.hreflang);
+        if (!locale) continue;
+        try {
+          const url = normalizeUrl(new URL(alternate.href, loc).href);
+          const existing = pages.find((page) => page.url === url);
+          if (existing) {
+            existing.language ||= locale.code;
+          } else if (!seen.has(url)) {
+            pages.push({ url, language: locale.code });
+          }
+        } catch {
+          // Ignore malformed alternates
+        }
+      }
+
+      pages.forEach((page) => seen.add(page.url));
+      yield { id: SiteCrawler.clusterId(pages), pages };
+    }
+  }
+
+  /**
+   * Stable identifier of a cluster, independent of URL order
+   */
+  static clusterId(pages) {
+    return crypto
+      .createHash("sha1")
+      .update(
+        pages
+          .map((page) => page.url)
+          .sort()
+          .join("\n"),
+      )
+      .digest("hex");
+  }
+
+  /**
+   * Load the clusters finished by a previous, interrupted run
+   * @returns {Map} - Cluster id (the sitemap one and, after hreflang
+   *   expansion, the expanded one) => URLs the cluster covered
+   */
+  async loadProgress() {
+    const done = new Map();
+    try {
+      const journal = await fs.readFile(this.progressFile, "utf8");
+      for (const line of journal.split("\n")) {
+        if (!line.trim()) continue;
+        try {
+          const { id, expandedId, urls = [] } = JSON.parse(line);
+          done.set(id, urls);
+          if (expandedId) done.set(expandedId, urls);
+        } catch {
+          // A torn final line from a crash is simply redone
+        }
+      }
+    } catch (error) {
+      if (error.code !== "ENOENT") throw error;
+    }
+    return done;
+  }
+
+  /**
+   * Stream the analyzed clusters back from the progress journal, one record
+   * at a time, e.g. into ReportGenerator.formatReport
+   * @yields {Object} - { analysisResults, terminologyResults, urls }
+   */
+  async *results() {
+    try {
+      await fs.access(this.progressFile);
+    } catch {
+      // Nothing analyzed yet
+      return;
+    }
+
+    const lines = readline.createInterface({
+      input: createReadStream(this.progressFile, "utf8"),
+      crlfDelay: Infinity,
+    });
+    for await (const line of lines) {
+      if (!line.trim()) continue;
+      let record;
+      try {
+        record = JSON.parse(line);
+      } catch {
+        continue;
+      }
+      if (record.status === "analyzed") yield record;
+    }
+  }
+
+  /**
+   * Crawl a whole site from its sitemap
+   * @param {string} sitemapUrl - sitemap.xml or sitemap index URL
+   * @returns {Object} - Crawl summary
+   */
+  async crawl(sitemapUrl) {
+    const done = await this.loadProgress();
+    const summary = {
+      sitemapUrl,
+      clusters: 0,
+      analyzed: 0,
+      singleLanguage: 0,
+      duplicates: 0,
+      failed: 0,
+      resumed: 0,
+      totalIssues: 0,
+      criticalIssues: 0,
+      averageScore: 0,
+      progressFile: this.progressFile,
+    };
+    let scoreSum = 0;
+    // Pages and cluster ids taken by a cluster, shared with clusters() and
+    // processCluster() so hreflang-expanded locales are analyzed only once
+    const claims = { seen: new Set(), ids: new Set(done.keys()) };
+
+    console.log(`🗺️ Crawling sitemap: ${sitemapUrl}`);
+    if (done.size > 0) {
+      console.log(`♻️ Resuming from ${this.progressFile}`);
+    }
+
+    const inFlight = new Set();
+    // Journal the sitemap id, which is what resume looks up before
+    // scraping, next to the id after hreflang expansion
+    const record = async (cluster, result) => {
+      await fs.appendFile(
+        this.progressFile,
+        JSON.stringify({ ...result, id: cluster.id, expandedId: result.id }) +
+          "\n",
+        "utf8",
+      );
+    };
+
+    for await (const cluster of this.clusters(sitemapUrl, claims.seen)) {
+      if (summary.clusters >= this.maxClusters) break;
+      summary.clusters++;
+      if (done.has(cluster.id)) {
+        // Its hreflang-expanded locales are taken as well
+        done.get(cluster.id).forEach((url) => claims.seen.add(url));
+        summary.resumed++;
+        continue;
+      }
+
+      // Backpressure: stop reading the sitemap while the pool is full
+      while (inFlight.size >= this.concurrency) {
+        await Promise.race(inFlight);
+      }
+
+      const task = this.processCluster(cluster, claims)
+        .then(async (result) => {
+          // Duplicates are journaled too, so a resumed run skips them
+          // without fetching their page again
+          await record(cluster, result);
+          if (result.status === "duplicate") {
+            summary.duplicates++;
+          } else if (result.status === "analyzed") {
+            summary.analyzed++;
+            summary.totalIssues += result.totalIssues;
+            summary.criticalIssues += result.criticalIssues;
+            scoreSum += result.overallScore;
+          } else {
+            summary.singleLanguage++;
+          }
+        })
+        .catch((error) => {
+          summary.failed++;
+          console.warn(
+            `⚠️ Cluster ${cluster.pages[0].url} failed: ${error.message}`,
+          );
+        })
+        .finally(() => inFlight.delete(task));
+      inFlight.add(task);
+    }
+    await Promise.all(inFlight);
+
+    summary.averageScore =
+      summary.analyzed > 0 ? Math.round(scoreSum / summary.analyzed) : 0;
+    console.log(
+      `🏁 Crawl finished: ${summary.analyzed} clusters analyzed, ${summary.singleLanguage} single-language, ${summary.duplicates} duplicates, ${summary.failed} failed, ${summary.resumed} resumed`,
+    );
+    return summary;
+  }
+
+  /**
+   * Scrape and analyze one cluster of language versions
+   * @param {Object} cluster - Cluster from clusters()
+   * @param {Object} claims - { seen, ids } shared by the crawl: pages and
+   *   cluster ids already taken by other clusters
+   * @returns {Object} - Journal record for the cluster; status "duplicate"
+   *   when its expanded page set was already taken
+   */
+  async processCluster(cluster, claims = { seen: new Set(), ids: new Set() }) {
+    const urls = cluster.pages.map((page) => page.url);
+    let id = cluster.id;
+    let scrapedContent = (await this.scraper.scrapeAll(urls))
+      .filter((entry) => entry.content)
+      .map((entry) => entry.content);
+
+    // Pages without sitemap alternates may still declare hreflang in their HTML
+    if (cluster.pages.length === 1 && scrapedContent.length === 1) {
+      const alternates = [
+        ...new Set(
+          (scrapedContent[0].alternateLinks || [])
+            .filter((link) => parseLocale(link.hreflang))
+            .map((link) => normalizeUrl(new URL(link.href, urls[0]).href))
+            .filter((url) => url !== urls[0]),
+        ),
+      ];
+
+      if (alternates.length > 0) {
+        // Locales listed as separate sitemap entries all expand to the same
+        // page set: it is one cluster, whichever of its pages came up first
+        id = SiteCrawler.clusterId(
+          [...urls, ...alternates].map((url) => ({ url })),
+        );
+        alternates.forEach((url) => claims.seen.add(url));
+        if (claims.ids.has(id)) return { id, status: "duplicate", urls };
+        claims.ids.add(id);
+
+        const extra = await this.scraper.scrapeAll(alternates);
+        scrapedContent.push(
+          ...extra.filter((entry) => entry.content).map((entry) => entry.content),
+        );
+      }
+    }
+
+    if (scrapedContent.length < 2) {
+      return { id, status: "single-language", urls };
+    }
+
+    // Independent analyses; in batch mode their requests share batches
+    const baseline = this.analyzer.selectBaseline(scrapedContent);
+    const [analysisResults, terminologyResults] = await Promise.all([
+      this.analyzer.analyzeTranslationQuality(scrapedContent),
+      this.analyzer.analyzeTerminologyConsistency(scrapedContent, {
+        baseline,
+      }),
+    ]);
+
+    return {
+      id,
+      status: "analyzed",
+      urls: scrapedContent.map((content) => content.url),
+      overallScore: analysisResults.overallScore,
+      totalIssues: analysisResults.totalIssues,
+      criticalIssues: analysisResults.criticalIssues,
+      analysisResults,
+      terminologyResults,
+    };
+  }
+}
@@ -0,0 +1,147 @@
+import { Parser } from "htmlparser2";
+import { pipeline } from "stream";
+import { StringDecoder } from "string_decoder";
+import { createGunzip } from "zlib";
+import { decodeResponseStream } from "./compression.js";
+
+/**
+ * Streaming sitemap.xml reader supporting sitemap indexes, gzipped sitemaps
+ * and xhtml:link hreflang alternates
+ */
+export class SitemapReader {
+  /**
+   * @param {Object} options - Reader options
+   * @param {Object} options.http - axios instance used for requests
+   * @param {string} options.userAgent - User-Agent header
+   * @param {number} options.maxSitemaps - Safety cap on nested sitemap files
+   */
+  constructor({ http, userAgent, maxSitemaps = 1000 } = {}) {
+    this.http = http;
+    this.userAgent = userAgent;
+    this.maxSitemaps = maxSitemaps;
+  }
+
+  /**
+   * Yield every page entry of a sitemap (following sitemap indexes) as it is parsed
+   * @param {string} sitemapUrl - sitemap.xml, sitemap index or .xml.gz URL
+   * @yields {Object} - { loc, lastmod, alternates: [{ hreflang, href }] }
+   */
+  async *entries(sitemapUrl) {
+    const pending = [sitemapUrl];
+    const visited = new Set();
+
+    while (pending.length > 0 && visited.size < this.maxSitemaps) {
+      const url = pending.shift();
+      if (visited.has(url)) continue;
+      visited.add(url);
+
+      try {
+        for await (const item of this.readSitemap(url)) {
+          if (item.type === "sitemap") {
+            pending.push(item.loc);
+          } else {
+            yield item.entry;
+          }
+        }
+      } catch (error) {
+        // Without the root there is nothing to crawl; a broken child
+        // sitemap only loses its own entries
+        if (url === sitemapUrl) throw error;
+        console.warn(`⚠️ Skipping sitemap ${url}: ${error.message}`);
+      }
+    }
+  }
+
+  /**
+   * Stream a single sitemap file, yielding child sitemaps and page entries
+   */
+  async *readSitemap(url) {
+    const response = await this.http.get(url, {
+      headers: {
+        "User-Agent": this.userAgent,
+        "Accept-Encoding": "gzip, deflate, br",
+      },
+      responseType: "stream",
+      decompress: false,
+      timeout: 30000,
+    });
+
+    const contentEncoding = response.headers["content-encoding"];
+    // Large sitemaps may take long to download, but must not stall
+    let { stream } = decodeResponseStream(response.data, contentEncoding, {
+      idleTimeoutMs: 30000,
+    });
+
+    // .xml.gz files are served as gzip payloads, not gzip transfer encoding
+    const contentType = response.headers["content-type"] || "";
+    if (
+      !contentEncoding &&
+      (new URL(url).pathname.endsWith(".gz") || contentType.includes("gzip"))
+    ) {
+      // pipeline, unlike pipe, passes a body timeout on to the reader
+      stream = pipeline(stream, createGunzip(), () => {});
+    }
+
+    const items = [];
+    let entry = null;
+    let field = null;
+    let text = "";
+
+    const parser = new Parser(
+      {
+        // Sitemap elements use the default namespace; prefixed ones such as
+        // image:loc must not be mistaken for the page's own <loc>
+        onopentag(tag, attributes) {
+          if (tag === "url") {
+            entry = { loc: "", lastmod: "", alternates: [] };
+          } else if (tag === "sitemap") {
+            entry = { sitemap: true, loc: "" };
+          } else if ((tag === "loc" || tag === "lastmod") && entry) {
+            field = tag;
+            text = "";
+          } else if (
+            tag.endsWith(":link") &&
+            entry?.alternates &&
+            attributes.rel === "alternate" &&
+            attributes.hreflang &&
+            attributes.href
+          ) {
+            entry.alternates.push({
+              hreflang: attributes.hreflang,
+              href: attributes.href,
+            });
+          }
+        },
+        ontext(chunk) {
+          if (field) text += chunk;
+        },
+        onclosetag(tag) {
+          if (field && tag === field) {
+            entry[field] = text.trim();
+            field = null;
+          } else if (tag === "sitemap" && entry?.sitemap) {
+            if (entry.loc) items.push({ type: "sitemap", loc: entry.loc });
+            entry = null;
+          } else if (tag === "url" && entry) {
+            if (entry.loc) items.push({ type: "url", entry });
+            entry = null;
+          }
+        },
+      },
+      { xmlMode: true },
+    );
+
+    const decoder = new StringDecoder("utf8");
+    try {
+      for await (const chunk of stream) {
+        parser.write(decoder.write(chunk));
+        yield* items.splice(0);
+      }
+      parser.end(decoder.end());
+      yield* items.splice(0);
+    } finally {
+      // Free the socket if parsing failed or the consumer stopped early
+      response.data.destroy();
+    }
+  }
+}
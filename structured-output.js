@@ -0,0 +1,217 @@
+/**
+ * JSON schemas for every structured OpenAI reply, the response_format that
+ * constrains the model to them, and a local validator for what comes back
+ */
+
+/**
+ * Strict-mode object schema: every property required, nothing extra
+ */
+function objectSchema(properties) {
+  return {
+    type: "object",
+    properties,
+    required: Object.keys(properties),
+    additionalProperties: false,
+  };
+}
+
+const string = { type: "string" };
+const nullableString = { type: ["string", "null"] };
+const arrayOf = (items) => ({ type: "array", items });
+
+export const COMPARISON_OUTPUT = {
+  name: "translation_comparison",
+  schema: objectSchema({
+    qualityScore: { type: "integer", minimum: 0, maximum: 100 },
+    issues: arrayOf(
+      objectSchema({
+        type: string,
+        severity: {
+          type: "string",
+          enum: ["low", "medium", "high", "critical"],
+        },
+        segment: nullableString,
+        message: string,
+        context: nullableString,
+        suggestion: string,
+      }),
+    ),
+    suggestions: arrayOf(string),
+    terminologyIssues: arrayOf(
+      objectSchema({
+        term: string,
+        baseline: string,
+        target: string,
+        suggestion: string,
+      }),
+    ),
+    brandConsistency: arrayOf(
+      objectSchema({
+        brandElement: string,
+        issue: string,
+        suggestion: string,
+      }),
+    ),
+  }),
+};
+
+export const TERM_EXTRACTION_OUTPUT = {
+  name: "term_extraction",
+  schema: objectSchema({
+    terms: arrayOf(
+      objectSchema({
+        term: string,
+        concept: string,
+        category: {
+          type: "string",
+          enum: ["brand", "product", "ui", "domain"],
+        },
+      }),
+    ),
+  }),
+};
+
+export const TERMINOLOGY_REVIEW_OUTPUT = {
+  name: "terminology_review",
+  schema: objectSchema({
+    inconsistentTerms: arrayOf(
+      objectSchema({
+        term: string,
+        variations: arrayOf(
+          objectSchema({ language: string, version: string }),
+        ),
+        recommendedTerm: string,
+      }),
+    ),
+    brandInconsistencies: arrayOf(
+      objectSchema({
+        brandElement: string,
+        variations: arrayOf(string),
+        recommendedVersion: string,
+      }),
+    ),
+  }),
+};
+
+export const LANGUAGE_URLS_OUTPUT = {
+  name: "language_urls",
+  schema: objectSchema({
+    languageUrls: arrayOf(
+      objectSchema({
+        language: string,
+        languageName: string,
+        url: string,
+        confidence: { type: "string", enum: ["high", "medium", "low"] },
+      }),
+    ),
+    discoveredPatterns: arrayOf(string),
+    totalLanguages: { type: "integer", minimum: 0 },
+  }),
+};
+
+/**
+ * Raised when a reply still does not match its schema after the repair retry,
+ * or is still cut off at the largest max_tokens (truncated)
+ */
+export class StructuredOutputError extends Error {
+  constructor(name, errors, { truncated = false } = {}) {
+    super(`Invalid ${name} output: ${errors.slice(0, 5).join("; ")}`);
+    this.name = "StructuredOutputError";
+    this.errors = errors;
+    this.truncated = truncated;
+  }
+}
+
+/**
+ * chat.completions response_format constraining the reply to a schema
+ */
+export function responseFormat({ name, schema }) {
+  return {
+    type: "json_schema",
+    json_schema: { name, strict: true, schema },
+  };
+}
+
+function typeOf(value) {
+  if (value === null) return "null";
+  if (Array.isArray(value)) return "array";
+  if (Number.isInteger(value)) return "integer";
+  return typeof value;
+}
+
+/**
+ * Validate a value against the JSON schema subset used above
+ * @returns {Array} - Error messages, empty when valid
+ */
+export function validate(value, schema, path = "$") {
+  const types = [].concat(schema.type);
+  const actual = typeOf(value);
+  const matches = types.some(
+    (type) => type === actual || (type === "number" && actual === "integer"),
+  );
+  if (!matches) return [`${path} should be ${types.join(" or ")}`];
+
+  const errors = [];
+  if (schema.enum && !schema.enum.includes(value)) {
+    errors.push(`${path} should be one of ${schema.enum.join(", ")}`);
+  }
+  if (schema.minimum !== undefined && value < schema.minimum) {
+    errors.push(`${path} should be >= ${schema.minimum}`);
+  }
+  if (schema.maximum !== undefined && value > schema.maximum) {
+    errors.push(`${path} should be <= ${schema.maximum}`);
+  }
+
+  if (actual === "array" && schema.items) {
+    value.forEach((item, index) =>
+      errors.push(...validate(item, schema.items, `${path}[${index}]`)),
+    );
+  }
+
+  if (actual === "object" && schema.properties) {
+    for (const key of schema.required || []) {
+      if (!(key in value)) errors.push(`${path}.${key} is required`);
+    }
+    for (const [key, item] of Object.entries(value)) {
+      if (schema.properties[key]) {
+        errors.push(
+          ...validate(item, schema.properties[key], `${path}.${key}`),
+        );
+      } else if (schema.additionalProperties === false) {
+        errors.push(`${path}.${key} is not allowed`);
+      }
+    }
+  }
+  return errors;
+}
+
+/**
+ * Parse and validate the message of a chat completion
+ * @returns {Object} - { data, errors, refusal, truncated }
+ */
+export function parseStructured(response, { schema }) {
+  const choice = response.choices?.[0];
+  const message = choice?.message;
+  if (message?.refusal) {
+    return {
+      data: null,
+      errors: [`refused: ${message.refusal}`],
+      refusal: true,
+    };
+  }
+  if (choice?.finish_reason === "length") {
+    return {
+      data: null,
+      errors: ["reply was cut off at max_tokens"],
+      truncated: true,
+    };
+  }
+
+  let data;
+  try {
+    data = JSON.parse(message?.content ?? "");
+  } catch (error) {
+    return { data: null, errors: [`not valid JSON (${error.message})`] };
+  }
+  return { data, errors: validate(data, schema) };
+}
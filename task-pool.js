@@ -0,0 +1,89 @@
+/**
+ * Concurrency-limited task pool with an optional per-key (e.g. per-host) limit
+ */
+export class TaskPool {
+  /**
+   * @param {Object} options - Pool options
+   * @param {number} options.concurrency - Maximum number of tasks in flight
+   * @param {number} options.perKeyLimit - Maximum tasks in flight sharing a key
+   */
+  constructor({ concurrency = 4, perKeyLimit = Infinity } = {}) {
+    this.concurrency = Math.max(1, concurrency);
+    this.perKeyLimit = Math.max(1, perKeyLimit);
+    this.active = 0;
+    this.activeByKey = new Map();
+    this.queue = [];
+  }
+
+  /**
+   * Schedule a task
+   * @param {Function} task - Async function to run
+   * @param {string} key - Grouping key used for the per-key limit
+   * @returns {Promise} - Resolves or rejects with the task's outcome
+   */
+  run(task, key = "") {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ task, key, resolve, reject });
+      this.drain();
+    });
+  }
+
+  /**
+   * Start as many queued tasks as the limits allow
+   */
+  drain() {
+    for (let i = 0; i < this.queue.length && this.active < this.concurrency; ) {
+      const entry = this.queue[i];
+      const activeForKey = this.activeByKey.get(entry.key) || 0;
+
+      if (activeForKey >= this.perKeyLimit) {
+        i++;
+        continue;
+      }
+
+      this.queue.splice(i, 1);
+      this.active++;
+      this.activeByKey.set(entry.key, activeForKey + 1);
+
+      Promise.resolve()
+        .then(entry.task)
+        .then(entry.resolve, entry.reject)
+        .finally(() => {
+          this.active--;
+          const remaining = this.activeByKey.get(entry.key) - 1;
+          if (remaining > 0) {
+            this.activeByKey.set(entry.key, remaining);
+          } else {
+            this.activeByKey.delete(entry.key);
+          }
+          this.drain();
+        });
+    }
+  }
+}
+
+/**
+ * Map items through an async function with bounded concurrency
+ * @param {Array} items - Items to process
+ * @param {Function} fn - Async mapper called as fn(item, index)
+ * @param {Object} options - TaskPool options plus an optional keyFn(item)
+ * @returns {Array} - Settled results in input order: { status, value | reason }
+ */
+export async function mapSettled(items, fn, options = {}) {
+  const { keyFn = () => "", pool = new TaskPool(options) } = options;
+
+  return Promise.allSettled(
+    items.map((item, index) => pool.run(() => fn(item, index), keyFn(item))),
+  );
+}
+
+/**
+ * Derive the per-host pool key for a URL
+ */
+export function hostKey(url) {
+  try {
+    return new URL(url).host;
+  } catch {
+    return "";
+  }
+}
@@ -0,0 +1,165 @@
+/**
+ * Local reduce step of the map-reduce terminology analysis: clusters the
+ * terms extracted per language into cross-language concepts and decides
+ * which clusters are clearly consistent, clearly inconsistent, or need an
+ * LLM to judge
+ */
+
+// Categories whose terms are names and should normally stay identical
+const NAME_CATEGORIES = new Set(["brand", "product"]);
+
+/**
+ * Comparison form of a term: case, accents, spacing and punctuation removed
+ */
+export function normalizeTerm(text) {
+  return String(text || "")
+    .normalize("NFKD")
+    .replace(/\p{M}+/gu, "")
+    .toLowerCase()
+    .replace(/[^\p{L}\p{N}]+/gu, "");
+}
+
+function mostCommon(values) {
+  const counts = new Map();
+  for (const value of values) counts.set(value, (counts.get(value) || 0) + 1);
+  return [...counts.entries()].sort((a, b) => b[1] - a[1])[0]?.[0];
+}
+
+/**
+ * Cluster per-language term extractions into cross-language concepts.
+ * Terms join a cluster by their English concept gloss; names (brand and
+ * product terms) also join by their own spelling.
+ * @param {Array} extractions - [{ language, url, terms: [{ term, concept, category }] }]
+ * @returns {Array} - [{ concept, category, variants: [{ language, term, url }] }]
+ */
+export function clusterTerms(extractions) {
+  const entries = [];
+  for (const { language, url, terms } of extractions) {
+    for (const { term, concept, category } of terms || []) {
+      if (!normalizeTerm(term)) continue;
+      entries.push({
+        language,
+        url,
+        term: String(term).trim(),
+        concept: String(concept || term).trim(),
+        category: String(category || "domain").toLowerCase(),
+      });
+    }
+  }
+
+  // Union-find over entries sharing a concept (or a name's spelling)
+  const parent = entries.map((entry, index) => index);
+  const find = (index) => {
+    while (parent[index] !== index) {
+      parent[index] = parent[parent[index]];
+      index = parent[index];
+    }
+    return index;
+  };
+  const owners = new Map();
+  entries.forEach((entry, index) => {
+    const keys = [`concept:${normalizeTerm(entry.concept)}`];
+    if (NAME_CATEGORIES.has(entry.category)) {
+      keys.push(`name:${normalizeTerm(entry.term)}`);
+    }
+    for (const key of keys) {
+      if (owners.has(key)) {
+        parent[find(index)] = find(owners.get(key));
+      } else {
+        owners.set(key, index);
+      }
+    }
+  });
+
+  const groups = new Map();
+  entries.forEach((entry, index) => {
+    const root = find(index);
+    if (!groups.has(root)) groups.set(root, []);
+    groups.get(root).push(entry);
+  });
+
+  return [...groups.values()].map((group) => {
+    const variants = [];
+    const seen = new Set();
+    for (const { language, term, url } of group) {
+      const key = `${language}\n${term}`;
+      if (seen.has(key)) continue;
+      seen.add(key);
+      variants.push({ language, term, url });
+    }
+    return {
+      concept: mostCommon(group.map((entry) => entry.concept)),
+      category: mostCommon(group.map((entry) => entry.category)),
+      variants,
+    };
+  });
+}
+
+/**
+ * Sort clusters into consistent, locally resolved and ambiguous ones
+ * @param {Array} clusters - Clusters from clusterTerms()
+ * @returns {Object} - { comparable, consistent, brandInconsistencies, ambiguous }
+ */
+export function classifyClusters(clusters) {
+  const result = {
+    comparable: 0,
+    consistent: 0,
+    brandInconsistencies: [],
+    ambiguous: [],
+  };
+
+  for (const cluster of clusters) {
+    const languages = new Map();
+    for (const variant of cluster.variants) {
+      if (!languages.has(variant.language)) {
+        languages.set(variant.language, new Set());
+      }
+      languages.get(variant.language).add(normalizeTerm(variant.term));
+    }
+    // A concept seen in one language only has nothing to be consistent with
+    if (languages.size < 2) continue;
+    result.comparable++;
+
+    const forms = new Set(cluster.variants.map((variant) => variant.term));
+    const normalizedForms = new Set(
+      cluster.variants.map((variant) => normalizeTerm(variant.term)),
+    );
+
+    if (NAME_CATEGORIES.has(cluster.category)) {
+      if (forms.size === 1) {
+        result.consistent++;
+      } else if (normalizedForms.size === 1) {
+        // Same name, different casing/spacing/punctuation: no judgment needed
+        result.brandInconsistencies.push({
+          brandElement: cluster.concept,
+          variations: [...forms],
+          recommendedVersion: mostCommon(
+            cluster.variants.map((variant) => variant.term),
+          ),
+        });
+      } else {
+        // Possibly an intentionally localized name
+        result.ambiguous.push(cluster);
+      }
+      continue;
+    }
+
+    const withinLanguage = [...languages.values()].some(
+      (terms) => terms.size > 1,
+    );
+    // Left untranslated in some languages but translated in others
+    const sharedForm = [...normalizedForms].some(
+      (form) =>
+        [...languages.values()].filter((terms) => terms.has(form)).length > 1,
+    );
+    const mixed = sharedForm && normalizedForms.size > 1;
+
+    if (withinLanguage || mixed) {
+      result.ambiguous.push(cluster);
+    } else {
+      result.consistent++;
+    }
+  }
+
+  return result;
+}
@@ -0,0 +1,115 @@
+/**
+ * Local token counting for prompt budgeting. Uses the exact BPE encodings
+ * from the optional js-tiktoken package when it is installed, otherwise a
+ * script-aware estimate (CJK characters cost far more than Latin ones).
+ */
+
+/**
+ * Context window and encoding per model family
+ */
+export const MODEL_LIMITS = {
+  "gpt-4": { contextTokens: 8192, encoding: "cl100k_base" },
+  "gpt-4-turbo": { contextTokens: 128000, encoding: "cl100k_base" },
+  "gpt-4o": { contextTokens: 128000, encoding: "o200k_base" },
+  "gpt-4o-mini": { contextTokens: 128000, encoding: "o200k_base" },
+  "gpt-4.1": { contextTokens: 1000000, encoding: "o200k_base" },
+  "gpt-5": { contextTokens: 400000, encoding: "o200k_base" },
+};
+
+const DEFAULT_LIMITS = { contextTokens: 8192, encoding: "cl100k_base" };
+
+let tiktoken = null;
+let tiktokenLoading = null;
+const encoders = new Map();
+
+/**
+ * Context window and encoding for a model (longest matching prefix wins)
+ */
+export function modelLimits(model = "") {
+  const family = Object.keys(MODEL_LIMITS)
+    .filter((name) => model === name || model.startsWith(`${name}-`))
+    .sort((a, b) => b.length - a.length)[0];
+  return family ? MODEL_LIMITS[family] : DEFAULT_LIMITS;
+}
+
+/**
+ * Load js-tiktoken once, if available
+ */
+export async function loadTokenizer() {
+  if (!tiktokenLoading) {
+    tiktokenLoading = import("js-tiktoken")
+      .then((module) => {
+        tiktoken = module;
+      })
+      .catch(() => {
+        tiktoken = null;
+      });
+  }
+  await tiktokenLoading;
+  return tiktoken !== null;
+}
+
+function encoderFor(model) {
+  if (!tiktoken) return null;
+
+  const { encoding } = modelLimits(model);
+  if (!encoders.has(encoding)) {
+    encoders.set(encoding, tiktoken.getEncoding(encoding));
+  }
+  return encoders.get(encoding);
+}
+
+/**
+ * Estimated token cost of one UTF-16 code unit
+ */
+function charCost(code) {
+  if (code < 128) return 0.25;
+  if (
+    (code >= 0x3040 && code <= 0x30ff) || // Hiragana, Katakana
+    (code >= 0x3400 && code <= 0x9fff) || // CJK ideographs
+    (code >= 0xac00 && code <= 0xd7af) || // Hangul
+    (code >= 0xf900 && code <= 0xfaff)
+  ) {
+    return 1;
+  }
+  return 0.5;
+}
+
+/**
+ * Count tokens of a text for a model
+ * @param {string} text - Text to measure
+ * @param {string} model - Model name (selects the encoding)
+ * @returns {number} - Token count
+ */
+export function countTokens(text, model) {
+  if (!text) return 0;
+
+  const encoder = encoderFor(model);
+  if (encoder) return encoder.encode(text).length;
+
+  let cost = 0;
+  for (let i = 0; i < text.length; i++) cost += charCost(text.charCodeAt(i));
+  return Math.ceil(cost);
+}
+
+/**
+ * Cut a text to at most maxTokens tokens
+ */
+export function truncateToTokens(text, maxTokens, model) {
+  if (!text || maxTokens <= 0) return "";
+
+  const encoder = encoderFor(model);
+  if (encoder) {
+    const tokens = encoder.encode(text);
+    return tokens.length <= maxTokens
+      ? text
+      : encoder.decode(tokens.slice(0, maxTokens));
+  }
+
+  let cost = 0;
+  for (let i = 0; i < text.length; i++) {
+    cost += charCost(text.charCodeAt(i));
+    if (cost > maxTokens) return text.slice(0, i);
+  }
+  return text;
+}
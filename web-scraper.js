@@ -1,148 +1,353 @@
 import axios from "axios";
-import * as cheerio from "cheerio";
+import { TaskPool, mapSettled, hostKey } from "./task-pool.js";
+import { HttpCache } from "./http-cache.js";
+import { ConnectionPool } from "./connection-pool.js";
+import { RetryPolicy } from "./retry.js";
+import { BoundedQueue } from "./async-queue.js";
+import { ExtractionPool } from "./extraction-pool.js";
+import {
+  ACCEPT_ENCODING,
+  decodeResponseStream,
+  readStreamAsBytes,
+  readStreamAsText,
+} from "./compression.js";
+import {
+  extractContent,
+  extractContentFromStream,
+} from "./html-extractor.js";
 
 /**
  * Web scraper to extract text content from URLs
  */
 export class WebScraper {
-  constructor() {
+  /**
+   * @param {Object} options - Scraper options
+   * @param {number} options.maxConcurrency - Maximum pages fetched in parallel
+   * @param {number} options.maxPerHost - Maximum parallel fetches per host
+   * @param {Object|false} options.httpCache - HttpCache options, or false to always refetch
+   * @param {boolean} options.streaming - Parse responses as they download instead of buffering them
+   * @param {number} options.maxBodyTextLength - Text cap per page in streaming mode (body text,
+   *   and separately paragraphs, links and headings); buffered extraction is not capped
+   * @param {number} options.bodyIdleTimeoutMs - Longest pause while downloading a page body
+   * @param {number} options.bodyTimeoutMs - Longest time to download a page body
+   * @param {ConnectionPool|Object} options.connections - Shared ConnectionPool, or its options (maxSockets, keep-alive, DNS TTL)
+   * @param {RetryPolicy|Object} options.retry - Shared retry policy, or RetryPolicy options
+   * @param {TaskPool} options.pool - Shared fetch pool (overrides maxConcurrency and maxPerHost)
+   * @param {ExtractionPool|Object|false} options.workers - Shared ExtractionPool, or its options,
+   *   to extract buffered pages in worker threads; false extracts on the main thread
+   */
+  constructor({
+    maxConcurrency = 6,
+    maxPerHost = 3,
+    httpCache = {},
+    streaming = false,
+    maxBodyTextLength = 1000000,
+    bodyIdleTimeoutMs = 30000,
+    bodyTimeoutMs = 120000,
+    connections = {},
+    retry = {},
+    pool,
+    workers = {},
+  } = {}) {
     this.userAgent =
       "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36";
+    this.pool =
+      pool ||
+      new TaskPool({ concurrency: maxConcurrency, perKeyLimit: maxPerHost });
+    this.httpCache = httpCache === false ? null : new HttpCache(httpCache);
+    this.streaming = streaming;
+    // Streaming mode parses chunk by chunk as the body downloads, so only
+    // buffered pages go to the worker threads
+    if (workers === false || streaming) {
+      this.extraction = null;
+    } else {
+      this.extraction =
+        workers instanceof ExtractionPool
+          ? workers
+          : new ExtractionPool(workers);
+    }
+    // Streaming exists to bound memory on huge pages, so only it truncates:
+    // past the cap, a page's bodyText, wordCount and segments differ from
+    // what buffered extraction (streaming off) returns for the same HTML
+    this.maxBodyTextLength = maxBodyTextLength;
+    this.bodyIdleTimeoutMs = bodyIdleTimeoutMs;
+    this.bodyTimeoutMs = bodyTimeoutMs;
+    this.connections =
+      connections instanceof ConnectionPool
+        ? connections
+        : new ConnectionPool(connections);
+    this.http = axios.create({
+      httpAgent: this.connections.httpAgent,
+      httpsAgent: this.connections.httpsAgent,
+    });
+    this.retry = retry instanceof RetryPolicy ? retry : new RetryPolicy(retry);
+    // URLs that could not be scraped, with the reason
+    this.failures = [];
   }
 
   /**
    * Extract text content from a webpage
    * @param {string} url - The URL to scrape
+   * @param {Object} options - Scrape options
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
    * @returns {Object} - Extracted content and metadata
    */
-  async scrapeUrl(url) {
+  async scrapeUrl(url, { checkpoint = null } = {}) {
+    const restored = checkpoint?.get("scrape", url);
+    if (restored) {
+      console.log(`♻️ Restored from checkpoint: ${url}`);
+      return restored;
+    }
+
     try {
       console.log(`🔍 Scraping: ${url}`);
 
-      const response = await axios.get(url, {
+      const cached = this.httpCache && (await this.httpCache.get(url));
+
+      const content = await this.retry.run(() => this.fetchPage(url, cached), {
+        key: hostKey(url),
+        label: url,
+      });
+      await checkpoint?.put("scrape", url, content);
+      return content;
+    } catch (error) {
+      console.error(`❌ Error scraping ${url}:`, error.message);
+      throw new Error(`Failed to scrape URL: ${error.message}`);
+    }
+  }
+
+  /**
+   * One fetch-and-extract attempt for scrapeUrl
+   * @param {string} url - The URL to fetch
+   * @param {Object|null} cached - HttpCache entry for conditional requests
+   * @returns {Object} - Extracted content and metadata
+   */
+  async fetchPage(url, cached) {
+    const response = await this.http
+      .get(url, {
         headers: {
+          ...this.httpCache?.conditionalHeaders(cached),
           "User-Agent": this.userAgent,
           Accept:
             "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
           "Accept-Language": "en-US,en;q=0.5",
-          "Accept-Encoding": "gzip, deflate",
+          "Accept-Encoding": ACCEPT_ENCODING,
           Connection: "keep-alive",
         },
         timeout: 30000,
         maxRedirects: 5,
+        // Decompress ourselves so wire and decoded sizes can be recorded
+        responseType: "stream",
+        decompress: false,
+        validateStatus: (status) =>
+          (status >= 200 && status < 300) || (status === 304 && !!cached),
+      })
+      .catch((error) => {
+        // Free the socket held by an unread error body before retrying
+        error.response?.data?.destroy?.();
+        throw error;
       });
+    this.connections.recordRequest(response.request);
 
-      const $ = cheerio.load(response.data);
+    if (response.status === 304) {
+      response.data.destroy();
+      console.log(`♻️ Not modified, reusing cached content: ${url}`);
+      this.httpCache.hits++;
+      // No body was sent, so none counts toward the transfer summary
+      return {
+        ...cached.content,
+        fromCache: true,
+        compressedBytes: 0,
+        decompressedBytes: 0,
+      };
+    }
 
-      // Remove script and style elements
-      $("script, style, nav, footer, header").remove();
+    const { stream, transfer } = decodeResponseStream(
+      response.data,
+      response.headers["content-encoding"],
+      {
+        idleTimeoutMs: this.bodyIdleTimeoutMs,
+        totalTimeoutMs: this.bodyTimeoutMs,
+      },
+    );
+    let extracted;
+    if (this.streaming) {
+      extracted = await extractContentFromStream(stream, url, {
+        maxBodyTextLength: this.maxBodyTextLength,
+      });
+    } else if (this.extraction) {
+      extracted = await this.extraction.extract(
+        await readStreamAsBytes(stream),
+        url,
+      );
+    } else {
+      extracted = this.extractContent(await readStreamAsText(stream), url);
+    }
+    const content = { ...extracted, ...transfer };
+    if (this.httpCache) {
+      await this.httpCache.set(url, response.headers, content);
+    }
+    return content;
+  }
 
-      // Extract main content
-      const title = $("title").text().trim();
-      const metaDescription =
-        $('meta[name="description"]').attr("content") || "";
+  /**
+   * Extract structured content from an HTML document
+   * @param {string} html - Raw HTML
+   * @param {string} url - URL the HTML was fetched from
+   * @returns {Object} - Extracted content and metadata
+   */
+  extractContent(html, url) {
+    return extractContent(html, url);
+  }
 
-      // Get all text content
-      const bodyText = $("body").text().replace(/\s+/g, " ").trim();
+  /**
+   * Scrape several URLs through the shared concurrency pool
+   * @param {Array} urls - URLs to scrape
+   * @param {Object} options - Scrape options
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
+   * @returns {Array} - One entry per URL, in input order: { url, content, error }
+   */
+  async scrapeAll(urls, { checkpoint = null } = {}) {
+    const settled = await mapSettled(
+      urls,
+      (url) => this.scrapeUrl(url, { checkpoint }),
+      { pool: this.pool, keyFn: hostKey },
+    );
 
-      // Extract headings
-      const headings = [];
-      $("h1, h2, h3, h4, h5, h6").each((i, el) => {
-        const text = $(el).text().trim();
-        const level = el.tagName.toLowerCase();
-        if (text) {
-          headings.push({ level, text });
-        }
-      });
+    const entries = settled.map((outcome, index) => ({
+      url: urls[index],
+      content: outcome.status === "fulfilled" ? outcome.value : null,
+      error: outcome.status === "rejected" ? outcome.reason : null,
+    }));
+    for (const entry of entries) {
+      if (entry.error) {
+        this.failures.push({ url: entry.url, error: entry.error.message });
+      }
+    }
+    return entries;
+  }
 
-      // Extract links
-      const links = [];
-      $("a[href]").each((i, el) => {
-        const href = $(el).attr("href");
-        const text = $(el).text().trim();
-        if (
-          href &&
-          text &&
-          !href.startsWith("#") &&
-          !href.startsWith("javascript:")
-        ) {
-          links.push({ href, text });
-        }
-      });
+  /**
+   * Scrape several URLs through the shared concurrency pool, yielding each
+   * entry as soon as it is done. Scraping pauses while bufferSize finished
+   * entries are waiting for the consumer.
+   * @param {Array} urls - URLs to scrape
+   * @param {Object} options - Stream options
+   * @param {number} options.bufferSize - Finished entries held before scraping pauses
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
+   * @returns {AsyncGenerator} - Entries in completion order: { url, index, content, error }
+   */
+  async *scrapeStream(
+    urls,
+    { bufferSize = this.pool.concurrency, checkpoint = null } = {},
+  ) {
+    const queue = new BoundedQueue(bufferSize);
 
-      // Extract paragraphs
-      const paragraphs = [];
-      $("p").each((i, el) => {
-        const text = $(el).text().trim();
-        if (text && text.length > 10) {
-          paragraphs.push(text);
-        }
-      });
+    const tasks = urls.map((url, index) =>
+      this.pool.run(async () => {
+        // The consumer stopped early
+        if (queue.closed) return;
 
-      // Detect language from HTML lang attribute
-      const htmlLang = $("html").attr("lang") || "";
-      const detectedLanguage = htmlLang.split('-')[0] || 'unknown';
+        let entry;
+        try {
+          entry = {
+            url,
+            index,
+            content: await this.scrapeUrl(url, { checkpoint }),
+          };
+        } catch (error) {
+          this.failures.push({ url, error: error.message });
+          entry = { url, index, content: null, error };
+        }
+        // The pool slot stays taken until the entry is handed over, so a
+        // slow consumer holds back further scraping
+        await queue.push(entry);
+      }, hostKey(url)),
+    );
+    Promise.allSettled(tasks).then(() => queue.close());
 
-      return {
-        url,
-        title,
-        metaDescription,
-        bodyText,
-        headings,
-        links,
-        paragraphs,
-        htmlLang,
-        detectedLanguage,
-        wordCount: bodyText.split(/\s+/).length,
-        scrapedAt: new Date().toISOString(),
-      };
-    } catch (error) {
-      console.error(`❌ Error scraping ${url}:`, error.message);
-      throw new Error(`Failed to scrape URL: ${error.message}`);
+    try {
+      yield* queue;
+    } finally {
+      queue.close();
     }
   }
 
-
   /**
    * Extract text from multiple language versions of a page
    * @param {string} baseUrl - Base URL to analyze
    * @param {Array} languageUrls - Array of full language-specific URLs
-   * @returns {Array} - Array of scraped content for each language
+   * @param {Object} options - Scrape options
+   * @param {Function} options.onPage - async (content) => void, awaited for
+   *   each page as soon as it is scraped; scraping waits while it is pending
+   * @param {Function} options.onError - async (url, error) => void, awaited
+   *   for each page that could not be scraped
+   * @param {CheckpointStore} options.checkpoint - Journal of the current run
+   * @returns {Array} - Array of scraped content for each language, base URL first
    */
-  async scrapeMultipleLanguages(baseUrl, languageUrls = []) {
-    const results = [];
-
-    // Always include the base URL
-    try {
-      const baseResult = await this.scrapeUrl(baseUrl);
-      results.push(baseResult);
-      console.log(`✅ Base URL scraped successfully`);
-    } catch (error) {
-      console.warn(`⚠️ Could not scrape base URL: ${error.message}`);
-    }
-
-    // Scrape language-specific versions
+  async scrapeMultipleLanguages(
+    baseUrl,
+    languageUrls = [],
+    { onPage, onError, checkpoint = null } = {},
+  ) {
     if (languageUrls.length > 0) {
       console.log(
-        `🌍 Scraping ${languageUrls.length} language-specific URLs...`,
+        `🌍 Scraping ${languageUrls.length} language-specific URLs (up to ${this.pool.concurrency} in parallel)...`,
       );
+    }
 
-      for (let i = 0; i < languageUrls.length; i++) {
-        const langUrl = languageUrls[i];
-        try {
-          console.log(
-            `📥 Scraping ${i + 1}/${languageUrls.length}: ${langUrl}`,
-          );
-          const result = await this.scrapeUrl(langUrl);
-          results.push(result);
-          console.log(`✅ Language URL scraped successfully`);
-        } catch (error) {
-          console.warn(`⚠️ Could not scrape ${langUrl}: ${error.message}`);
-        }
+    // Always include the base URL, then the language-specific versions
+    const entries = [];
+    const stream = this.scrapeStream([baseUrl, ...languageUrls], {
+      checkpoint,
+    });
+    for await (const entry of stream) {
+      entries.push(entry);
+      if (entry.content) {
+        console.log(
+          entry.index === 0
+            ? `✅ Base URL scraped successfully`
+            : `✅ Language URL scraped successfully: ${entry.url}`,
+        );
+        if (onPage) await onPage(entry.content);
+      } else {
+        console.warn(
+          entry.index === 0
+            ? `⚠️ Could not scrape base URL: ${entry.error.message}`
+            : `⚠️ Could not scrape ${entry.url}: ${entry.error.message}`,
+        );
+        if (onError) await onError(entry.url, entry.error);
       }
     }
 
+    const results = entries
+      .filter((entry) => entry.content)
+      .sort((a, b) => a.index - b.index)
+      .map((entry) => entry.content);
+
+    const stats = this.connections.getStats();
+    const compressedBytes = results.reduce(
+      (sum, content) => sum + (content.compressedBytes || 0),
+      0,
+    );
+    const decompressedBytes = results.reduce(
+      (sum, content) => sum + (content.decompressedBytes || 0),
+      0,
+    );
     console.log(`📊 Total content scraped: ${results.length} pages`);
+    console.log(
+      `📦 Transferred ${(compressedBytes / 1024).toFixed(1)} KB for ${(decompressedBytes / 1024).toFixed(1)} KB of HTML (${(Math.max(0, decompressedBytes - compressedBytes) / 1024).toFixed(1)} KB saved by compression)`,
+    );
+    console.log(
+      `🔌 Connections: ${stats.reusedConnections}/${stats.requests} requests reused a pooled socket (${Math.round(stats.reuseRate * 100)}%), ${stats.dnsCacheHits} DNS cache hits`,
+    );
     return results;
   }
+
+  /**
+   * Close pooled connections
+   */
+  close() {
+    this.connections.destroy();
+  }
 }